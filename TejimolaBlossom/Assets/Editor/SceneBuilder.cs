@@ -1,6 +1,7 @@
 using System;
 using System.Collections.Generic;
 using System.IO;
+using System.Text.RegularExpressions;
 using UnityEditor;
 using UnityEditor.Animations;
 using UnityEditor.SceneManagement;
@@ -30,11 +31,13 @@ public static class SceneBuilder
     const string ART      = "Assets/_Project/Art";
     const string SCENES   = "Assets/_Project/Scenes";
     const string PREFABS  = "Assets/_Project/Prefabs";
+    const string ATLASES  = ART + "/Atlases";
 
     // Cached references populated during build
     static AnimatorController s_tejiController;
     static AnimatorController s_domController;
     static TMP_FontAsset s_defaultFont;
+    static Dictionary<string, (string atlas, string name)> s_atlasSprites;
 
     static TMP_FontAsset DefaultFont()
     {
@@ -81,6 +84,8 @@ public static class SceneBuilder
     {
         try
         {
+            s_atlasSprites = null;
+
             Debug.Log("[SceneBuilder] Setting up layers…");
             SetupLayers();
 
@@ -151,6 +156,12 @@ public static class SceneBuilder
         var importer = AssetImporter.GetAtPath(fullPath) as TextureImporter;
         if (importer == null) { Debug.LogWarning($"[SceneBuilder] No importer for {fullPath}"); return; }
 
+        // The asset pipeline slices sheets itself, sharing one cell between
+        // repeated frames (Tools/sprite_sheets.py); keep its slicing.
+        if (importer.spriteImportMode == SpriteImportMode.Multiple &&
+            importer.spritesheet != null && importer.spritesheet.Length > 0)
+            return;
+
         importer.textureType        = TextureImporterType.Sprite;
         importer.spriteImportMode   = SpriteImportMode.Multiple;
         importer.filterMode         = FilterMode.Point;   // pixel-art crisp scaling
@@ -162,7 +173,7 @@ public static class SceneBuilder
         {
             metas[i] = new SpriteMetaData
             {
-                name      = $"{baseName}_{i}",
+                name      = $"{baseName}_{i:D2}",
                 rect      = new Rect(i * frameW, 0, frameW, frameH),
                 pivot     = new Vector2(0.5f, 0f),
                 alignment = (int)SpriteAlignment.BottomCenter,
@@ -1054,6 +1065,9 @@ public static class SceneBuilder
         var parallaxLayerComponents = new List<Tejimola.Camera.ParallaxLayer>();
         foreach (var (file, factor, order, scaleX) in layers)
         {
+            // Layers wholly hidden by the ones in front are not generated (Tools/layer_occlusion.py)
+            if (!File.Exists($"{ART}/{file}")) continue;
+
             var lGO = new GameObject(Path.GetFileNameWithoutExtension(file));
             lGO.transform.SetParent(bgRoot.transform);
             var lSR = lGO.AddComponent<SpriteRenderer>();
@@ -1504,7 +1518,7 @@ public static class SceneBuilder
         var sr = go.AddComponent<SpriteRenderer>();
         sr.sprite = Spr("Sprites/Props/spiked_barrel.png");
         sr.color  = GameColors.DarkMagenta;
-        go.AddComponent<BoxCollider2D>();
+        go.AddComponent<PolygonCollider2D>();
 
         var prefab = PrefabUtility.SaveAsPrefabAsset(go, path);
         UnityEngine.Object.DestroyImmediate(go);
@@ -1521,7 +1535,7 @@ public static class SceneBuilder
         var sr = go.AddComponent<SpriteRenderer>();
         sr.sprite       = Spr("Sprites/Props/spiked_barrel.png");
         sr.sortingOrder = 3;
-        go.AddComponent<BoxCollider2D>();
+        go.AddComponent<PolygonCollider2D>();
         go.AddComponent<Rigidbody2D>().gravityScale = 0;
         go.AddComponent<Tejimola.Gameplay.SpikedBarrel>();
 
@@ -1560,7 +1574,7 @@ public static class SceneBuilder
         var sr = go.AddComponent<SpriteRenderer>();
         sr.sprite = Spr("VFX/vine_obstacle.png");
         sr.color  = GameColors.ForestGreen;
-        go.AddComponent<BoxCollider2D>();
+        go.AddComponent<PolygonCollider2D>();
 
         var prefab = PrefabUtility.SaveAsPrefabAsset(go, path);
         UnityEngine.Object.DestroyImmediate(go);
@@ -1893,12 +1907,38 @@ public static class SceneBuilder
 
     static Sprite Spr(string relPath)
     {
+        // Props, VFX and HUD icons come from their atlas so they share one texture
+        if (AtlasSprites().TryGetValue(relPath, out var packed))
+        {
+            foreach (var asset in AssetDatabase.LoadAllAssetsAtPath(packed.atlas))
+                if (asset is Sprite s && s.name == packed.name) return s;
+            Debug.LogWarning($"[SceneBuilder] {packed.name} missing from {packed.atlas}, using {relPath}");
+        }
+
         var sprite = AssetDatabase.LoadAssetAtPath<Sprite>($"{ART}/{relPath}");
         if (sprite == null)
             Debug.LogWarning($"[SceneBuilder] Sprite not found: {ART}/{relPath}");
         return sprite;
     }
 
+    /// <summary>Art-relative sprite path -> (atlas texture, sub-sprite name), read from
+    /// the *_atlas.json manifests Tools/atlas_packer.py writes beside each atlas.</summary>
+    static Dictionary<string, (string atlas, string name)> AtlasSprites()
+    {
+        if (s_atlasSprites != null) return s_atlasSprites;
+        s_atlasSprites = new Dictionary<string, (string atlas, string name)>();
+        if (!Directory.Exists(ATLASES)) return s_atlasSprites;
+        foreach (var manifest in Directory.GetFiles(ATLASES, "*_atlas.json"))
+        {
+            string atlas = Path.ChangeExtension(manifest, ".png").Replace('\\', '/');
+            var entries = Regex.Matches(File.ReadAllText(manifest),
+                "\"(\\w+)\": \\{\\s*\"source\": \"Art/([^\"]+)\"");
+            foreach (Match m in entries)
+                s_atlasSprites[m.Groups[2].Value] = (atlas, m.Groups[1].Value);
+        }
+        return s_atlasSprites;
+    }
+
     const string RESOURCES_AUDIO = "Assets/_Project/Resources/Audio";
 
     static AudioClip Clip(string relPath)
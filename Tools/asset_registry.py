@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unified asset registry.
+Every generator module declares its outputs through a register_assets(reg)
+hook so the build can list, filter and check them without rendering anything.
+"""
+import fnmatch
+import hashlib
+import importlib
+import inspect
+import os
+import random
+import sys
+
+import numpy as np
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+PROJECT_ROOT = os.path.join(REPO_ROOT, "TejimolaBlossom", "Assets", "_Project")
+
+# Registration order matters: when two generators claim the same path the
+# later one wins, matching the order the scripts were historically run in.
+SOURCES = [
+    'generate_backgrounds',
+    'generate_characters',
+    'generate_ui_and_props',
+    'generate_audio',
+    'generate_assets',
+]
+
+EXTENSION_TAGS = {'.png': 'art', '.wav': 'audio'}
+
+
+def stream_seed(asset_id, stream):
+    """64-bit seed for a named random stream, stable across runs and machines."""
+    digest = hashlib.sha256(f"{asset_id}:{stream}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+# Render functions that declare one of these parameters get a fresh stream
+# seeded from their asset id; nothing should touch the global generators.
+RNG_STREAMS = {
+    'rng': lambda seed: random.Random(seed),
+    'np_rng': lambda seed: np.random.default_rng(seed),
+}
+
+
+class Asset:
+    """One render call and the project-relative paths its result is saved to."""
+
+    def __init__(self, asset_id, render, outputs, tags=(), params=None, source=''):
+        self.id = asset_id
+        self.name = asset_id.split('/', 1)[-1]
+        self.render = render
+        self.params = dict(params or {})
+        self.source = source
+        self.outputs = self._normalize(outputs)
+
+        tags = list(tags) + [source]
+        for paths in self.outputs.values():
+            for path in paths:
+                tag = EXTENSION_TAGS.get(os.path.splitext(path)[1])
+                if tag:
+                    tags.append(tag)
+        self.tags = list(dict.fromkeys(tags))
+
+    @staticmethod
+    def _normalize(outputs):
+        """Map result key -> tuple of paths; key None means the whole result."""
+        if isinstance(outputs, str):
+            return {None: (outputs,)}
+        if isinstance(outputs, dict):
+            return {key: (paths,) if isinstance(paths, str) else tuple(paths)
+                    for key, paths in outputs.items()}
+        return {None: tuple(outputs)}
+
+    @property
+    def paths(self):
+        return [path for paths in self.outputs.values() for path in paths]
+
+    def streams(self):
+        """Fresh RNG streams for the parameters the render function accepts."""
+        accepted = inspect.signature(self.render).parameters
+        return {name: make(stream_seed(self.id, name))
+                for name, make in RNG_STREAMS.items() if name in accepted}
+
+    def run(self):
+        """Render and return {relpath: payload}."""
+        result = self.render(**self.params, **self.streams())
+        saved = {}
+        for key, paths in self.outputs.items():
+            payload = result if key is None else result[key]
+            for path in paths:
+                saved[path] = payload
+        return saved
+
+    def matches(self, pattern):
+        return (fnmatch.fnmatch(self.id, pattern) or fnmatch.fnmatch(self.name, pattern)
+                or any(fnmatch.fnmatch(tag, pattern) for tag in self.tags))
+
+    def __repr__(self):
+        return f"Asset({self.id!r})"
+
+
+class Registry:
+    def __init__(self):
+        self.assets = []
+        self.source = ''
+
+    def add(self, name, render, outputs, tags=(), params=None):
+        asset = Asset(f"{self.source}/{name}", render, outputs, tags, params, self.source)
+        self.assets.append(asset)
+        return asset
+
+    def get(self, asset_id):
+        for asset in self.assets:
+            if asset.id == asset_id:
+                return asset
+        raise KeyError(asset_id)
+
+    def select(self, only=(), tags=(), sources=()):
+        """Filter assets.
+
+        `only` patterns are OR-ed and match an id, name or tag (fnmatch);
+        `tags` must all be present; `sources` restricts by module.
+        """
+        chosen = []
+        for asset in self.assets:
+            if sources and asset.source not in sources:
+                continue
+            if only and not any(asset.matches(p) for p in only):
+                continue
+            if tags and not all(tag in asset.tags for tag in tags):
+                continue
+            chosen.append(asset)
+        return chosen
+
+    def conflicts(self, assets=None):
+        """Return {path: [asset ids]} for every path claimed more than once."""
+        claims = {}
+        for asset in self.assets if assets is None else assets:
+            for path in asset.paths:
+                claims.setdefault(path, []).append(asset.id)
+        return {path: ids for path, ids in claims.items() if len(ids) > 1}
+
+    def owners(self, assets=None):
+        """Return {path: asset id} keeping only the last registered claim."""
+        owner = {}
+        for asset in self.assets if assets is None else assets:
+            for path in asset.paths:
+                owner[path] = asset.id
+        return owner
+
+
+def source_name(module_name):
+    return module_name[len('generate_'):] if module_name.startswith('generate_') else module_name
+
+
+def load_registry(sources=SOURCES):
+    """Import every generator module and collect its declarations."""
+    for path in (TOOLS_DIR, REPO_ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    reg = Registry()
+    for module_name in sources:
+        module = importlib.import_module(module_name)
+        reg.source = source_name(module_name)
+        module.register_assets(reg)
+    reg.source = ''
+    return reg
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+The one place generated files reach the disk.
+Payloads are encoded in memory and compared against what is already on disk;
+unchanged files are left alone so their mtimes (and Unity's imported copies)
+stay put, and changed files are replaced atomically.
+
+Encoding runs on a per-process thread pool (zlib releases the GIL), so the
+outputs of one asset compress in parallel and in-process builds draw the
+next asset while the last one is still being encoded. PNG effort comes in
+two tiers: 'dev' for fast iteration, 'release' for the smallest files.
+"""
+import hashlib
+import io
+import os
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+SAMPLE_RATE = 44100
+PALETTE_COLORS = 256
+COMPRESSION = {
+    'dev': {'compress_level': 1},
+    'release': {'compress_level': 9, 'optimize': True},
+}
+ENCODER_THREADS = min(8, os.cpu_count() or 1)
+
+_encoder_pool = None
+
+
+def encoder_pool():
+    """This process's encoding thread pool, started on first use."""
+    global _encoder_pool
+    if _encoder_pool is None:
+        _encoder_pool = ThreadPoolExecutor(ENCODER_THREADS, thread_name_prefix='encode')
+    return _encoder_pool
+
+
+def encode_wav(samples, rate=SAMPLE_RATE):
+    """Encode float samples in [-1, 1] (list or array) as mono 16-bit WAV bytes."""
+    data = (np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0) * 32767).astype(np.int16)
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(data.tobytes())
+    return buf.getvalue()
+
+
+def palettize(img):
+    """img as an exact 8-bit palette image, or None if it has too many colours.
+
+    Palette alpha goes in a tRNS table and is left out when every colour is
+    opaque, so the result never differs from img by a single pixel.
+    """
+    rgba = np.ascontiguousarray(np.asarray(img.convert('RGBA')))
+    colors, index = np.unique(rgba.view(np.uint32).ravel(), return_inverse=True)
+    if len(colors) > PALETTE_COLORS:
+        return None
+    palette = colors.view(np.uint8).reshape(-1, 4)
+    out = Image.fromarray(index.reshape(img.height, img.width).astype(np.uint8), 'P')
+    out.putpalette(palette[:, :3].tobytes())
+    if (palette[:, 3] < 255).any():
+        out.info['transparency'] = palette[:, 3].tobytes()
+    return out
+
+
+def encode_png(img, text=None, compression='release'):
+    """PNG bytes of img, with optional {key: value} text chunks.
+
+    Images with few enough colours are stored as exact palette PNGs; of the
+    rest, RGBA images that are opaque everywhere are stored as RGB.
+    """
+    if img.mode in ('RGB', 'RGBA'):
+        img = palettize(img) or img
+    if img.mode == 'RGBA' and img.getextrema()[3][0] == 255:
+        img = img.convert('RGB')
+    info = None
+    if text:
+        info = PngImagePlugin.PngInfo()
+        for key, value in text.items():
+            info.add_text(key, value)
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', pnginfo=info, **COMPRESSION[compression])
+    return buf.getvalue()
+
+
+def encode(path, payload, compression='release'):
+    """Encode a render result according to the output path's extension."""
+    return encode_wav(payload) if path.endswith('.wav') else encode_png(payload, compression=compression)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.digest()
+
+
+class AssetWriter:
+    """Writes encoded outputs under `root`, skipping byte-identical files.
+
+    `changed` collects the relpaths actually written, so incremental builds
+    can limit post-processing to them. `compression` is the PNG effort
+    (see COMPRESSION) for stages that encode images of their own.
+    """
+
+    def __init__(self, root, compression='release'):
+        self.root = root
+        self.compression = compression
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+        self.changed = set()
+
+    def unchanged(self, path, data):
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            return file_digest(path) == hashlib.sha256(data).digest()
+        except OSError:
+            return False
+
+    def write(self, relpath, data):
+        """Write data to root/relpath unless identical; return True if written."""
+        path = os.path.join(self.root, relpath)
+        if self.unchanged(path, data):
+            self.skipped += 1
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.written += 1
+        self.changed.add(relpath)
+        return True
+
+    def remove(self, relpath):
+        """Delete root/relpath if it exists; return True if it did."""
+        try:
+            os.remove(os.path.join(self.root, relpath))
+        except FileNotFoundError:
+            return False
+        self.removed += 1
+        self.changed.add(relpath)
+        return True
+
+    def summary(self):
+        removed = f", {self.removed} removed" if self.removed else ""
+        return f"{self.written} written, {self.skipped} unchanged{removed} under {self.root}"
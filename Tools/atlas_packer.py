@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Texture atlases for the small sprites: props, VFX and HUD icons.
+Each sprite is trimmed to its alpha bounding box and packed with MaxRects
+(best short side fit) into the smallest power-of-two texture that holds the
+whole group. The atlas is written with a JSON manifest and a Unity .meta in
+Multiple sprite mode, one named sub-sprite per source file; pivots are set so
+a trimmed sprite still sits where the untrimmed one did, and sprites listed
+in collider_shapes.COLLIDERS carry their traced physics shape. SceneBuilder
+takes these sprites from the atlas, finding them through the manifest.
+
+The individual PNGs stay in place; atlases are built from them after the
+main build so a partial build still refreshes every atlas it touches. The
+texture_tiers.RENDERED tiers of an atlas are packed the same way from the
+members' natively rendered tiers, with every position scaled.
+"""
+import json
+import os
+
+from PIL import Image
+import numpy as np
+
+from asset_writer import encode_png
+from collider_shapes import COLLIDERS, collider_paths
+from sprite_mesh import to_unity
+from texture_tiers import RENDERED, tier_path
+from texture_formats import applied_format
+from unity_meta import SpriteRect, existing_sprite_ids, guid_for, import_settings, texture_meta
+
+ATLAS_DIR = "Art/Atlases"
+PADDING = 2
+MAX_SIZE = 2048
+
+ATLASES = {
+    'props': [f"Art/Sprites/Props/{name}.png" for name in (
+        'pot', 'gourd', 'hairpin', 'oil_lamp', 'dhol_drum', 'gamosa',
+        'nahor_flower', 'dheki', 'spirit_orb', 'spiked_barrel')],
+    'vfx': [f"Art/VFX/{name}.png" for name in (
+        'footprint', 'beat_perfect', 'beat_good', 'beat_miss', 'corruption_particle',
+        'spirit_pulse_ring', 'memory_flash', 'vine_obstacle')],
+    'hud': [f"Art/UI/HUD/{name}.png" for name in (
+        'bar_background', 'bar_fill', 'catch_icon_active', 'catch_icon_inactive',
+        'spirit_pulse_icon')],
+}
+
+
+def trim(img):
+    """Return (cropped image, (left, top, right, bottom)) of the visible pixels."""
+    alpha = np.asarray(img)[..., 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        box = (0, 0, 1, 1)
+    else:
+        box = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+    return img.crop(box), box
+
+
+class MaxRects:
+    """MaxRects bin packer with the best short side fit heuristic."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.free = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """Place a w x h rect; return its (x, y) or None if it does not fit."""
+        best = None
+        for fx, fy, fw, fh in self.free:
+            if w <= fw and h <= fh:
+                score = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        if best is None:
+            return None
+        _, x, y = best
+        self._split(x, y, w, h)
+        return x, y
+
+    def _split(self, x, y, w, h):
+        free = []
+        for fx, fy, fw, fh in self.free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                free.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                free.append((fx, y + h, fw, fy + fh - y - h))
+        # Drop free rects wholly contained in another one.
+        self.free = [a for i, a in enumerate(free)
+                     if not any(i != j and _contains(b, a) and (b != a or j < i)
+                                for j, b in enumerate(free))]
+
+
+def _contains(outer, inner):
+    ox, oy, ow, oh = outer
+    ix, iy, iw, ih = inner
+    return ox <= ix and oy <= iy and ix + iw <= ox + ow and iy + ih <= oy + oh
+
+
+def _sizes(max_size=MAX_SIZE):
+    """Power-of-two (w, h) candidates, smallest area first, squarest first."""
+    sides = [1 << i for i in range(4, max_size.bit_length())]
+    return sorted(((w, h) for w in sides for h in sides),
+                  key=lambda s: (s[0] * s[1], abs(s[0] - s[1]), -s[0]))
+
+
+def pack(sizes, padding=PADDING, max_size=MAX_SIZE):
+    """Pack (w, h) boxes; return ((atlas w, atlas h), [(x, y) per box])."""
+    # Largest first packs tightest; ties broken by index so output is stable.
+    order = sorted(range(len(sizes)), key=lambda i: (-max(sizes[i]), -sizes[i][0] * sizes[i][1], i))
+    for width, height in _sizes(max_size):
+        packer = MaxRects(width, height)
+        places = [None] * len(sizes)
+        for i in order:
+            w, h = sizes[i]
+            places[i] = packer.insert(w + padding, h + padding)
+            if places[i] is None:
+                break
+        else:
+            return (width, height), places
+    raise ValueError(f"sprites do not fit in a {max_size}x{max_size} atlas")
+
+
+def _packed_tier(root, sprites, places, size, scale):
+    """The scale tier of an atlas packed from its members' tiers, or None if one is missing."""
+    atlas = Image.new('RGBA', (size[0] * scale, size[1] * scale), (0, 0, 0, 0))
+    for (_, relpath, _, _, box), (x, y) in zip(sprites, places):
+        path = os.path.join(root, tier_path(relpath, scale))
+        if not os.path.exists(path):
+            return None
+        with Image.open(path) as img:
+            cropped = img.convert('RGBA').crop(tuple(v * scale for v in box))
+        atlas.paste(cropped, (x * scale, y * scale))
+    return atlas
+
+
+def build_atlas(root, name, sources, compression='release'):
+    """Return {relpath: bytes} for one atlas, its tiers, manifest and .meta (None if no sources exist)."""
+    sprites = []
+    for relpath in sources:
+        path = os.path.join(root, relpath)
+        if os.path.exists(path):
+            img = Image.open(path).convert('RGBA')
+            cropped, box = trim(img)
+            sprites.append((os.path.splitext(os.path.basename(relpath))[0], relpath, img.size, cropped, box))
+    if not sprites:
+        return None
+
+    (width, height), places = pack([cropped.size for _, _, _, cropped, _ in sprites])
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    atlas_path = f"{ATLAS_DIR}/{name}_atlas.png"
+    manifest = {'texture': os.path.basename(atlas_path), 'size': [width, height], 'sprites': {}}
+    rects = []
+    places = [(x + PADDING // 2, y + PADDING // 2) for x, y in places]
+    for (sprite, relpath, (w0, h0), cropped, box), (x, y) in zip(sprites, places):
+        atlas.paste(cropped, (x, y))
+        left, top, right, bottom = box
+        w, h = cropped.size
+        # Unity rects start bottom-left; the pivot keeps the untrimmed centre.
+        rect = (x, height - y - h, w, h)
+        pivot = ((w0 / 2 - left) / w, (bottom - h0 / 2) / h)
+        shape = None
+        if relpath in COLLIDERS:
+            shape = to_unity(collider_paths(np.asarray(cropped)[..., 3], COLLIDERS[relpath]), (w, h))
+        rects.append(SpriteRect(sprite, rect, pivot, physics_shape=shape))
+        manifest['sprites'][sprite] = {
+            'source': relpath,
+            'rect': list(rect),
+            'source_size': [w0, h0],
+            'trim': [left, top, right, bottom],
+            'pivot': [round(pivot[0], 6), round(pivot[1], 6)],
+        }
+
+    png = encode_png(atlas, compression=compression)
+    meta = texture_meta(guid_for(root, atlas_path), atlas_path, sprites=rects,
+                        ids=existing_sprite_ids(root, atlas_path),
+                        texture_format=applied_format(root, atlas_path, png),
+                        **import_settings(atlas_path, (width, height)))
+    files = {
+        atlas_path: png,
+        f"{ATLAS_DIR}/{name}_atlas.json": (json.dumps(manifest, indent=2) + "\n").encode(),
+        atlas_path + ".meta": meta.encode(),
+    }
+    for scale in RENDERED:
+        tier = _packed_tier(root, sprites, places, (width, height), scale)
+        if tier is not None:
+            files[tier_path(atlas_path, scale)] = encode_png(tier, compression=compression)
+    return files
+
+
+def build_atlases(root, writer, changed=None):
+    """Pack every atlas group present under root and write it through writer.
+
+    With `changed`, only groups with a changed member are packed again.
+    """
+    for name, sources in ATLASES.items():
+        if changed is not None and changed.isdisjoint(sources):
+            continue
+        files = build_atlas(root, name, sources, writer.compression)
+        if files is None:
+            continue
+        print(f"Packing {name} atlas...")
+        for path, data in files.items():
+            print(f"  {path}" if writer.write(path, data) else f"  {path} (unchanged)")
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Build entry point for every generated asset.
+
+    python Tools/build_assets.py                  # everything
+    python Tools/build_assets.py --only act3      # one act (ids, names or tags)
+    python Tools/build_assets.py --tag audio      # all WAVs
+    python Tools/build_assets.py --list           # show what would be built
+    python Tools/build_assets.py --check          # fail on duplicate output paths
+    python Tools/build_assets.py --jobs 8         # render on 8 worker processes
+    python Tools/build_assets.py --watch          # rebuild on save
+    python Tools/build_assets.py --compression dev  # fast, larger PNGs
+    python Tools/build_assets.py --scale 0.25 --root /tmp/draft  # quick preview
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+import atlas_packer
+import collider_shapes
+import layer_crop
+import layer_occlusion
+import raster
+import sprite_mesh
+import sprite_sheets
+import svg_export
+import texture_alpha
+import texture_formats
+import texture_import
+import texture_tiers
+from asset_registry import PROJECT_ROOT, load_registry, source_name, SOURCES
+from asset_writer import COMPRESSION, AssetWriter, encode, encoder_pool
+from render_cache import CACHE_DIR, CACHE_SIZE_MB, RenderCache, cache_key
+
+# Post-processing run after every build over the files now on disk;
+# each stage is called as stage(root, writer, changed), where changed is
+# the set of relpaths written so far in an incremental build (earlier
+# stages' outputs included) or None to process everything.
+STAGES = [
+    atlas_packer.build_atlases,
+    sprite_mesh.build_meshes,
+    collider_shapes.build_colliders,
+    layer_crop.build_manifest,
+    sprite_sheets.build_sheets,
+    texture_tiers.build_tiers,
+    texture_import.build_metas,
+    texture_formats.advise_formats,
+    texture_alpha.sync_alpha,
+]
+
+
+def _encode_output(path, payload, compression):
+    source, _ = texture_tiers.tier_source(path)
+    if layer_crop.is_layer(source):
+        return layer_crop.encode_layer(payload, compression)
+    if sprite_sheets.is_sheet(source):
+        return sprite_sheets.encode_sheet(source, payload, compression)
+    return encode(path, payload, compression)
+
+
+def encode_async(asset, paths, compression, scale=1):
+    """Run one asset and queue its outputs on the encoder pool; return {relpath: future}.
+
+    Backdrops are flattened (see texture_alpha) and hidden layer pixels
+    culled (see layer_occlusion) before encoding. The asset is run again at
+    each texture_tiers.RENDERED scale for the tiers of its images, which are
+    culled with the masks found at this scale rather than their own, and
+    images an asset tagged for vectors drew also get an SVG beside them where
+    svg_export.worth_writing says so (a future of None otherwise).
+    """
+    pool = encoder_pool()
+    with raster.render_scale(scale), svg_export.capture(asset) as vectors:
+        payloads = asset.run()
+    flat = texture_alpha.flatten(payloads)
+    masks = layer_occlusion.occluded(flat, layer_occlusion.scene_parallax(), scale)
+    futures = {path: pool.submit(_encode_output, path, payload, compression)
+               for path, payload in layer_occlusion.cull(flat, masks).items() if path in paths}
+    for tier in texture_tiers.RENDERED:
+        if not any(texture_tiers.rendered(path, tier) for path in paths):
+            continue
+        with raster.render_scale(scale * tier):
+            tier_payloads = layer_occlusion.cull(texture_alpha.flatten(asset.run()), masks)
+        for path, payload in tier_payloads.items():
+            if path in futures and texture_tiers.rendered(path, tier):
+                tier_relpath = texture_tiers.tier_path(path, tier)
+                futures[tier_relpath] = pool.submit(_encode_output, tier_relpath, payload, compression)
+    for path, canvas in vectors.canvases(payloads).items():
+        if path in paths:
+            pngs = [futures[p] for p in (path, texture_tiers.tier_path(path, 2)) if p in futures]
+            futures[svg_export.svg_path(path)] = pool.submit(_vector_output, canvas, pngs)
+    return futures
+
+
+def _remove_output(writer, path):
+    """Delete an output that was not produced, with its .meta, tiers and SVG; True if any existed."""
+    stale = [path, svg_export.svg_path(path)] + [texture_tiers.tier_path(path, s)
+                                                 for s in texture_tiers.TIERS]
+    return any([writer.remove(p) | writer.remove(p + ".meta") for p in stale])
+
+
+def _vector_output(canvas, pngs):
+    # The PNGs were queued first, so waiting on them here cannot starve the pool.
+    svg = canvas.document()
+    return svg if svg_export.worth_writing(svg, [f.result() for f in pngs]) else None
+
+
+def _results(futures):
+    """{relpath: bytes} of the encoded outputs that were produced."""
+    files = {path: future.result() for path, future in futures.items()}
+    return {path: data for path, data in files.items() if data is not None}
+
+
+def render_asset(asset, paths, compression, scale=1):
+    """Run one asset and return {relpath: encoded bytes} for the given paths."""
+    return _results(encode_async(asset, paths, compression, scale))
+
+
+# ============ WORKER POOL ============
+# Workers rebuild the registry once and receive only asset ids; results come
+# back as encoded bytes so nothing unpicklable crosses the process boundary.
+
+_worker_registry = None
+
+
+def _init_worker():
+    global _worker_registry
+    _worker_registry = load_registry()
+
+
+def _render_in_worker(asset_id, paths, compression, scale):
+    return render_asset(_worker_registry.get(asset_id), paths, compression, scale)
+
+
+def make_pool(jobs):
+    """Process pool whose workers start with numpy and PIL already imported."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(['numpy', 'PIL.Image', 'PIL.ImageDraw',
+                                    'PIL.ImageFilter', 'asset_registry'])
+    else:
+        ctx = multiprocessing.get_context('spawn')
+    return ctx.Pool(jobs, initializer=_init_worker)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate Tejimola art and audio assets.")
+    parser.add_argument('--only', action='append', default=[], metavar='PATTERN',
+                        help="asset id, name or tag to build (fnmatch, repeatable)")
+    parser.add_argument('--tag', action='append', default=[],
+                        help="require this tag (repeatable, all must match)")
+    parser.add_argument('--source', action='append', default=[],
+                        choices=[source_name(m) for m in SOURCES],
+                        help="restrict to one generator module (repeatable)")
+    parser.add_argument('--list', action='store_true', help="list selected assets and exit")
+    parser.add_argument('--check', action='store_true',
+                        help="report output paths claimed twice and exit non-zero if any")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count; 1 renders in-process)")
+    parser.add_argument('--compression', choices=sorted(COMPRESSION), default='release',
+                        help="PNG effort: dev is fast, release is smallest (default)")
+    parser.add_argument('--scale', type=float, default=1,
+                        help="render at this multiple of the authored size, e.g. 0.25 for "
+                             "drafts or 2 for HD (use with --root to keep the project at 1x)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="render everything, ignoring and not updating the cache")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE_MB, metavar='MB',
+                        help="evict least recently used entries beyond this size")
+    parser.add_argument('--watch', action='store_true',
+                        help="build, then rebuild affected assets whenever a generator is saved")
+    parser.add_argument('--poll', type=float, default=0.1, metavar='SECONDS',
+                        help="--watch polling interval")
+    parser.add_argument('--root', default=PROJECT_ROOT,
+                        help="project directory outputs are written under")
+    return parser.parse_args(argv)
+
+
+def report_conflicts(conflicts):
+    for path, ids in sorted(conflicts.items()):
+        print(f"  conflict: {path} <- {', '.join(ids)} (using {ids[-1]})")
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    reg = load_registry()
+    assets = reg.select(args.only, args.tag, args.source)
+
+    if args.check:
+        conflicts = reg.conflicts()
+        report_conflicts(conflicts)
+        print(f"{len(reg.assets)} assets, {len(conflicts)} conflicting paths")
+        sys.exit(1 if conflicts else 0)
+
+    if args.list:
+        for asset in assets:
+            print(f"{asset.id:45s} [{', '.join(asset.tags)}]")
+            for path in asset.paths:
+                print(f"    {path}")
+        print(f"{len(assets)} assets")
+        return
+
+    if not assets:
+        print("No assets match the selection.")
+        sys.exit(1)
+
+    selected = {path for asset in assets for path in asset.paths}
+    conflicts = {path: ids for path, ids in reg.conflicts().items() if path in selected}
+    if conflicts:
+        print(f"{len(conflicts)} output paths are claimed by more than one generator:")
+        report_conflicts(conflicts)
+        print()
+
+    if args.watch:
+        import watch_assets
+        watch_assets.watch(args, reg, assets)
+    else:
+        build(reg, assets, args)
+
+
+def plan(reg, assets):
+    """Return {asset id: paths it owns} for the assets that own any output.
+
+    Output ownership is decided over the whole registry so that narrowing
+    the selection never changes which generator writes a given file.
+    """
+    owner = reg.owners()
+    jobs = {}
+    for asset in assets:
+        paths = [path for path in asset.paths if owner[path] == asset.id]
+        if paths:
+            jobs[asset.id] = paths
+    return jobs
+
+
+def build(reg, assets, args, workers=None, report_skips=True, incremental=False):
+    """Render (or restore) assets and write their outputs; return {asset id: cache key}.
+
+    An incremental build only post-processes the outputs it changed.
+    """
+    jobs = plan(reg, assets)
+    keys = {asset.id: cache_key(asset, jobs[asset.id], args.compression, args.scale)
+            for asset in assets if asset.id in jobs}
+
+    cache = None if args.no_cache else RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    cached = {}
+    if cache:
+        for asset_id, key in keys.items():
+            files = cache.get(key)
+            if files is not None:
+                cached[asset_id] = files
+
+    writer = AssetWriter(args.root, args.compression)
+    for asset_id, files in _run(reg, assets, jobs, workers or args.jobs, cached,
+                                args.compression, args.scale):
+        if asset_id in cached:
+            print(f"Restoring {asset_id} (cached)")
+        else:
+            print(f"Generating {asset_id}...")
+            if cache:
+                cache.put(keys[asset_id], files)
+        for path, data in files.items():
+            print(f"  {path}" if writer.write(path, data) else f"  {path} (unchanged)")
+        # Layers culled down to nothing (see layer_occlusion) are not produced.
+        for path in jobs[asset_id]:
+            if path not in files:
+                removed = _remove_output(writer, path)
+                print(f"  {path} (nothing visible, not written"
+                      f"{'; old copy removed' if removed else ''})")
+
+    for stage in STAGES:
+        stage(args.root, writer, writer.changed if incremental else None)
+
+    if report_skips:
+        for asset in assets:
+            if asset.id not in jobs:
+                print(f"Skipped {asset.id} (all outputs owned by other generators)")
+    print(f"\n{writer.summary()}")
+    if cache:
+        evicted = cache.prune()
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses"
+              + (f", {evicted} entries evicted" if evicted else ""))
+    return keys
+
+
+def _run(reg, assets, jobs, workers, cached, compression, scale):
+    """Yield (asset id, files) in registry order, whatever order they finish in."""
+    order = [asset.id for asset in assets if asset.id in jobs]
+    todo = [asset_id for asset_id in order if asset_id not in cached]
+    workers = max(1, min(workers, len(todo)))
+    if workers == 1:
+        # Each asset is drawn while the one before it is still encoding.
+        encoding = None
+        for asset_id in order:
+            if asset_id in cached:
+                files = cached[asset_id]
+            else:
+                files = encode_async(reg.get(asset_id), jobs[asset_id], compression, scale)
+            if encoding:
+                yield encoding[0], _results(encoding[1])
+                encoding = None
+            if asset_id in cached:
+                yield asset_id, files
+            else:
+                encoding = asset_id, files
+        if encoding:
+            yield encoding[0], _results(encoding[1])
+        return
+
+    with make_pool(workers) as pool:
+        pending = {asset_id: pool.apply_async(_render_in_worker,
+                                              (asset_id, jobs[asset_id], compression, scale))
+                   for asset_id in todo}
+        for asset_id in order:
+            if asset_id in cached:
+                yield asset_id, cached[asset_id]
+            else:
+                yield asset_id, pending[asset_id].get()
+
+
+if __name__ == "__main__":
+    main()
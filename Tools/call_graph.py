@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Static call graph over the generator modules.
+Starting from an asset's render function, follow every global name it loads
+to the top-level functions, classes and constants that define it, across any
+module that lives in this repo. The AST of exactly that code is the asset's
+code fingerprint, so editing draw_dom_frame leaves background and audio
+fingerprints untouched.
+"""
+import ast
+import hashlib
+import inspect
+import os
+import sys
+
+from asset_registry import REPO_ROOT
+
+PALETTES = ('C', 'COLORS', 'PALETTE')
+
+_modules = {}
+
+
+class ModuleIndex:
+    """Top-level definitions of one module, by name."""
+
+    def __init__(self, module):
+        self.module = module
+        self.name = module.__name__
+        self.defs = {}
+        self._dumps = {}
+        self._loads = {}
+        try:
+            tree = ast.parse(inspect.getsource(module))
+        except (OSError, TypeError):
+            tree = ast.Module(body=[], type_ignores=[])
+        for node in tree.body:
+            for name in _defined_names(node):
+                self.defs.setdefault(name, []).append(node)
+
+    def dump(self, name):
+        if name not in self._dumps:
+            self._dumps[name] = '\n'.join(ast.dump(node) for node in self.defs[name])
+        return self._dumps[name]
+
+    def loads(self, name):
+        if name not in self._loads:
+            self._loads[name] = list(_loads(self.defs[name]))
+        return self._loads[name]
+
+
+def _defined_names(node):
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        names = []
+        for target in targets:
+            names += [n.id for n in ast.walk(target) if isinstance(n, ast.Name)]
+        return names
+    return []
+
+
+def in_repo(module):
+    path = getattr(module, '__file__', None)
+    return bool(path) and os.path.abspath(path).startswith(REPO_ROOT + os.sep)
+
+
+def index(module):
+    if module.__name__ not in _modules:
+        _modules[module.__name__] = ModuleIndex(module)
+    return _modules[module.__name__]
+
+
+def forget(module_name):
+    """Drop a cached module index (after the module is reloaded)."""
+    _modules.pop(module_name, None)
+
+
+def _loads(nodes):
+    """Yield (name, palette key or None, attribute or None) for every global load.
+
+    Literal palette lookups such as C['skin'] yield the key so that only the
+    entries actually read are fingerprinted; module attribute access such as
+    raster.gradient yields the attribute so it can be followed.
+    """
+    parents = {}
+    for root in nodes:
+        for node in ast.walk(root):
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+    for root in nodes:
+        for node in ast.walk(root):
+            if not (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)):
+                continue
+            parent = parents.get(node)
+            key = attr = None
+            if (node.id in PALETTES and isinstance(parent, ast.Subscript) and parent.value is node
+                    and isinstance(parent.slice, ast.Constant)
+                    and isinstance(parent.slice.value, str)):
+                key = parent.slice.value
+            elif isinstance(parent, ast.Attribute) and parent.value is node:
+                attr = parent.attr
+            yield node.id, key, attr
+
+
+def reachable(funcs):
+    """Return {(module name, def name): module} and palette reads reachable from funcs.
+
+    Palette reads are {(module name, palette name): set of keys, or None when
+    the palette is used as a whole}.
+    """
+    seen = {}
+    palettes = {}
+    stack = []
+    for func in funcs:
+        module = sys.modules.get(func.__module__)
+        if module is not None:
+            stack.append((module, func.__name__))
+
+    while stack:
+        module, name = stack.pop()
+        idx = index(module)
+        if (idx.name, name) in seen or name not in idx.defs:
+            continue
+        seen[(idx.name, name)] = module
+        for ref, key, attr in idx.loads(name):
+            target = module.__dict__.get(ref)
+            if ref in PALETTES and ref in idx.defs:
+                keys = palettes.setdefault((idx.name, ref), set())
+                if key is None:
+                    palettes[(idx.name, ref)] = None
+                elif keys is not None:
+                    keys.add(key)
+                continue
+            if ref in idx.defs:
+                stack.append((module, ref))
+            elif inspect.ismodule(target) and in_repo(target) and attr:
+                stack.append((target, attr))
+            elif (inspect.isfunction(target) or inspect.isclass(target)) and target.__module__:
+                owner = sys.modules.get(target.__module__)
+                if owner is not None and in_repo(owner):
+                    stack.append((owner, target.__name__))
+    return seen, palettes
+
+
+def fingerprint(funcs):
+    """sha256 over the AST of all code reachable from funcs."""
+    seen, palettes = reachable(funcs)
+    h = hashlib.sha256()
+    for (mod_name, name), module in sorted(seen.items(), key=lambda kv: kv[0]):
+        h.update(f"{mod_name}.{name}\n".encode())
+        h.update(index(module).dump(name).encode())
+    for (mod_name, palette), keys in sorted(palettes.items(), key=lambda kv: kv[0]):
+        values = getattr(sys.modules[mod_name], palette, {})
+        if keys is None:
+            h.update(f"{mod_name}.{palette}={values!r}\n".encode())
+        else:
+            for key in sorted(keys):
+                h.update(f"{mod_name}.{palette}[{key!r}]={values.get(key)!r}\n".encode())
+    return h.hexdigest()
+
+
+def changed_defs(old, new):
+    """Names of top-level definitions added, removed or edited between two indexes."""
+    names = set(old.defs) | set(new.defs)
+    return sorted(name for name in names
+                  if name not in old.defs or name not in new.defs
+                  or old.dump(name) != new.dump(name))
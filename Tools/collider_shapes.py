@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Collider polygons for the sprites gameplay prefabs collide with.
+The alpha mask is contoured with marching squares (every cell classified
+in one numpy pass, then the oriented segments chained into loops) and each
+outer loop is reduced with Douglas-Peucker, refining the worst-fitting span
+first until the loop hits its vertex budget or fits within TOLERANCE.
+Holes are dropped: a collider with a hole in it is still solid there.
+
+The polygons are written as the sprite's physics shape in its .meta, which
+is what PolygonCollider2D picks up when it is added to the sprite.
+"""
+import heapq
+import os
+
+from PIL import Image
+import numpy as np
+
+from sprite_mesh import polygon_area, to_unity
+from texture_formats import applied_format
+from unity_meta import guid_for, import_settings, texture_meta
+
+# relpath -> vertex budget per collider path
+COLLIDERS = {
+    "Art/Sprites/Props/spiked_barrel.png": 12,
+    "Art/Sprites/Props/dheki.png": 16,
+    "Art/VFX/vine_obstacle.png": 12,
+}
+ALPHA_THRESHOLD = 128
+TOLERANCE = 0.75
+MIN_AREA = 16
+
+# Cell corners, clockwise from top-left, as (x, y) offsets; the case index
+# has tl as its high bit. Edge midpoints: top, right, bottom, left.
+_CORNERS = [(0, 0), (1, 0), (1, 1), (0, 1)]
+_EDGES = {'T': (0.5, 0), 'R': (1, 0.5), 'B': (0.5, 1), 'L': (0, 0.5)}
+# Saddles (5, 10) are resolved as two separate corners.
+_CASES = {1: ['LB'], 2: ['BR'], 3: ['LR'], 4: ['TR'], 5: ['LB', 'TR'], 6: ['TB'],
+          7: ['LT'], 8: ['LT'], 9: ['TB'], 10: ['LT', 'BR'], 11: ['TR'],
+          12: ['LR'], 13: ['BR'], 14: ['LB']}
+
+
+def _oriented(case, a, b):
+    """Order edges a, b so the nearest filled corner lies to the right (y down)."""
+    (ax, ay), (bx, by) = _EDGES[a], _EDGES[b]
+    mx, my = (ax + bx) / 2, (ay + by) / 2
+    filled = [c for i, c in enumerate(_CORNERS) if case >> (3 - i) & 1]
+    cx, cy = min(filled, key=lambda c: (c[0] - mx) ** 2 + (c[1] - my) ** 2)
+    cross = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (a, b) if cross > 0 else (b, a)
+
+
+_SEGMENTS = {case: [_oriented(case, *edges) for edges in segs]
+             for case, segs in _CASES.items()}
+
+
+def contours(mask):
+    """Closed loops around the True pixels; pixel (x, y) spans [x, x + 1).
+
+    Points lie on pixel centres or midway between them; loops around filled
+    regions run clockwise on screen, holes anticlockwise.
+    """
+    padded = np.pad(mask.astype(np.uint8), 1)
+    case = (padded[:-1, :-1] << 3 | padded[:-1, 1:] << 2
+            | padded[1:, 1:] << 1 | padded[1:, :-1])
+    # Doubled coordinates keep the segment endpoints integral for chaining.
+    nxt = {}
+    for value, segments in _SEGMENTS.items():
+        ys, xs = np.nonzero(case == value)
+        for a, b in segments:
+            (ax, ay), (bx, by) = _EDGES[a], _EDGES[b]
+            starts = zip((2 * (xs + ax)).astype(int).tolist(), (2 * (ys + ay)).astype(int).tolist())
+            ends = zip((2 * (xs + bx)).astype(int).tolist(), (2 * (ys + by)).astype(int).tolist())
+            nxt.update(zip(starts, ends))
+
+    loops = []
+    while nxt:
+        start, point = nxt.popitem()
+        loop = [start]
+        while point != start:
+            loop.append(point)
+            point = nxt.pop(point)
+        # Padded corner (x, y) is the centre of pixel (x - 1, y - 1).
+        loops.append([(x / 2 - 0.5, y / 2 - 0.5) for x, y in loop])
+    return loops
+
+
+def _signed_area(loop):
+    xs, ys = np.array(loop).T
+    return (np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1))) / 2
+
+
+def _farthest(points, i, j):
+    """(distance, index) of the point between i and j farthest from chord i-j."""
+    if j - i < 2:
+        return 0.0, None
+    (ax, ay), (bx, by) = points[i], points[j]
+    inner = points[i + 1:j]
+    dx, dy = bx - ax, by - ay
+    length = np.hypot(dx, dy)
+    if length == 0:
+        dist = np.hypot(inner[:, 0] - ax, inner[:, 1] - ay)
+    else:
+        dist = np.abs(dx * (inner[:, 1] - ay) - dy * (inner[:, 0] - ax)) / length
+    k = int(np.argmax(dist))
+    return float(dist[k]), i + 1 + k
+
+
+def simplify(loop, max_vertices, tolerance=TOLERANCE):
+    """Douglas-Peucker on a closed loop, worst span first, capped at max_vertices."""
+    points = np.array(loop + loop[:1], dtype=np.float64)
+    # Seed with the first point and the one farthest from it.
+    far = int(np.argmax(np.hypot(*(points[:-1] - points[0]).T)))
+    keep = {0, far, len(loop)}
+    heap = []
+    for i, j in ((0, far), (far, len(loop))):
+        dist, k = _farthest(points, i, j)
+        if k is not None:
+            heapq.heappush(heap, (-dist, i, j, k))
+    while heap and len(keep) - 1 < max_vertices:
+        dist, i, j, k = heapq.heappop(heap)
+        if -dist <= tolerance:
+            break
+        keep.add(k)
+        for a, b in ((i, k), (k, j)):
+            dist, m = _farthest(points, a, b)
+            if m is not None:
+                heapq.heappush(heap, (-dist, a, b, m))
+    return [(float(points[i, 0]), float(points[i, 1])) for i in sorted(keep)[:-1]]
+
+
+def collider_paths(alpha, max_vertices, threshold=ALPHA_THRESHOLD):
+    """Simplified outer loops of the opaque part of alpha, largest first."""
+    loops = [loop for loop in contours(alpha >= threshold)
+             if _signed_area(loop) > 0 and polygon_area(loop) >= MIN_AREA]
+    loops.sort(key=polygon_area, reverse=True)
+    return [simplify(loop, max_vertices) for loop in loops]
+
+
+def build_collider(root, relpath, max_vertices):
+    """Return (.meta bytes, paths) for one sprite."""
+    img = Image.open(os.path.join(root, relpath)).convert('RGBA')
+    paths = collider_paths(np.asarray(img)[..., 3], max_vertices)
+    meta = texture_meta(guid_for(root, relpath), relpath, physics_shape=to_unity(paths, img.size),
+                        texture_format=applied_format(root, relpath),
+                        **import_settings(relpath, img.size))
+    return meta.encode(), paths
+
+
+def build_colliders(root, writer, changed=None):
+    """Write a physics-shape .meta beside every (changed) collider sprite present under root."""
+    present = [(relpath, budget) for relpath, budget in COLLIDERS.items()
+               if os.path.exists(os.path.join(root, relpath))
+               and (changed is None or relpath in changed)]
+    if present:
+        print("Tracing collider shapes...")
+    for relpath, budget in present:
+        meta, paths = build_collider(root, relpath, budget)
+        status = "" if writer.write(relpath + ".meta", meta) else " (unchanged)"
+        sizes = ", ".join(str(len(path)) for path in paths) or "none"
+        print(f"  {relpath}.meta: {len(paths)} paths ({sizes} vertices){status}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Recorded draw calls, replayable at any offset and scale.
+A Recorder stands in for an image: pass it to a draw function and the
+primitives it issues are kept instead of drawn. finish() packs them into a
+DisplayList of flat arrays (op codes, coordinates, palette indices, widths)
+that replays the same calls onto any ImageDraw, shifted by an offset.
+Replayed through raster.Draw it follows the render scale like the
+original function would.
+
+Frame functions such as draw_dom_frame take (img, ox, oy, ...) and only
+ever draw relative to the offset, so recorded() draws each distinct pose
+once at the origin and every frame that repeats it is a replay.
+"""
+import numpy as np
+
+OPS = ('rectangle', 'ellipse', 'polygon', 'line', 'arc', 'point')
+NO_COLOR = -1
+
+# Recorded lists, keyed by (draw function, args, kwargs).
+_lists = {}
+
+
+class Recorder:
+    """Draw-call stand-in that records primitives for a DisplayList."""
+
+    def __init__(self):
+        self._ops = []
+        self._coords = []
+        self._colors = {}
+        self._fill = []
+        self._outline = []
+        self._width = []
+        self._angles = []
+
+    def _color(self, color):
+        if color is None:
+            return NO_COLOR
+        return self._colors.setdefault(tuple(color), len(self._colors))
+
+    def _add(self, op, xy, fill=None, outline=None, width=0, angles=(0, 0)):
+        self._ops.append(OPS.index(op))
+        self._coords.append(np.asarray(xy, dtype=np.float64).reshape(-1))
+        self._fill.append(self._color(fill))
+        self._outline.append(self._color(outline))
+        self._width.append(width)
+        self._angles.append(angles)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._add('rectangle', xy, fill, outline, width)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._add('ellipse', xy, fill, outline, width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self._add('polygon', xy, fill, outline, width)
+
+    def line(self, xy, fill=None, width=0):
+        self._add('line', xy, fill, width=width)
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self._add('arc', xy, fill, width=width, angles=(start, end))
+
+    def point(self, xy, fill=None):
+        self._add('point', xy, fill)
+
+    def finish(self):
+        """The DisplayList of everything recorded so far."""
+        coords = np.concatenate(self._coords) if self._coords else np.zeros(0)
+        if np.array_equal(coords, np.round(coords)):
+            coords = coords.astype(np.int32)
+        return DisplayList(
+            ops=np.array(self._ops, dtype=np.uint8),
+            starts=np.cumsum([0] + [len(c) for c in self._coords]).astype(np.int32),
+            coords=coords,
+            fill=np.array(self._fill, dtype=np.int16),
+            outline=np.array(self._outline, dtype=np.int16),
+            width=np.array(self._width, dtype=np.uint8),
+            angles=np.array(self._angles, dtype=np.float64).reshape(-1, 2),
+            palette=list(self._colors),
+        )
+
+
+class DisplayList:
+    """Array-backed list of draw calls; coordinates are flat (x, y) pairs."""
+
+    def __init__(self, ops, starts, coords, fill, outline, width, angles, palette):
+        self.ops = ops
+        self.starts = starts
+        self.coords = coords
+        self.fill = fill
+        self.outline = outline
+        self.width = width
+        self.angles = angles
+        self.palette = palette
+        self._calls = None
+
+    def __len__(self):
+        return len(self.ops)
+
+    def calls(self):
+        """(method name, coordinate slice, args, kwargs) for each recorded call."""
+        if self._calls is None:
+            colors = self.palette + [None]  # NO_COLOR indexes the None on the end
+            self._calls = []
+            for i, code in enumerate(self.ops.tolist()):
+                name = OPS[code]
+                args, kwargs = (), {'fill': colors[self.fill[i]]}
+                if name in ('rectangle', 'ellipse', 'polygon'):
+                    kwargs['outline'] = colors[self.outline[i]]
+                if name == 'arc':
+                    args = tuple(self.angles[i].tolist())
+                if name != 'point':
+                    kwargs['width'] = int(self.width[i])
+                self._calls.append((name, slice(self.starts[i], self.starts[i + 1]), args, kwargs))
+        return self._calls
+
+    def replay(self, draw, ox=0, oy=0):
+        """Issue the recorded calls on draw, shifted by (ox, oy)."""
+        self.replay_many(draw, [(ox, oy)])
+
+    def replay_many(self, draw, offsets):
+        """Replay once at each (ox, oy) in offsets, in order.
+
+        The shifted coordinates of every copy come from one array addition.
+        """
+        shifts = np.asarray(offsets).reshape(-1, 1, 2)
+        frames = (self.coords.reshape(1, -1, 2) + shifts).reshape(len(shifts), -1).tolist()
+        methods = {name: getattr(draw, name) for name in OPS}
+        calls = [(methods[name], span, args, kwargs) for name, span, args, kwargs in self.calls()]
+        for coords in frames:
+            for method, span, args, kwargs in calls:
+                method(coords[span], *args, **kwargs)
+
+
+def record(draw_frame, *args, **kwargs):
+    """DisplayList of draw_frame(recorder, 0, 0, *args, **kwargs)."""
+    recorder = Recorder()
+    draw_frame(recorder, 0, 0, *args, **kwargs)
+    return recorder.finish()
+
+
+def recorded(draw_frame, *args, **kwargs):
+    """record(), memoized per draw function and arguments."""
+    key = (draw_frame, args, tuple(sorted(kwargs.items())))
+    if key not in _lists:
+        _lists[key] = record(draw_frame, *args, **kwargs)
+    return _lists[key]
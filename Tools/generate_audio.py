@@ -4,51 +4,12 @@ Generate procedural audio assets (WAV files) for the game.
 Creates music tracks, sound effects, and ambient sounds.
 Uses basic wave synthesis for Indian-style music patterns.
 """
-import struct
 import math
-import os
-import random
-
-MUSIC_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Audio/Music"
-SFX_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Audio/SFX"
-RESOURCES_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Resources/Audio"
-
-for d in [MUSIC_DIR, SFX_DIR, RESOURCES_DIR, os.path.join(RESOURCES_DIR, "Music"), os.path.join(RESOURCES_DIR, "SFX")]:
-    os.makedirs(d, exist_ok=True)
 
 SAMPLE_RATE = 44100
 MAX_AMP = 32767
 
 
-def write_wav(filename, samples, sample_rate=SAMPLE_RATE, channels=1):
-    """Write samples to WAV file."""
-    num_samples = len(samples)
-    data_size = num_samples * 2 * channels
-
-    with open(filename, 'wb') as f:
-        # RIFF header
-        f.write(b'RIFF')
-        f.write(struct.pack('<I', 36 + data_size))
-        f.write(b'WAVE')
-
-        # fmt chunk
-        f.write(b'fmt ')
-        f.write(struct.pack('<I', 16))  # chunk size
-        f.write(struct.pack('<H', 1))   # PCM
-        f.write(struct.pack('<H', channels))
-        f.write(struct.pack('<I', sample_rate))
-        f.write(struct.pack('<I', sample_rate * channels * 2))  # byte rate
-        f.write(struct.pack('<H', channels * 2))  # block align
-        f.write(struct.pack('<H', 16))  # bits per sample
-
-        # data chunk
-        f.write(b'data')
-        f.write(struct.pack('<I', data_size))
-        for s in samples:
-            value = max(-MAX_AMP, min(MAX_AMP, int(s * MAX_AMP)))
-            f.write(struct.pack('<h', value))
-
-
 def sine_wave(freq, duration, amplitude=0.5, sample_rate=SAMPLE_RATE):
     """Generate sine wave samples."""
     samples = []
@@ -84,11 +45,11 @@ def sawtooth_wave(freq, duration, amplitude=0.3, sample_rate=SAMPLE_RATE):
     return samples
 
 
-def noise(duration, amplitude=0.3, sample_rate=SAMPLE_RATE):
+def noise(rng, duration, amplitude=0.3, sample_rate=SAMPLE_RATE):
     """Generate white noise."""
     samples = []
     for i in range(int(sample_rate * duration)):
-        samples.append(amplitude * (random.random() * 2 - 1))
+        samples.append(amplitude * (rng.random() * 2 - 1))
     return samples
 
 
@@ -178,25 +139,25 @@ def generate_drone(freq, duration, amplitude=0.15):
     return drone
 
 
-def generate_tabla_hit(pitch='high', duration=0.15):
+def generate_tabla_hit(rng, pitch='high', duration=0.15):
     """Generate tabla-like percussion hit."""
     if pitch == 'high':
         # Dha/Na - sharp attack
         freq = 400
         s = envelope(sine_wave(freq, duration, 0.6), attack=0.001, decay=0.05, sustain=0.1, release=0.6)
-        n = envelope(noise(duration, 0.2), attack=0.001, decay=0.02, sustain=0.0, release=0.3)
+        n = envelope(noise(rng, duration, 0.2), attack=0.001, decay=0.02, sustain=0.0, release=0.3)
         return mix([s, n])
     else:
         # Bass hit
         freq = 120
         s = envelope(sine_wave(freq, duration * 1.5, 0.7), attack=0.001, decay=0.1, sustain=0.2, release=0.5)
-        n = envelope(noise(duration, 0.15), attack=0.001, decay=0.01, sustain=0.0, release=0.2)
+        n = envelope(noise(rng, duration, 0.15), attack=0.001, decay=0.01, sustain=0.0, release=0.2)
         return mix([s, n])
 
 
 # ============ MUSIC TRACKS ============
 
-def generate_act1_music():
+def generate_act1_music(rng):
     """Act I: Happy Home - warm, golden, traditional Assamese feel."""
     duration = 30  # 30 second loop
 
@@ -220,7 +181,7 @@ def generate_act1_music():
     beat_duration = 60 / 90  # 90 BPM
     beat_samples = int(SAMPLE_RATE * beat_duration)
     while len(rhythm) < len(drone):
-        hit = generate_tabla_hit('high', 0.1)
+        hit = generate_tabla_hit(rng, 'high', 0.1)
         rhythm.extend(hit)
         rhythm.extend([0.0] * max(0, beat_samples - len(hit)))
     rhythm = rhythm[:len(drone)]
@@ -230,7 +191,7 @@ def generate_act1_music():
     return result
 
 
-def generate_act2_music():
+def generate_act2_music(rng):
     """Act II: Descent - darker, more tension, descending patterns."""
     duration = 30
 
@@ -254,7 +215,7 @@ def generate_act2_music():
     i = 0
     while len(rhythm) < len(drone):
         pitch = 'low' if i % 4 == 0 else 'high'
-        hit = generate_tabla_hit(pitch, 0.12)
+        hit = generate_tabla_hit(rng, pitch, 0.12)
         rhythm.extend(hit)
         rhythm.extend([0.0] * max(0, beat_samples - len(hit)))
         i += 1
@@ -265,7 +226,7 @@ def generate_act2_music():
     return result
 
 
-def generate_dheki_rhythm():
+def generate_dheki_rhythm(rng):
     """Dheki rhythm track - for the rice husker minigame."""
     duration = 60  # Longer for gameplay
 
@@ -279,9 +240,9 @@ def generate_dheki_rhythm():
 
         # Dheki thump (heavy, wooden)
         if beat_num % 2 == 0:
-            hit = generate_tabla_hit('low', 0.2)
+            hit = generate_tabla_hit(rng, 'low', 0.2)
         else:
-            hit = generate_tabla_hit('high', 0.15)
+            hit = generate_tabla_hit(rng, 'high', 0.15)
 
         samples.extend(hit)
         remaining = int(SAMPLE_RATE * beat_interval) - len(hit)
@@ -319,7 +280,7 @@ def generate_act3_music():
     return result
 
 
-def generate_act4_boss_music():
+def generate_act4_boss_music(rng):
     """Act IV: Boss fight - intense, driving, dramatic."""
     duration = 30
 
@@ -343,7 +304,7 @@ def generate_act4_boss_music():
     beat_samples = int(SAMPLE_RATE * beat_duration)
     i = 0
     while len(rhythm) < len(drone):
-        hit = generate_tabla_hit('low' if i % 2 == 0 else 'high', 0.08)
+        hit = generate_tabla_hit(rng, 'low' if i % 2 == 0 else 'high', 0.08)
         rhythm.extend(hit)
         rhythm.extend([0.0] * max(0, beat_samples - len(hit)))
         i += 1
@@ -398,7 +359,7 @@ def generate_menu_music():
 
 # ============ SFX ============
 
-def generate_sfx():
+def generate_sfx(rng):
     """Generate all sound effects."""
     sfx = {}
 
@@ -406,14 +367,14 @@ def generate_sfx():
     for surface in ['wood', 'grass', 'stone']:
         for i in range(3):
             if surface == 'wood':
-                freq = 200 + random.randint(-30, 30)
-                s = envelope(mix([sine_wave(freq, 0.05, 0.5), noise(0.05, 0.3)]),
+                freq = 200 + rng.randint(-30, 30)
+                s = envelope(mix([sine_wave(freq, 0.05, 0.5), noise(rng, 0.05, 0.3)]),
                            attack=0.001, decay=0.01, sustain=0.0, release=0.5)
             elif surface == 'grass':
-                s = envelope(noise(0.08, 0.2), attack=0.001, decay=0.02, sustain=0.0, release=0.6)
+                s = envelope(noise(rng, 0.08, 0.2), attack=0.001, decay=0.02, sustain=0.0, release=0.6)
             else:
-                freq = 300 + random.randint(-50, 50)
-                s = envelope(mix([sine_wave(freq, 0.04, 0.4), noise(0.04, 0.2)]),
+                freq = 300 + rng.randint(-50, 50)
+                s = envelope(mix([sine_wave(freq, 0.04, 0.4), noise(rng, 0.04, 0.2)]),
                            attack=0.001, decay=0.005, sustain=0.0, release=0.4)
             sfx[f'footstep_{surface}_{i}'] = s
 
@@ -423,12 +384,12 @@ def generate_sfx():
         t = i / SAMPLE_RATE
         freq = 200 + 800 * t
         amp = 0.4 * math.sin(math.pi * t / 0.8)
-        whoosh.append(amp * math.sin(2 * math.pi * freq * t) + 0.1 * (random.random() * 2 - 1) * amp)
+        whoosh.append(amp * math.sin(2 * math.pi * freq * t) + 0.1 * (rng.random() * 2 - 1) * amp)
     sfx['spirit_pulse'] = whoosh
 
     # Drum hit
-    sfx['drum_hit'] = generate_tabla_hit('low', 0.3)
-    sfx['drum_tap'] = generate_tabla_hit('high', 0.2)
+    sfx['drum_hit'] = generate_tabla_hit(rng, 'low', 0.3)
+    sfx['drum_tap'] = generate_tabla_hit(rng, 'high', 0.2)
 
     # Heartbeat
     beat1 = envelope(sine_wave(60, 0.15, 0.6), attack=0.01, decay=0.05, sustain=0.1, release=0.5)
@@ -461,20 +422,20 @@ def generate_sfx():
     for i in range(int(SAMPLE_RATE * 5)):
         t = i / SAMPLE_RATE
         amp = 0.1 * (0.5 + 0.5 * math.sin(t * 0.3))
-        wind.append(amp * (random.random() * 2 - 1))
+        wind.append(amp * (rng.random() * 2 - 1))
     sfx['wind_ambient'] = wind
 
     # Water/river ambient
     water = []
     for i in range(int(SAMPLE_RATE * 5)):
         t = i / SAMPLE_RATE
-        amp = 0.08 * (0.6 + 0.4 * math.sin(t * 0.5 + random.random()))
-        water.append(amp * (random.random() * 2 - 1))
+        amp = 0.08 * (0.6 + 0.4 * math.sin(t * 0.5 + rng.random()))
+        water.append(amp * (rng.random() * 2 - 1))
     sfx['water_ambient'] = water
 
     # Door open/close
     sfx['door_open'] = envelope(
-        mix([noise(0.3, 0.2), sine_wave(150, 0.3, 0.3)]),
+        mix([noise(rng, 0.3, 0.2), sine_wave(150, 0.3, 0.3)]),
         attack=0.01, decay=0.1, sustain=0.2, release=0.4
     )
 
@@ -486,7 +447,7 @@ def generate_sfx():
 
     # Boss hit
     sfx['boss_hit'] = envelope(
-        mix([sine_wave(80, 0.4, 0.5), noise(0.4, 0.3), sine_wave(160, 0.4, 0.3)]),
+        mix([sine_wave(80, 0.4, 0.5), noise(rng, 0.4, 0.3), sine_wave(160, 0.4, 0.3)]),
         attack=0.001, decay=0.05, sustain=0.2, release=0.5
     )
 
@@ -499,42 +460,39 @@ def generate_sfx():
     return sfx
 
 
+# ============ REGISTRATION ============
+
+TRACKS = {
+    'menu': (generate_menu_music, 'menu'),
+    'act1_happy': (generate_act1_music, 'act1'),
+    'act1_funeral': (generate_act2_music, 'act1'),  # Reuse darker variant
+    'act2_descent': (generate_act2_music, 'act2'),
+    'act2_dheki': (generate_dheki_rhythm, 'act2'),
+    'act2_burial': (generate_act2_music, 'act2'),
+    'act3_arrival': (generate_act3_music, 'act3'),
+    'act3_dual': (generate_act3_music, 'act3'),
+    'act4_boss': (generate_act4_boss_music, 'act4'),
+    'epilogue': (generate_epilogue_music, 'epilogue'),
+}
+
+SFX = [f'footstep_{surface}_{i}' for surface in ['wood', 'grass', 'stone'] for i in range(3)] + [
+    'spirit_pulse', 'drum_hit', 'drum_tap', 'heartbeat', 'ui_click', 'ui_hover',
+    'memory_flash', 'alert', 'wind_ambient', 'water_ambient', 'door_open',
+    'item_collect', 'boss_hit', 'victory',
+]
+
+
+def register_assets(reg):
+    """Declare music and SFX; each clip is saved to Audio/ and Resources/Audio/."""
+    for name, (generator, act) in TRACKS.items():
+        reg.add(name, generator,
+                (f"Audio/Music/{name}.wav", f"Resources/Audio/Music/{name}.wav"),
+                tags=['music', act])
+    reg.add('sfx', generate_sfx,
+            {name: (f"Audio/SFX/{name}.wav", f"Resources/Audio/SFX/{name}.wav") for name in SFX},
+            tags=['sfx'])
+
+
 if __name__ == "__main__":
-    print("Generating audio assets...")
-    print("Using procedural synthesis (Indian raga-based music)")
-    print()
-
-    # Music tracks
-    print("--- MUSIC ---")
-    tracks = {
-        'menu': generate_menu_music,
-        'act1_happy': generate_act1_music,
-        'act1_funeral': generate_act2_music,  # Reuse darker variant
-        'act2_descent': generate_act2_music,
-        'act2_dheki': generate_dheki_rhythm,
-        'act2_burial': generate_act2_music,
-        'act3_arrival': generate_act3_music,
-        'act3_dual': generate_act3_music,
-        'act4_boss': generate_act4_boss_music,
-        'epilogue': generate_epilogue_music,
-    }
-
-    for name, generator in tracks.items():
-        print(f"Generating {name}...", end=' ')
-        samples = generator()
-        # Save to both Music dir and Resources dir
-        write_wav(os.path.join(MUSIC_DIR, f"{name}.wav"), samples)
-        write_wav(os.path.join(RESOURCES_DIR, "Music", f"{name}.wav"), samples)
-        print(f"OK ({len(samples)/SAMPLE_RATE:.1f}s)")
-
-    # SFX
-    print("\n--- SOUND EFFECTS ---")
-    sfx = generate_sfx()
-    for name, samples in sfx.items():
-        write_wav(os.path.join(SFX_DIR, f"{name}.wav"), samples)
-        write_wav(os.path.join(RESOURCES_DIR, "SFX", f"{name}.wav"), samples)
-        print(f"Generated: {name}.wav ({len(samples)/SAMPLE_RATE:.2f}s)")
-
-    print(f"\nTotal music tracks: {len(tracks)}")
-    print(f"Total SFX: {len(sfx)}")
-    print("All audio assets generated!")
+    import build_assets
+    build_assets.main(['--source', 'audio'])
@@ -7,12 +7,11 @@ Layer 2: Mid-ground (buildings, structures)
 Layer 3: Background (distant scenery)
 Layer 4: Sky (atmospheric)
 """
-from PIL import Image, ImageDraw, ImageFilter
-import os
+from PIL import Image
 import math
-import random
 
-OUTPUT_BASE = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Art/Backgrounds"
+import raster
+from raster import linear_gradient
 
 # Consistent palette
 PALETTE = {
@@ -77,18 +76,7 @@ WIDTH = 1920
 HEIGHT = 1080
 
 
-def gradient_fill(draw, bbox, top_color, bottom_color):
-    """Fill a rectangle with vertical gradient."""
-    x0, y0, x1, y1 = bbox
-    for y in range(y0, y1):
-        t = (y - y0) / max(1, (y1 - y0))
-        r = int(top_color[0] + (bottom_color[0] - top_color[0]) * t)
-        g = int(top_color[1] + (bottom_color[1] - top_color[1]) * t)
-        b = int(top_color[2] + (bottom_color[2] - top_color[2]) * t)
-        draw.line([(x0, y), (x1, y)], fill=(r, g, b))
-
-
-def draw_tree(draw, x, y, scale, foliage_color, trunk_color, style='normal'):
+def draw_tree(draw, x, y, scale, foliage_color, trunk_color, rng, style='normal'):
     """Draw a tree in Puthi painting style."""
     s = scale
     # Trunk
@@ -104,8 +92,8 @@ def draw_tree(draw, x, y, scale, foliage_color, trunk_color, style='normal'):
                         fill=foliage_color, outline=(0,0,0), width=2)
         # Nahor blossoms
         for i in range(8):
-            bx = x + random.randint(int(-15*s), int(15*s))
-            by = y - random.randint(int(5*s), int(18*s))
+            bx = x + rng.randint(int(-15*s), int(15*s))
+            by = y - rng.randint(int(5*s), int(18*s))
             draw.ellipse([bx-3, by-3, bx+3, by+3], fill=(255, 255, 255))
             draw.ellipse([bx-1, by-1, bx+1, by+1], fill=(255, 215, 0))
     elif style == 'bamboo':
@@ -168,23 +156,22 @@ def draw_house_assamese(draw, x, y, w, h, wall_color, roof_color, detail_color):
     draw.rectangle([dx, dy, dx+w//6, y+h], fill=detail_color, outline=(0,0,0), width=2)
 
 
-def draw_river(draw, y, width, height, color):
+def draw_river(draw, y, width, height, color, rng):
     """Draw flowing river/water."""
     for i in range(0, width, 4):
         wave = int(5 * math.sin(i * 0.05))
-        c = (color[0] + random.randint(-10, 10),
-             color[1] + random.randint(-10, 10),
-             color[2] + random.randint(-10, 10))
+        c = (color[0] + rng.randint(-10, 10),
+             color[1] + rng.randint(-10, 10),
+             color[2] + rng.randint(-10, 10))
         draw.line([(i, y+wave), (i, y+height+wave)], fill=c)
 
 
-def generate_sky_layer(act_name, palette):
+def generate_sky_layer(act_name, palette, rng):
     """Layer 4: Sky with clouds, sun/moon."""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
     # Gradient sky
-    gradient_fill(draw, (0, 0, WIDTH, HEIGHT), palette['sky'], palette['sky_gradient'])
+    img = linear_gradient((WIDTH, HEIGHT), [palette['sky'], palette['sky_gradient']],
+                          end=(0, HEIGHT))
+    draw = raster.Draw(img)
 
     # Sun/moon
     if act_name in ['act1', 'epilogue']:
@@ -206,21 +193,21 @@ def generate_sky_layer(act_name, palette):
     # Clouds
     num_clouds = 5 if act_name in ['act1', 'epilogue'] else 3
     for i in range(num_clouds):
-        cx = random.randint(100, WIDTH-200)
-        cy = random.randint(50, 250)
+        cx = rng.randint(100, WIDTH-200)
+        cy = rng.randint(50, 250)
         cloud_color = (255, 255, 255, 120) if act_name in ['act1', 'epilogue'] else (100, 100, 120, 80)
         for j in range(4):
             ox = j * 25 - 35
-            oy = random.randint(-10, 10)
+            oy = rng.randint(-10, 10)
             draw.ellipse([cx+ox-25, cy+oy-15, cx+ox+25, cy+oy+15], fill=cloud_color)
 
     return img
 
 
-def generate_background_layer(act_name, palette):
+def generate_background_layer(act_name, palette, rng):
     """Layer 3: Distant scenery - hills, mountains, river."""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Distant hills
     hill_color = tuple(int(c * 0.6) for c in palette['foliage'])
@@ -229,7 +216,7 @@ def generate_background_layer(act_name, palette):
         hy = HEIGHT - 400 + i * 30
         points = []
         for x in range(hx - 100, hx + 800, 10):
-            y = hy - int(80 * math.sin((x - hx) * 0.005)) - random.randint(0, 20)
+            y = hy - int(80 * math.sin((x - hx) * 0.005)) - rng.randint(0, 20)
             points.append((x, y))
         points.append((hx + 800, HEIGHT))
         points.append((hx - 100, HEIGHT))
@@ -237,21 +224,21 @@ def generate_background_layer(act_name, palette):
 
     # Brahmaputra river (distant)
     river_y = HEIGHT - 350
-    draw_river(draw, river_y, WIDTH, 60, palette['water'])
+    draw_river(draw, river_y, WIDTH, 60, palette['water'], rng)
 
     # Distant trees
     for i in range(15):
-        tx = random.randint(0, WIDTH)
-        ty = HEIGHT - random.randint(280, 380)
-        draw_tree(draw, tx, ty, 0.4, hill_color, (60, 40, 20))
+        tx = rng.randint(0, WIDTH)
+        ty = HEIGHT - rng.randint(280, 380)
+        draw_tree(draw, tx, ty, 0.4, hill_color, (60, 40, 20), rng)
 
     return img
 
 
-def generate_midground_layer(act_name, palette):
+def generate_midground_layer(act_name, palette, rng):
     """Layer 2: Buildings, main structures."""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Ground
     draw.rectangle([0, HEIGHT-200, WIDTH, HEIGHT], fill=palette['ground'])
@@ -275,9 +262,9 @@ def generate_midground_layer(act_name, palette):
                            palette['gold_accent'])
         # Overgrown vines
         for i in range(10):
-            vx = 600 + random.randint(0, 300)
-            vy = HEIGHT - 370 + random.randint(0, 150)
-            draw.line([(vx, vy), (vx + random.randint(-20, 20), vy + random.randint(10, 30))],
+            vx = 600 + rng.randint(0, 300)
+            vy = HEIGHT - 370 + rng.randint(0, 150)
+            draw.line([(vx, vy), (vx + rng.randint(-20, 20), vy + rng.randint(10, 30))],
                      fill=palette['foliage'], width=2)
 
     elif act_name == 'act4':
@@ -293,10 +280,10 @@ def generate_midground_layer(act_name, palette):
 
     # Trees in midground
     for i in range(5):
-        tx = random.randint(50, WIDTH-100)
-        ty = HEIGHT - random.randint(200, 280)
+        tx = rng.randint(50, WIDTH-100)
+        ty = HEIGHT - rng.randint(200, 280)
         style = 'nahor' if i == 2 else ('bamboo' if i == 4 else 'normal')
-        draw_tree(draw, tx, ty, 0.7, palette['foliage'], palette['building'], style)
+        draw_tree(draw, tx, ty, 0.7, palette['foliage'], palette['building'], rng, style)
 
     # Path/road
     for x in range(0, WIDTH, 3):
@@ -306,31 +293,31 @@ def generate_midground_layer(act_name, palette):
     return img
 
 
-def generate_foreground_layer(act_name, palette):
+def generate_foreground_layer(act_name, palette, rng):
     """Layer 1: Foreground foliage, decorative elements."""
-    img = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Foreground foliage (bottom)
     for i in range(20):
-        fx = random.randint(-50, WIDTH+50)
-        fy = HEIGHT - random.randint(0, 100)
+        fx = rng.randint(-50, WIDTH+50)
+        fy = HEIGHT - rng.randint(0, 100)
         # Grass/plants
         for j in range(5):
-            gx = fx + random.randint(-15, 15)
+            gx = fx + rng.randint(-15, 15)
             gy = fy
-            gh = random.randint(20, 50)
-            draw.line([(gx, gy), (gx + random.randint(-8, 8), gy - gh)],
+            gh = rng.randint(20, 50)
+            draw.line([(gx, gy), (gx + rng.randint(-8, 8), gy - gh)],
                      fill=palette['foliage_light'], width=2)
 
     # Foreground flowers
     if act_name in ['act1', 'epilogue']:
         for i in range(12):
-            fx = random.randint(0, WIDTH)
-            fy = HEIGHT - random.randint(20, 80)
+            fx = rng.randint(0, WIDTH)
+            fy = HEIGHT - rng.randint(20, 80)
             # Flower
             flower_colors = [(255,255,255), (255,200,50), (255,150,150), (200,150,255)]
-            fc = random.choice(flower_colors)
+            fc = rng.choice(flower_colors)
             for p in range(5):
                 angle = p * 72
                 rad = math.radians(angle)
@@ -342,10 +329,10 @@ def generate_foreground_layer(act_name, palette):
     # Fireflies/particles for night scenes
     if act_name in ['act3', 'act4']:
         for i in range(20):
-            px = random.randint(0, WIDTH)
-            py = random.randint(100, HEIGHT-100)
-            size = random.randint(1, 3)
-            alpha = random.randint(80, 200)
+            px = rng.randint(0, WIDTH)
+            py = rng.randint(100, HEIGHT-100)
+            size = rng.randint(1, 3)
+            alpha = rng.randint(80, 200)
             draw.ellipse([px-size, py-size, px+size, py+size],
                         fill=(200, 200, 255, alpha))
 
@@ -358,7 +345,7 @@ def generate_foreground_layer(act_name, palette):
     # Side foliage overlap
     for side in [0, WIDTH-80]:
         for i in range(3):
-            ly = random.randint(200, HEIGHT-200)
+            ly = rng.randint(200, HEIGHT-200)
             leaf_points = [
                 (side, ly),
                 (side + (40 if side == 0 else -40), ly-15),
@@ -370,42 +357,42 @@ def generate_foreground_layer(act_name, palette):
     return img
 
 
-def generate_all_layers(act_name):
-    """Generate all 4 parallax layers for an act."""
-    palette = PALETTE[act_name]
-    act_dir = os.path.join(OUTPUT_BASE, act_name.replace('act', 'Act').replace('epilogue', 'Epilogue'))
-    os.makedirs(act_dir, exist_ok=True)
+LAYERS = ['layer4_sky', 'layer3_background', 'layer2_midground', 'layer1_foreground']
+
 
-    random.seed(42 + hash(act_name))  # Consistent random per act
+def generate_all_layers(act_name, rng):
+    """Generate all 4 parallax layers for an act, plus a composite preview.
+
+    `rng` is the act's own random.Random stream (seeded from its asset id),
+    so layers come out identical on every run.
+    """
+    palette = PALETTE[act_name]
 
     layers = {
-        'layer4_sky': generate_sky_layer(act_name, palette),
-        'layer3_background': generate_background_layer(act_name, palette),
-        'layer2_midground': generate_midground_layer(act_name, palette),
-        'layer1_foreground': generate_foreground_layer(act_name, palette),
+        'layer4_sky': generate_sky_layer(act_name, palette, rng),
+        'layer3_background': generate_background_layer(act_name, palette, rng),
+        'layer2_midground': generate_midground_layer(act_name, palette, rng),
+        'layer1_foreground': generate_foreground_layer(act_name, palette, rng),
     }
 
-    for name, img in layers.items():
-        path = os.path.join(act_dir, f"{name}.png")
-        img.save(path)
-        print(f"Generated: {path}")
-
     # Also generate a composite preview
-    composite = Image.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 255))
-    for name in ['layer4_sky', 'layer3_background', 'layer2_midground', 'layer1_foreground']:
+    composite = raster.new('RGBA', (WIDTH, HEIGHT), (0, 0, 0, 255))
+    for name in LAYERS:
         composite = Image.alpha_composite(composite, layers[name])
-    preview_path = os.path.join(act_dir, "preview_composite.png")
-    composite.save(preview_path)
-    print(f"Generated preview: {preview_path}")
+    layers['preview_composite'] = composite
 
+    return layers
 
-if __name__ == "__main__":
-    print("Generating parallax backgrounds for all acts...")
-    print("Style: Assamese Puthi manuscript with modern execution")
-    print()
 
+def register_assets(reg):
+    """Declare the parallax layer sets (see asset_registry.py)."""
     for act in ['act1', 'act2', 'act3', 'act4', 'epilogue']:
-        print(f"\n--- {act.upper()} ---")
-        generate_all_layers(act)
+        act_dir = "Art/Backgrounds/" + act.replace('act', 'Act').replace('epilogue', 'Epilogue')
+        outputs = {name: f"{act_dir}/{name}.png" for name in LAYERS + ['preview_composite']}
+        reg.add(act, generate_all_layers, outputs, tags=['background', act],
+                params={'act_name': act})
 
-    print("\nAll backgrounds generated!")
+
+if __name__ == "__main__":
+    import build_assets
+    build_assets.main(['--source', 'backgrounds'])
@@ -4,12 +4,10 @@ Generate character sprite sheets in Assamese Puthi painting style.
 Bold outlines, flat color fills, ornamental patterns.
 Each character: 512x512 sprite sheets with multiple animation frames.
 """
-from PIL import Image, ImageDraw, ImageFont
-import os
 import math
 
-OUTPUT_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Art/Sprites/Characters"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+import raster
+from color_grade import AlphaScale, ChannelAffine, Clamp, Grade
 
 # Color palette from game design doc
 COLORS = {
@@ -36,6 +34,10 @@ COLORS = {
 
 OUTLINE_WIDTH = 3
 
+# Variant grades (see color_grade.py)
+SPIRIT_GRADE = Grade(ChannelAffine(offset=(60, 60, 80)), Clamp(), AlphaScale(0.6))
+CORRUPTED_GRADE = Grade(ChannelAffine(scale=(0.6, 0.3, 0.5), offset=(80, 0, 60)), Clamp())
+
 def draw_outlined_ellipse(draw, bbox, fill, outline=(0,0,0), width=OUTLINE_WIDTH):
     """Draw an ellipse with bold outline in Puthi style."""
     draw.ellipse(bbox, fill=fill, outline=outline, width=width)
@@ -62,6 +64,21 @@ def draw_ornamental_border(draw, x, y, w, h, color):
         # Bottom border dots
         draw.ellipse([x+i-2, y+h, x+i+2, y+h+4], fill=color)
 
+# Rendered frames, keyed by (generator, frame, render scale). Variants are
+# derived from these, so each base frame is drawn once per process and scale.
+_frames = {}
+
+
+def render_frame(generator, frame):
+    """Return generator(frame), drawing it only the first time it is asked for.
+
+    The returned image is shared: derive new images from it, never draw on it.
+    """
+    key = (generator, frame, raster.current_scale())
+    if key not in _frames:
+        _frames[key] = generator(frame=frame)
+    return _frames[key]
+
 def add_puthi_details(draw, x, y, size, color):
     """Add Assamese Puthi manuscript-style decorative details."""
     # Small lotus-like motifs
@@ -74,8 +91,8 @@ def add_puthi_details(draw, x, y, size, color):
 
 def generate_tejimola_child(frame=0):
     """Generate Tejimola as a child - Act I & II character."""
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     cx, cy = 64, 64  # Center
 
@@ -155,24 +172,15 @@ def generate_tejimola_child(frame=0):
 
 
 def generate_tejimola_spirit(frame=0):
-    """Generate Tejimola as spirit/memory - translucent, ethereal."""
-    img = generate_tejimola_child(frame)
+    """Generate Tejimola as spirit/memory - translucent, ethereal.
 
+    Derived from the memoized child frame rather than redrawing it.
+    """
     # Make semi-transparent and add blue/white glow
-    pixels = img.load()
-    for x in range(img.width):
-        for y in range(img.height):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                # Shift toward blue/white, increase transparency
-                r = min(255, r + 60)
-                g = min(255, g + 60)
-                b = min(255, b + 80)
-                a = int(a * 0.6)
-                pixels[x, y] = (r, g, b, a)
+    img = SPIRIT_GRADE.apply(render_frame(generate_tejimola_child, frame))
 
     # Add glow effect around edges
-    draw = ImageDraw.Draw(img)
+    draw = raster.Draw(img)
     for angle in range(0, 360, 30):
         rad = math.radians(angle)
         gx = 64 + int(30 * math.cos(rad))
@@ -184,8 +192,8 @@ def generate_tejimola_spirit(frame=0):
 
 def generate_dom(frame=0):
     """Generate Dom - the spirit-sensitive drummer. Adult male, weathered but gentle."""
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     cx, cy = 64, 60
     sway = int(2 * math.sin(frame * 0.6))
@@ -275,8 +283,8 @@ def generate_dom(frame=0):
 
 def generate_ranima(frame=0):
     """Generate Ranima (stepmother) - imposing, dark colors, sharp features."""
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     cx, cy = 64, 58
     sway = int(1 * math.sin(frame * 0.4))
@@ -344,8 +352,8 @@ def generate_ranima(frame=0):
 
 def generate_father(frame=0):
     """Generate Father - kind merchant, warm colors."""
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     cx, cy = 64, 58
     bob = int(1 * math.sin(frame * 0.8))
@@ -393,49 +401,47 @@ def generate_father(frame=0):
     return img
 
 
-def generate_sprite_sheet(generator, name, frames=8, sheet_size=512):
-    """Generate a sprite sheet with multiple frames."""
+def generate_sprite_sheet(generator, frames=8, sheet_size=512):
+    """Generate a sprite sheet with multiple frames, plus an idle portrait."""
     frame_size = 128
     cols = sheet_size // frame_size
     rows = (frames + cols - 1) // cols
 
-    sheet = Image.new('RGBA', (sheet_size, rows * frame_size), (0, 0, 0, 0))
+    sheet = raster.new('RGBA', (sheet_size, rows * frame_size), (0, 0, 0, 0))
 
     for i in range(frames):
-        frame_img = generator(frame=i)
         col = i % cols
         row = i // cols
-        sheet.paste(frame_img, (col * frame_size, row * frame_size))
+        img = render_frame(generator, i)
+        sheet.paste(img, (col * img.width, row * img.height))
 
-    output_path = os.path.join(OUTPUT_DIR, f"{name}_spritesheet.png")
-    sheet.save(output_path)
-    print(f"Generated: {output_path} ({frames} frames)")
+    # Idle frame drawn again at twice the size as portrait
+    with raster.render_scale(2):
+        portrait = render_frame(generator, 0)
 
-    # Also save individual idle frame as portrait
-    portrait = generator(frame=0)
-    portrait_path = os.path.join(OUTPUT_DIR, f"{name}_portrait.png")
-    portrait_resized = portrait.resize((256, 256), Image.NEAREST)
-    portrait_resized.save(portrait_path)
-    print(f"Generated: {portrait_path}")
+    return {'spritesheet': sheet, 'portrait': portrait}
 
 
-def generate_ranima_corrupted(frame=0):
-    """Generate Ranima's corrupted boss form - Act IV."""
-    base = generate_ranima(frame)
-    pixels = base.load()
+def generate_character_family(generators, frames=8):
+    """Sheets and portraits for a base character and the variants derived from it.
+
+    Rendering a family as one asset keeps the base frames in one process's
+    memo, so e.g. Ranima is drawn once for both her own and the corrupted sheet.
+    """
+    outputs = {}
+    for name, generator in generators.items():
+        for kind, img in generate_sprite_sheet(generator, frames).items():
+            outputs[f"{name}_{kind}"] = img
+    return outputs
 
+
+def generate_ranima_corrupted(frame=0):
+    """Generate Ranima's corrupted boss form - Act IV (derived from the memoized Ranima frame)."""
     # Shift colors toward dark magenta/purple
-    for x in range(base.width):
-        for y in range(base.height):
-            r, g, b, a = pixels[x, y]
-            if a > 0:
-                r = min(255, int(r * 0.6 + 80))
-                g = int(g * 0.3)
-                b = min(255, int(b * 0.5 + 60))
-                pixels[x, y] = (r, g, b, a)
+    base = CORRUPTED_GRADE.apply(render_frame(generate_ranima, frame))
 
     # Add corruption tendrils
-    draw = ImageDraw.Draw(base)
+    draw = raster.Draw(base)
     for i in range(8):
         angle = i * 45 + frame * 10
         rad = math.radians(angle)
@@ -449,16 +455,30 @@ def generate_ranima_corrupted(frame=0):
     return base
 
 
+CHARACTERS = [
+    ('tejimola_child', generate_tejimola_child, 'tejimola'),
+    ('tejimola_spirit', generate_tejimola_spirit, 'tejimola'),
+    ('dom', generate_dom, 'dom'),
+    ('ranima', generate_ranima, 'ranima'),
+    ('father', generate_father, 'father'),
+    ('ranima_corrupted', generate_ranima_corrupted, 'ranima'),
+]
+
+
+def register_assets(reg):
+    """Declare one sheet + portrait per character, grouped by family (see asset_registry.py)."""
+    chars = "Art/Sprites/Characters"
+    families = {}
+    for name, generator, who in CHARACTERS:
+        families.setdefault(who, {})[name] = generator
+    for who, generators in families.items():
+        outputs = {f"{name}_{kind}": f"{chars}/{name}_{kind}.png"
+                   for name in generators for kind in ('spritesheet', 'portrait')}
+        reg.add(who, generate_character_family, outputs,
+                tags=['character', 'spritesheet', 'portrait', who] + list(generators),
+                params={'generators': generators, 'frames': 8})
+
+
 if __name__ == "__main__":
-    print("Generating character sprite sheets...")
-    print("Style: Assamese Puthi manuscript painting")
-    print()
-
-    generate_sprite_sheet(generate_tejimola_child, "tejimola_child", frames=8)
-    generate_sprite_sheet(generate_tejimola_spirit, "tejimola_spirit", frames=8)
-    generate_sprite_sheet(generate_dom, "dom", frames=8)
-    generate_sprite_sheet(generate_ranima, "ranima", frames=8)
-    generate_sprite_sheet(generate_father, "father", frames=8)
-    generate_sprite_sheet(generate_ranima_corrupted, "ranima_corrupted", frames=8)
-
-    print("\nAll character sprites generated!")
+    import build_assets
+    build_assets.main(['--source', 'characters'])
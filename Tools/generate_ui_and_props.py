@@ -3,19 +3,11 @@
 Generate UI elements, props, and VFX sprites.
 All in Assamese Puthi painting aesthetic.
 """
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import os
+from PIL import ImageFont
 import math
-import random
 
-UI_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Art/UI"
-PROPS_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Art/Sprites/Props"
-VFX_DIR = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project/Art/VFX"
-
-for d in [UI_DIR, PROPS_DIR, VFX_DIR,
-          os.path.join(UI_DIR, "Menu"), os.path.join(UI_DIR, "HUD"),
-          os.path.join(UI_DIR, "DialogueBox")]:
-    os.makedirs(d, exist_ok=True)
+import raster
+from raster import linear_gradient
 
 COLORS = {
     'gold': (255, 215, 0),
@@ -56,18 +48,11 @@ def draw_ornamental_frame(draw, x, y, w, h, color, thickness=3):
 
 # ============ UI ELEMENTS ============
 
-def generate_menu_background():
+def generate_menu_background(rng):
     """Main menu background with nahor tree silhouette."""
-    img = Image.new('RGBA', (1920, 1080), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
     # Gradient background - warm parchment
-    for y in range(1080):
-        t = y / 1080
-        r = int(45 + (139 - 45) * t)
-        g = int(30 + (69 - 30) * t)
-        b = int(50 + (19 - 50) * t * 0.5)
-        draw.line([(0, y), (1920, y)], fill=(r, g, b))
+    img = linear_gradient((1920, 1080), [(45, 30, 50), (139, 69, 34.5)], end=(0, 1080))
+    draw = raster.Draw(img)
 
     # Nahor tree silhouette (center)
     cx, cy = 960, 700
@@ -89,24 +74,24 @@ def generate_menu_background():
 
     # Foliage canopy
     for i in range(25):
-        fx = cx + random.randint(-180, 180)
-        fy = cy - random.randint(150, 320)
-        size = random.randint(25, 50)
-        color = (34 + random.randint(-10, 10), 139 + random.randint(-20, 20), 34 + random.randint(-10, 10))
+        fx = cx + rng.randint(-180, 180)
+        fy = cy - rng.randint(150, 320)
+        size = rng.randint(25, 50)
+        color = (34 + rng.randint(-10, 10), 139 + rng.randint(-20, 20), 34 + rng.randint(-10, 10))
         draw.ellipse([fx-size, fy-size//2, fx+size, fy+size//2], fill=color)
 
     # Nahor blossoms on tree
     for i in range(30):
-        bx = cx + random.randint(-160, 160)
-        by = cy - random.randint(130, 300)
+        bx = cx + rng.randint(-160, 160)
+        by = cy - rng.randint(130, 300)
         draw.ellipse([bx-4, by-4, bx+4, by+4], fill=COLORS['white'])
         draw.ellipse([bx-2, by-2, bx+2, by+2], fill=COLORS['gold'])
 
     # Falling petals
     for i in range(15):
-        px = random.randint(200, 1700)
-        py = random.randint(100, 900)
-        size = random.randint(2, 5)
+        px = rng.randint(200, 1700)
+        py = rng.randint(100, 900)
+        size = rng.randint(2, 5)
         draw.ellipse([px-size, py-size//2, px+size, py+size//2],
                     fill=(255, 255, 255, 180))
 
@@ -115,19 +100,17 @@ def generate_menu_background():
 
     # Ground with grass
     for x in range(0, 1920, 5):
-        gy = 900 + random.randint(-5, 5)
-        draw.line([(x, gy), (x + random.randint(-3, 3), gy - random.randint(5, 15))],
+        gy = 900 + rng.randint(-5, 5)
+        draw.line([(x, gy), (x + rng.randint(-3, 3), gy - rng.randint(5, 15))],
                  fill=COLORS['forest_green'], width=2)
 
-    path = os.path.join(UI_DIR, "Menu", "menu_background.png")
-    img.save(path)
-    print(f"Generated: {path}")
+    return img
 
 
 def generate_button(text, width=300, height=60, style='normal'):
     """Generate styled menu button."""
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     if style == 'normal':
         bg = COLORS['parchment']
@@ -168,8 +151,8 @@ def generate_button(text, width=300, height=60, style='normal'):
 def generate_dialogue_box():
     """Generate dialogue box background."""
     w, h = 1200, 250
-    img = Image.new('RGBA', (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (w, h), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Semi-transparent parchment background
     draw.rounded_rectangle([0, 0, w-1, h-1], radius=12,
@@ -193,17 +176,17 @@ def generate_dialogue_box():
         draw.ellipse([cx-corner_size, cy-corner_size, cx+corner_size, cy+corner_size],
                     fill=COLORS['gold'])
 
-    path = os.path.join(UI_DIR, "DialogueBox", "dialogue_box.png")
-    img.save(path)
-    print(f"Generated: {path}")
+    return img
 
 
 def generate_hud_elements():
     """Generate HUD sprites."""
+    hud = {}
+
     # Spirit Pulse icon
     size = 64
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     center = size // 2
     # Concentric rings
     for i in range(3):
@@ -213,73 +196,42 @@ def generate_hud_elements():
                     outline=(75, 0, 130, alpha), width=2)
     # Center dot
     draw.ellipse([center-4, center-4, center+4, center+4], fill=COLORS['spirit_purple'])
-    img.save(os.path.join(UI_DIR, "HUD", "spirit_pulse_icon.png"))
-    print(f"Generated: spirit_pulse_icon.png")
+    hud['spirit_pulse_icon'] = img
 
     # Exhaustion bar background
     bar_w, bar_h = 300, 30
-    img = Image.new('RGBA', (bar_w, bar_h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (bar_w, bar_h), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     draw.rounded_rectangle([0, 0, bar_w-1, bar_h-1], radius=4,
                           fill=(20, 20, 20, 180), outline=COLORS['gold'], width=2)
-    img.save(os.path.join(UI_DIR, "HUD", "bar_background.png"))
-    print(f"Generated: bar_background.png")
+    hud['bar_background'] = img
 
     # Bar fill (gradient)
-    img = Image.new('RGBA', (bar_w-8, bar_h-8), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    for x in range(bar_w-8):
-        t = x / (bar_w-8)
-        r = int(220 * (1-t) + 34 * t)
-        g = int(20 * (1-t) + 139 * t)
-        b = int(60 * (1-t) + 34 * t)
-        draw.line([(x, 0), (x, bar_h-9)], fill=(r, g, b))
-    img.save(os.path.join(UI_DIR, "HUD", "bar_fill.png"))
-    print(f"Generated: bar_fill.png")
+    img = linear_gradient((bar_w-8, bar_h-8), [(220, 20, 60), (34, 139, 34)], end=(bar_w-8, 0))
+    hud['bar_fill'] = img
 
     # Catch icons (eye)
     eye_size = 32
     for state in ['active', 'inactive']:
-        img = Image.new('RGBA', (eye_size, eye_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = raster.new('RGBA', (eye_size, eye_size), (0, 0, 0, 0))
+        draw = raster.Draw(img)
         c = eye_size // 2
         if state == 'active':
             draw.ellipse([c-10, c-6, c+10, c+6], fill=COLORS['red'], outline=COLORS['black'], width=2)
             draw.ellipse([c-3, c-3, c+3, c+3], fill=COLORS['black'])
         else:
             draw.ellipse([c-10, c-6, c+10, c+6], fill=(100, 100, 100), outline=(60, 60, 60), width=2)
-        img.save(os.path.join(UI_DIR, "HUD", f"catch_icon_{state}.png"))
-    print(f"Generated: catch icons")
+        hud[f'catch_icon_{state}'] = img
+
+    return hud
 
 
 # ============ PROPS ============
 
-def generate_props():
-    """Generate game props and items."""
-    props = {
-        'dheki': generate_dheki,
-        'dhol_drum': generate_dhol,
-        'nahor_flower': generate_nahor_flower,
-        'hairpin': generate_hairpin,
-        'oil_lamp': generate_oil_lamp,
-        'pot': generate_pot,
-        'spirit_orb': generate_spirit_orb,
-        'gourd': generate_gourd,
-        'gamosa': generate_gamosa,
-        'spiked_barrel': generate_spiked_barrel,
-    }
-
-    for name, generator in props.items():
-        img = generator()
-        path = os.path.join(PROPS_DIR, f"{name}.png")
-        img.save(path)
-        print(f"Generated: {path}")
-
-
-def generate_dheki():
+def generate_dheki(rng):
     """Dheki - traditional rice husker. Central prop."""
-    img = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (256, 256), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Base/fulcrum
     draw.rectangle([80, 180, 180, 200], fill=COLORS['earth_brown'], outline=COLORS['black'], width=3)
@@ -296,8 +248,8 @@ def generate_dheki():
 
     # Rice grains in mortar
     for i in range(5):
-        rx = 210 + random.randint(-10, 10)
-        ry = 200 + random.randint(-3, 3)
+        rx = 210 + rng.randint(-10, 10)
+        ry = 200 + rng.randint(-3, 3)
         draw.ellipse([rx-2, ry-1, rx+2, ry+1], fill=COLORS['cream'])
 
     # Foot pedal
@@ -309,8 +261,8 @@ def generate_dheki():
 
 def generate_dhol():
     """Dhol drum - Dom's instrument."""
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     cx, cy = 64, 64
 
@@ -335,8 +287,8 @@ def generate_dhol():
 
 def generate_nahor_flower():
     """Nahor (Mesua ferrea) flower - key symbol."""
-    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     cx, cy = 32, 32
 
     # 4 white petals
@@ -360,8 +312,8 @@ def generate_nahor_flower():
 
 def generate_hairpin():
     """Mother's hairpin - puzzle item."""
-    img = Image.new('RGBA', (64, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Pin shaft
     draw.line([(32, 20), (32, 110)], fill=COLORS['gold'], width=3)
@@ -381,8 +333,8 @@ def generate_hairpin():
 
 def generate_oil_lamp():
     """Traditional oil lamp (saaki)."""
-    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Lamp body
     draw.polygon([(20, 50), (44, 50), (40, 35), (24, 35)],
@@ -405,8 +357,8 @@ def generate_oil_lamp():
 
 def generate_pot():
     """Clay pot."""
-    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Pot body
     draw.ellipse([12, 20, 52, 55], fill=(180, 120, 60), outline=COLORS['black'], width=2)
@@ -423,8 +375,8 @@ def generate_pot():
 
 def generate_spirit_orb():
     """Spirit orb collectible."""
-    img = Image.new('RGBA', (48, 48), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (48, 48), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     cx, cy = 24, 24
 
     # Outer glow
@@ -439,8 +391,8 @@ def generate_spirit_orb():
 
 def generate_gourd():
     """Gourd - story item."""
-    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # Gourd shape
     draw.ellipse([15, 25, 50, 55], fill=(180, 160, 80), outline=COLORS['black'], width=2)
@@ -453,8 +405,8 @@ def generate_gourd():
 
 def generate_gamosa():
     """Gamosa - Assamese towel, cultural symbol."""
-    img = Image.new('RGBA', (128, 64), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 64), (0, 0, 0, 0))
+    draw = raster.Draw(img)
 
     # White base
     draw.rectangle([5, 10, 123, 54], fill=COLORS['white'], outline=COLORS['black'], width=2)
@@ -479,8 +431,8 @@ def generate_gamosa():
 
 def generate_spiked_barrel():
     """Spiked barrel - boss fight obstacle."""
-    img = Image.new('RGBA', (96, 96), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (96, 96), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     cx, cy = 48, 48
 
     # Barrel body
@@ -506,31 +458,31 @@ def generate_spiked_barrel():
 
 def generate_vfx():
     """Generate VFX sprites."""
+    vfx = {}
+
     # Spirit pulse ring
     size = 256
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     cx, cy = size//2, size//2
     for r in range(50, 120, 3):
         alpha = max(0, 255 - (r - 50) * 3)
         draw.ellipse([cx-r, cy-r, cx+r, cy+r],
                     outline=(75, 0, 130, alpha), width=2)
-    img.save(os.path.join(VFX_DIR, "spirit_pulse_ring.png"))
-    print(f"Generated: spirit_pulse_ring.png")
+    vfx['spirit_pulse_ring'] = img
 
     # Memory flash
-    img = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     for r in range(60, 0, -2):
         alpha = int(200 * (r / 60))
         draw.ellipse([64-r, 64-r, 64+r, 64+r], fill=(255, 255, 255, alpha))
-    img.save(os.path.join(VFX_DIR, "memory_flash.png"))
-    print(f"Generated: memory_flash.png")
+    vfx['memory_flash'] = img
 
     # Beat indicator
     for state in ['perfect', 'good', 'miss']:
-        img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = raster.new('RGBA', (64, 64), (0, 0, 0, 0))
+        draw = raster.Draw(img)
         if state == 'perfect':
             color = COLORS['gold']
         elif state == 'good':
@@ -540,31 +492,28 @@ def generate_vfx():
 
         draw.ellipse([8, 8, 56, 56], fill=(*color, 200), outline=COLORS['black'], width=2)
         draw.ellipse([16, 16, 48, 48], fill=(*color, 255), outline=COLORS['black'], width=1)
-        img.save(os.path.join(VFX_DIR, f"beat_{state}.png"))
-    print(f"Generated: beat indicators")
+        vfx[f'beat_{state}'] = img
 
     # Footprint
-    img = Image.new('RGBA', (32, 48), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (32, 48), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     draw.ellipse([6, 5, 26, 35], fill=(100, 80, 60, 150))
     for i in range(5):
         tx = 10 + i * 4
         draw.ellipse([tx-2, 2, tx+2, 6], fill=(100, 80, 60, 120))
-    img.save(os.path.join(VFX_DIR, "footprint.png"))
-    print(f"Generated: footprint.png")
+    vfx['footprint'] = img
 
     # Corruption particle
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (32, 32), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     for r in range(14, 0, -1):
         alpha = int(180 * (r / 14))
         draw.ellipse([16-r, 16-r, 16+r, 16+r], fill=(139, 0, 88, alpha))
-    img.save(os.path.join(VFX_DIR, "corruption_particle.png"))
-    print(f"Generated: corruption_particle.png")
+    vfx['corruption_particle'] = img
 
     # Vine obstacle
-    img = Image.new('RGBA', (64, 128), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 128), (0, 0, 0, 0))
+    draw = raster.Draw(img)
     for i in range(5):
         sx = 32 + int(15 * math.sin(i * 1.2))
         sy = i * 25
@@ -573,44 +522,62 @@ def generate_vfx():
         # Leaves
         draw.ellipse([sx-8, sy+5, sx+2, sy+15], fill=(50, 160, 50))
         draw.ellipse([sx+2, sy+10, sx+12, sy+20], fill=(40, 140, 40))
-    img.save(os.path.join(VFX_DIR, "vine_obstacle.png"))
-    print(f"Generated: vine_obstacle.png")
+    vfx['vine_obstacle'] = img
+
+    return vfx
+
+
+# ============ REGISTRATION ============
+
+BUTTONS = {
+    'btn_new_game': 'NEW GAME',
+    'btn_continue': 'CONTINUE',
+    'btn_extras': 'EXTRAS',
+    'btn_quit': 'QUIT',
+    'btn_resume': 'RESUME',
+    'btn_save': 'SAVE',
+    'btn_load': 'LOAD',
+    'btn_settings': 'SETTINGS',
+    'btn_back': 'BACK',
+}
+
+PROPS = {
+    'dheki': generate_dheki,
+    'dhol_drum': generate_dhol,
+    'nahor_flower': generate_nahor_flower,
+    'hairpin': generate_hairpin,
+    'oil_lamp': generate_oil_lamp,
+    'pot': generate_pot,
+    'spirit_orb': generate_spirit_orb,
+    'gourd': generate_gourd,
+    'gamosa': generate_gamosa,
+    'spiked_barrel': generate_spiked_barrel,
+}
+
+HUD = ['spirit_pulse_icon', 'bar_background', 'bar_fill',
+       'catch_icon_active', 'catch_icon_inactive']
+
+VFX = ['spirit_pulse_ring', 'memory_flash', 'beat_perfect', 'beat_good', 'beat_miss',
+       'footprint', 'corruption_particle', 'vine_obstacle']
+
+
+def register_assets(reg):
+    """Declare UI, prop and VFX sprites (see asset_registry.py)."""
+    reg.add('menu_background', generate_menu_background,
+            "Art/UI/Menu/menu_background.png", tags=['ui', 'menu'])
+    for filename, text in BUTTONS.items():
+        reg.add(filename, generate_button, f"Art/UI/Menu/{filename}.png",
+                tags=['ui', 'menu', 'button'], params={'text': text})
+    reg.add('dialogue_box', generate_dialogue_box,
+            "Art/UI/DialogueBox/dialogue_box.png", tags=['ui', 'dialogue'])
+    reg.add('hud', generate_hud_elements,
+            {name: f"Art/UI/HUD/{name}.png" for name in HUD}, tags=['ui', 'hud'])
+    for name, generator in PROPS.items():
+        reg.add(name, generator, f"Art/Sprites/Props/{name}.png", tags=['prop'])
+    reg.add('vfx', generate_vfx,
+            {name: f"Art/VFX/{name}.png" for name in VFX}, tags=['vfx'])
 
 
 if __name__ == "__main__":
-    print("Generating UI elements, props, and VFX...")
-    print()
-
-    print("--- MENU UI ---")
-    generate_menu_background()
-
-    buttons = {
-        'btn_new_game': 'NEW GAME',
-        'btn_continue': 'CONTINUE',
-        'btn_extras': 'EXTRAS',
-        'btn_quit': 'QUIT',
-        'btn_resume': 'RESUME',
-        'btn_save': 'SAVE',
-        'btn_load': 'LOAD',
-        'btn_settings': 'SETTINGS',
-        'btn_back': 'BACK',
-    }
-    for filename, text in buttons.items():
-        img = generate_button(text)
-        path = os.path.join(UI_DIR, "Menu", f"{filename}.png")
-        img.save(path)
-        print(f"Generated: {path}")
-
-    print("\n--- DIALOGUE BOX ---")
-    generate_dialogue_box()
-
-    print("\n--- HUD ---")
-    generate_hud_elements()
-
-    print("\n--- PROPS ---")
-    generate_props()
-
-    print("\n--- VFX ---")
-    generate_vfx()
-
-    print("\nAll UI, props, and VFX generated!")
+    import build_assets
+    build_assets.main(['--source', 'ui_and_props'])
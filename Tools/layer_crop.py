@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parallax layers cropped to their visible pixels.
+Layers are drawn on the full 1920x1080 canvas, but most only fill a band of
+it. Before a layer is encoded its alpha bounding box is found, rounded out
+to the texture compression block size, and only that part is saved. The
+canvas size and crop box ride along in the PNG's text chunks, so later
+stages (and cached copies) can recover them from the file alone.
+
+The sprite pivot is set to where the canvas centre falls inside the crop, so
+a layer placed and scaled as before lands exactly where the full canvas did.
+A manifest lists every layer's crop for anything placing layers by hand.
+"""
+import fnmatch
+import glob
+import json
+import os
+
+from PIL import Image
+import numpy as np
+
+from asset_writer import encode_png
+
+LAYERS = "Art/Backgrounds/*/layer*.png"
+MANIFEST = "Art/Backgrounds/layers.json"
+BLOCK = 4
+
+
+def is_layer(relpath):
+    """Whether relpath is a parallax layer (not one of its resolution tiers)."""
+    return fnmatch.fnmatchcase(relpath, LAYERS) and '@' not in relpath
+
+
+def find_layers(root):
+    """Relpaths of the layers present under root, sorted."""
+    found = (os.path.relpath(path, root).replace(os.sep, '/')
+             for path in glob.glob(os.path.join(root, LAYERS)))
+    return sorted(relpath for relpath in found if is_layer(relpath))
+
+
+def crop_box(alpha, block=BLOCK):
+    """(left, top, right, bottom) of the visible pixels, rounded out to block."""
+    height, width = alpha.shape
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        return 0, 0, min(block, width), min(block, height)
+    left = int(cols[0]) // block * block
+    top = int(rows[0]) // block * block
+    right = min(-(-(int(cols[-1]) + 1) // block) * block, width)
+    bottom = min(-(-(int(rows[-1]) + 1) // block) * block, height)
+    return left, top, right, bottom
+
+
+def encode_layer(img, compression='release'):
+    """PNG bytes of img cropped to its visible pixels, with the crop recorded.
+
+    An image without alpha is all visible and keeps its whole canvas.
+    """
+    box = crop_box(np.asarray(img.getchannel('A')) if img.mode == 'RGBA'
+                   else np.ones((img.height, img.width), dtype=bool))
+    return encode_png(img.crop(box), text={
+        'Canvas': f"{img.width}x{img.height}",
+        'Crop': ",".join(map(str, box)),
+    }, compression=compression)
+
+
+def read_crop(img):
+    """((canvas w, canvas h), (left, top, right, bottom)) of a loaded layer PNG.
+
+    Layers saved before cropping cover their whole canvas.
+    """
+    text = getattr(img, 'text', {})
+    if 'Canvas' not in text:
+        return img.size, (0, 0) + img.size
+    canvas = tuple(int(v) for v in text['Canvas'].split('x'))
+    box = tuple(int(v) for v in text['Crop'].split(','))
+    return canvas, box
+
+
+def pivot(canvas, box):
+    """Unity pivot (fractions of the crop, y up) at the canvas centre."""
+    (width, height), (left, top, right, bottom) = canvas, box
+    return ((width / 2 - left) / (right - left), (bottom - height / 2) / (bottom - top))
+
+
+def build_manifest(root, writer, changed=None):
+    """Write the crop of every layer present under root to the layer manifest.
+
+    With `changed`, nothing is done unless a layer changed.
+    """
+    if changed is not None and not any(is_layer(relpath) for relpath in changed):
+        return
+    layers = {}
+    full = cropped = 0
+    for relpath in find_layers(root):
+        with Image.open(os.path.join(root, relpath)) as img:
+            canvas, box = read_crop(img)
+        left, top, right, bottom = box
+        px, py = pivot(canvas, box)
+        layers[relpath] = {
+            'canvas': list(canvas),
+            'rect': [left, top, right - left, bottom - top],
+            'pivot': [round(px, 6), round(py, 6)],
+        }
+        full += canvas[0] * canvas[1]
+        cropped += (right - left) * (bottom - top)
+    if not layers:
+        return
+    print(f"Layer crops: {cropped / full:.0%} of the full-canvas pixels")
+    data = (json.dumps({'block': BLOCK, 'layers': layers}, indent=2) + "\n").encode()
+    print(f"  {MANIFEST}" if writer.write(MANIFEST, data) else f"  {MANIFEST} (unchanged)")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Culling of back-layer pixels that opaque front layers always cover.
+Parallax layers all start at the origin and each then moves by its factor
+times the camera's travel (half that vertically, see ParallaxLayer.Move), so
+two layers only ever slide against each other by the difference of their
+factors times the camera travel. A back-layer pixel is culled when, for
+every such slide, the world-space patch it covers (grown by MARGIN pixels to
+allow for bilinear and mip filtering) lies wholly on opaque front-layer
+pixels. Nothing is culled for merely being off screen, so the rendered
+frame is the same wherever the camera goes. The culled pixels become fully
+transparent, which the crop and sprite-mesh stages then turn into smaller
+textures and meshes. Layers without any transparency are left as they are:
+culling them would only turn an opaque texture into one that needs alpha.
+
+The factors, layer scales and camera bounds are not copied here. They are
+read from the Unity sources by scene_parallax() and passed to occluded(), and
+the build fails if those sources no longer match what it looks for.
+"""
+import functools
+import os
+import re
+
+from PIL import Image
+import numpy as np
+
+from asset_registry import PROJECT_ROOT, REPO_ROOT
+from unity_meta import PIXELS_PER_UNIT
+
+SCENE_BUILDER = os.path.join(REPO_ROOT, "TejimolaBlossom", "Assets", "Editor", "SceneBuilder.cs")
+CONSTANTS = os.path.join(PROJECT_ROOT, "Scripts", "Utils", "Constants.cs")
+SCENE_SETUP = os.path.join(PROJECT_ROOT, "Scripts", "Core", "SceneSetup.cs")
+MARGIN = 4
+
+
+class Parallax:
+    """How the scenes place and move the parallax layers.
+
+    `layers` maps layer name -> (parallax factor, x scale), back to front,
+    `scale_y` is the y scale of every layer and `bounds` the widest camera
+    bounds, (min x, max x, min y, max y) in world units.
+    """
+
+    def __init__(self, layers, scale_y, bounds):
+        self.layers = layers
+        self.scale_y = scale_y
+        self.bounds = bounds
+
+    def __repr__(self):
+        return f"Parallax({self.layers!r}, {self.scale_y!r}, {self.bounds!r})"
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=None)
+def scene_parallax():
+    """The Parallax of SceneBuilder's layer table, GameConstants and the camera bounds.
+
+    The bounds are the widest of SceneSetup's defaults and every camera
+    SceneBuilder configures.
+    """
+    speeds = dict(re.findall(r'const float (Parallax\w+Speed) = ([\d.]+)f', _read(CONSTANTS)))
+    builder = _read(SCENE_BUILDER)
+    rows = re.findall(r'/(layer\w+)\.png",\s*GameConstants\.(\w+),\s*-?\d+,\s*([\d.]+)f\)', builder)
+    scale_y = re.search(r'lGO\.transform\.localScale = new Vector3\(scaleX, ([\d.]+)f', builder)
+    setup = dict(re.findall(r'cameraBounds(M\w+) = (-?[\d.]+)f', _read(SCENE_SETUP)))
+    if (not rows or scale_y is None or any(speed not in speeds for _, speed, _ in rows)
+            or sorted(setup) != ['MaxX', 'MaxY', 'MinX', 'MinY']):
+        raise ValueError("cannot read the parallax setup from SceneBuilder.cs, Constants.cs "
+                         "and SceneSetup.cs; update layer_occlusion.scene_parallax")
+    max_x = max([float(setup['MaxX'])] + [float(v) for v in re.findall(r'cameraMaxX: ([\d.]+)f', builder)])
+    min_x = min([float(setup['MinX']), -max_x])
+    min_y = min([float(setup['MinY'])] + [float(v) for v in re.findall(r'"minY", (-?[\d.]+)f', builder)])
+    max_y = max([float(setup['MaxY'])] + [float(v) for v in re.findall(r'"maxY", (-?[\d.]+)f', builder)])
+    layers = {name: (float(speeds[speed]), float(scale_x)) for name, speed, scale_x in rows}
+    return Parallax(layers, float(scale_y.group(1)), (min_x, max_x, min_y, max_y))
+
+
+def _spans(count, back_scale, front_scale, front_count, slide):
+    """Inclusive front pixel [first, last] under each back pixel along one axis."""
+    centre = (np.arange(count) + 0.5 - count / 2) * back_scale
+    reach = (0.5 + MARGIN) * back_scale + slide
+    first = np.floor((centre - reach) / front_scale + front_count / 2).astype(int) - MARGIN
+    last = np.floor((centre + reach) / front_scale + front_count / 2).astype(int) + MARGIN
+    return first, last
+
+
+def _all_in(runs, first, last, axis):
+    """Whether runs (booleans) are True over each inclusive [first, last] span along axis.
+
+    Spans reaching past either end are never all True.
+    """
+    n = runs.shape[axis]
+    inside = (first >= 0) & (last < n)
+    first, last = np.clip(first, 0, n - 1), np.clip(last, 0, n - 1)
+    table = np.concatenate([np.zeros_like(np.take(runs, [0], axis), dtype=np.int32),
+                            runs.cumsum(axis, dtype=np.int32)], axis)
+    count = np.take(table, last + 1, axis) - np.take(table, first, axis)
+    shape = [1, 1]
+    shape[axis] = -1
+    return (count == (last - first + 1).reshape(shape)) & inside.reshape(shape)
+
+
+def hidden(back_size, back, front_opaque, front, parallax, pixels_per_unit=PIXELS_PER_UNIT):
+    """Mask over the back layer of pixels the front layer's opaque pixels always cover.
+
+    `back` and `front` are (factor, x scale) entries of parallax.layers.
+    """
+    width, height = back_size
+    fh, fw = front_opaque.shape
+    diff = abs(front[0] - back[0])
+    min_x, max_x, min_y, max_y = parallax.bounds
+    sx, sy = front[1] / pixels_per_unit, parallax.scale_y / pixels_per_unit
+    x0, x1 = _spans(width, back[1] / pixels_per_unit, sx, fw, diff * (max_x - min_x))
+    y0, y1 = _spans(height, sy, sy, fh, diff * (max_y - min_y) / 2)
+    # The patch is a rectangle of front pixels, so it is opaque when every
+    # front row in its span is opaque across its columns. Rows run top down.
+    across = _all_in(front_opaque, x0, x1, axis=1)
+    return _all_in(across, y0, y1, axis=0)
+
+
+def occluded(payloads, parallax, scale=1):
+    """{relpath: mask} of the always-covered pixels of each back layer in a {relpath: image} render.
+
+    Only layers rendered together are compared, and fronts are taken as
+    rendered, before any of their own pixels are culled. Opaque layers get
+    no mask. `scale` is the render scale (see raster.render_scale); the
+    layers keep their world size.
+    """
+    by_dir = {}
+    for path in payloads:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in parallax.layers:
+            by_dir.setdefault(os.path.dirname(path), {})[name] = path
+    masks = {}
+    for layers in by_dir.values():
+        order = [name for name in parallax.layers if name in layers]
+        alpha = {name: np.asarray(payloads[layers[name]].convert('RGBA'))[..., 3] for name in order}
+        opaque = {name: alpha[name] == 255 for name in order}
+        for i, name in enumerate(order):
+            if opaque[name].all():
+                continue
+            mask = np.zeros(alpha[name].shape, dtype=bool)
+            for front in order[i + 1:]:
+                if opaque[front].any():
+                    mask |= hidden(payloads[layers[name]].size, parallax.layers[name], opaque[front],
+                                   parallax.layers[front], parallax, PIXELS_PER_UNIT * scale)
+            if mask.any():
+                masks[layers[name]] = mask
+    return masks
+
+
+def _fit(mask, size):
+    """mask resampled nearest-neighbour to size (width, height)."""
+    width, height = size
+    rows = np.arange(height) * mask.shape[0] // height
+    cols = np.arange(width) * mask.shape[1] // width
+    return mask[rows[:, None], cols]
+
+
+def cull(payloads, masks):
+    """Clear the masked pixels (see occluded) from a {relpath: image} render.
+
+    The masks may come from a render at another scale, which lets the tiers
+    of a render reuse its masks. Layers with nothing left are dropped from
+    the result.
+    """
+    payloads = dict(payloads)
+    for path, mask in masks.items():
+        if path not in payloads:
+            continue
+        culled = np.asarray(payloads[path].convert('RGBA')).copy()
+        mask = _fit(mask, payloads[path].size) & (culled[..., 3] > 0)
+        if not mask.any():
+            continue
+        culled[mask] = 0
+        if not culled[..., 3].any():
+            del payloads[path]
+            continue
+        payloads[path] = Image.fromarray(culled, 'RGBA')
+    return payloads
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of rendered assets.
+An entry holds the encoded PNG/WAV bytes for one asset, keyed by a hash of
+everything that can change them: the code the generator reaches (see
+call_graph.py), the modules that cull, crop, pack and encode its images
+and the scenes' parallax setup they cull for, parameters, the palette entries that code reads and the library versions
+doing the drawing.
+"""
+import ast
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import sys
+
+import numpy as np
+import PIL
+
+import call_graph
+from asset_registry import REPO_ROOT
+
+CACHE_DIR = os.path.join(REPO_ROOT, ".asset_cache")
+CACHE_SIZE_MB = 512
+FORMAT_VERSION = 10
+
+LIBRARY_VERSIONS = (sys.version_info[:2], np.__version__, PIL.__version__)
+
+# Modules between a generator's images and the cached bytes; their whole
+# code is part of every key.
+ENCODE_MODULES = ('asset_writer', 'layer_crop', 'layer_occlusion', 'sprite_sheets', 'svg_export',
+                  'texture_alpha', 'texture_tiers')
+
+
+def stable_repr(value):
+    """repr() that does not leak memory addresses for functions."""
+    if callable(value) and hasattr(value, '__qualname__'):
+        return f"<{value.__module__}.{value.__qualname__}>"
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{stable_repr(k)}: {stable_repr(v)}"
+                               for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))) + '}'
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__ + '(' + ', '.join(stable_repr(v) for v in value) + ')'
+    return repr(value)
+
+
+def generator_functions(asset):
+    """The render function plus any generator functions passed in as params."""
+    funcs = [asset.render]
+    values = list(asset.params.values())
+    while values:
+        value = values.pop()
+        if inspect.isfunction(value):
+            funcs.append(value)
+        elif isinstance(value, dict):
+            values += value.values()
+        elif isinstance(value, (list, tuple)):
+            values += value
+    return funcs
+
+
+@functools.lru_cache(maxsize=None)
+def encode_fingerprint():
+    """sha256 over the AST of ENCODE_MODULES and the parallax setup layers are culled for.
+
+    Both need a restart to change anyway.
+    """
+    h = hashlib.sha256()
+    for name in ENCODE_MODULES:
+        with open(importlib.import_module(name).__file__) as f:
+            h.update(f"{name}\n{ast.dump(ast.parse(f.read()))}\n".encode())
+    h.update(repr(importlib.import_module('layer_occlusion').scene_parallax()).encode())
+    return h.hexdigest()
+
+
+def cache_key(asset, paths, compression, scale=1):
+    h = hashlib.sha256()
+    for part in (FORMAT_VERSION, LIBRARY_VERSIONS, asset.id, sorted(paths), compression, scale,
+                 stable_repr(asset.params)):
+        h.update(repr(part).encode())
+    h.update(call_graph.fingerprint(generator_functions(asset)).encode())
+    h.update(encode_fingerprint().encode())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """On-disk store of {relpath: bytes} per key with size-capped LRU eviction.
+
+    Recency is the entry's mtime, refreshed on every hit.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_SIZE_MB * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                files = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return files
+
+    def put(self, key, files):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(files, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tight sprite meshes for the parallax layers.
+Most of a 1920x1080 layer is fully transparent, and a full-rect quad still
+costs a fill of every one of those pixels. Each layer's alpha coverage is
+reduced to a column profile (top and bottom of the visible pixels per
+column band), which is then coarsened until its outline fits the vertex
+budget. Bands are only ever merged by taking the union of their extents,
+so the polygon always contains every visible pixel.
+
+The outline is written as a custom sprite outline into the layer's .meta;
+Unity builds the sprite mesh from it instead of the full quad.
+"""
+import os
+
+from PIL import Image
+import numpy as np
+
+from layer_crop import find_layers, pivot, read_crop
+from texture_formats import applied_format
+from unity_meta import guid_for, has_alpha, import_settings, texture_meta
+
+BAND = 16
+MAX_VERTICES = 48
+
+
+def column_bands(alpha, band=BAND):
+    """Return [x0, x1, top, bottom] per band of columns with any visible pixel."""
+    mask = alpha > 0
+    height, width = mask.shape
+    bands = []
+    for x0 in range(0, width, band):
+        rows = np.flatnonzero(mask[:, x0:x0 + band].any(axis=1))
+        if len(rows):
+            bands.append([x0, min(x0 + band, width), int(rows[0]), int(rows[-1]) + 1])
+    return bands
+
+
+def _polygons(bands):
+    """Outline paths (image coordinates) for runs of touching bands."""
+    runs = []
+    for band in bands:
+        if runs and runs[-1][-1][1] == band[0]:
+            runs[-1].append(band)
+        else:
+            runs.append([band])
+    paths = []
+    for run in runs:
+        path = []
+        for x0, x1, top, _ in run:
+            path += [(x0, top), (x1, top)]
+        for x0, x1, _, bottom in reversed(run):
+            path += [(x1, bottom), (x0, bottom)]
+        paths.append(_drop_collinear(path))
+    return paths
+
+
+def _drop_collinear(path):
+    points = [p for i, p in enumerate(path) if p != path[i - 1]]
+    kept = []
+    for i, (x, y) in enumerate(points):
+        (px, py), (nx, ny) = points[i - 1], points[(i + 1) % len(points)]
+        if (x - px) * (ny - y) != (y - py) * (nx - x):
+            kept.append((x, y))
+    return kept
+
+
+def outline(alpha, band=BAND, max_vertices=MAX_VERTICES):
+    """Polygon paths covering every visible pixel in at most max_vertices points.
+
+    Returns [] for a layer with nothing visible.
+    """
+    bands = column_bands(alpha, band)
+    if not bands:
+        return []
+    paths = _polygons(bands)
+    while len(bands) > 1 and sum(map(len, paths)) > max_vertices:
+        # Merge the neighbouring pair whose union adds the least area.
+        def cost(i):
+            a, b = bands[i], bands[i + 1]
+            top, bottom = min(a[2], b[2]), max(a[3], b[3])
+            return ((b[1] - a[0]) * (bottom - top)
+                    - (a[1] - a[0]) * (a[3] - a[2]) - (b[1] - b[0]) * (b[3] - b[2]))
+        i = min(range(len(bands) - 1), key=cost)
+        a, b = bands[i], bands.pop(i + 1)
+        bands[i] = [a[0], b[1], min(a[2], b[2]), max(a[3], b[3])]
+        paths = _polygons(bands)
+    return paths
+
+
+def polygon_area(path):
+    """Shoelace area of one path."""
+    xs, ys = np.array(path, dtype=np.float64).T
+    return abs(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1))) / 2
+
+
+def to_unity(paths, size):
+    """Image-space paths to Unity outline space: rect centre origin, y up."""
+    width, height = size
+    return [[(x - width / 2, height / 2 - y) for x, y in path] for path in paths]
+
+
+def build_mesh(root, relpath):
+    """Return (.meta bytes, vertex count, covered fraction) for one layer."""
+    with Image.open(os.path.join(root, relpath)) as src:
+        canvas, box = read_crop(src)
+        alpha = has_alpha(src)
+        img = src.convert('RGBA')
+    paths = outline(np.asarray(img)[..., 3])
+    meta = texture_meta(guid_for(root, relpath), relpath, pivot=pivot(canvas, box),
+                        outline=to_unity(paths, img.size), alpha=alpha,
+                        texture_format=applied_format(root, relpath),
+                        **import_settings(relpath, img.size))
+    area = sum(polygon_area(path) for path in paths)
+    return meta.encode(), sum(map(len, paths)), area / (img.width * img.height)
+
+
+def build_meshes(root, writer, changed=None):
+    """Write a tight-mesh .meta beside every (changed) parallax layer present under root."""
+    layers = [relpath for relpath in find_layers(root) if changed is None or relpath in changed]
+    if layers:
+        print("Meshing parallax layers...")
+    for relpath in layers:
+        meta, vertices, coverage = build_mesh(root, relpath)
+        status = "" if writer.write(relpath + ".meta", meta) else " (unchanged)"
+        print(f"  {relpath}.meta: {vertices} vertices, {coverage:.0%} of quad{status}")
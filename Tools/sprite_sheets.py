@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Character sprite sheets with each distinct frame stored once.
+Walk cycles repeat poses (idle is frames 0 and 2 of every 4-frame cycle),
+so before a sheet is encoded its frames are compared byte for byte and only
+the first copy of each is kept, packed left to right in as few rows as the
+sheet's columns allow. A frame table mapping animation frames to cells
+rides along in the PNG's text chunks, like a layer's crop (see layer_crop).
+
+The .meta then slices the sheet into one sprite per animation frame, named
+{sheet}_{frame:02d} as AnimationSetup expects, with repeated frames sharing
+a cell's rect, so clips built from the sprites play exactly as before. A
+manifest lists every sheet's table for anything reading the PNGs directly.
+
+Sheets are drawn as COLUMNS frames across and ROWS rows (one unless
+listed); keep these in step with the generators that draw them.
+"""
+import fnmatch
+import glob
+import json
+import os
+
+from PIL import Image
+import numpy as np
+
+from asset_writer import encode_png
+from texture_formats import applied_format
+from unity_meta import SpriteRect, existing_sprite_ids, guid_for, import_settings, texture_meta
+
+SHEETS = "Art/Sprites/Characters/*_spritesheet.png"
+MANIFEST = "Art/Sprites/Characters/sheets.json"
+COLUMNS = 4
+# Sheets drawn as more than one row of frames, by relpath.
+ROWS = {"Art/Sprites/Characters/father_spritesheet.png": 2}
+
+
+def is_sheet(relpath):
+    """Whether relpath is a character sheet (not one of its resolution tiers)."""
+    return fnmatch.fnmatchcase(relpath, SHEETS) and '@' not in relpath
+
+
+def dedupe(img, rows=1, columns=COLUMNS):
+    """(packed sheet, cell size, [cell index of each frame]) for a rows x columns sheet."""
+    width, height = img.width // columns, img.height // rows
+    pixels = np.asarray(img.convert('RGBA'))
+    cells, frames, table = {}, [], []
+    for i in range(rows * columns):
+        y, x = divmod(i, columns)
+        frame = pixels[y * height:(y + 1) * height, x * width:(x + 1) * width]
+        key = frame.tobytes()
+        if key not in cells:
+            cells[key] = len(frames)
+            frames.append(frame)
+        table.append(cells[key])
+    packed_columns = min(columns, len(frames))
+    packed_rows = -(-len(frames) // packed_columns)
+    out = np.zeros((packed_rows * height, packed_columns * width, 4), dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        y, x = divmod(i, packed_columns)
+        out[y * height:(y + 1) * height, x * width:(x + 1) * width] = frame
+    return Image.fromarray(out, 'RGBA'), (width, height), table
+
+
+def encode_sheet(path, img, compression='release'):
+    """PNG bytes of a sheet with repeated frames removed and the frame table recorded."""
+    packed, (width, height), table = dedupe(img, ROWS.get(path, 1))
+    return encode_png(packed, text={
+        'Cell': f"{width}x{height}",
+        'Frames': ",".join(map(str, table)),
+    }, compression=compression)
+
+
+def read_frames(img):
+    """((cell w, cell h), [cell of each frame]) of a loaded sheet PNG, or None if not deduplicated."""
+    text = getattr(img, 'text', {})
+    if 'Frames' not in text:
+        return None
+    cell = tuple(int(v) for v in text['Cell'].split('x'))
+    return cell, [int(v) for v in text['Frames'].split(',')]
+
+
+def cell_rect(index, cell, sheet_size):
+    """Unity rect (x, y, w, h), bottom-left origin, of a cell in a packed sheet."""
+    (width, height), (sheet_width, sheet_height) = cell, sheet_size
+    columns = sheet_width // width
+    y, x = divmod(index, columns)
+    return (x * width, sheet_height - (y + 1) * height, width, height)
+
+
+def frame_sprites(name, img):
+    """One SpriteRect per animation frame of a loaded sheet PNG, named name_NN; None if not deduplicated."""
+    found = read_frames(img)
+    if found is None:
+        return None
+    cell, table = found
+    return [SpriteRect(f"{name}_{i:02d}", cell_rect(index, cell, img.size), (0.5, 0), 'bottom')
+            for i, index in enumerate(table)]
+
+
+def build_sheets(root, writer, changed=None):
+    """Write a frame-sliced .meta beside every deduplicated sheet under root, and the manifest.
+
+    With `changed`, nothing is done unless a sheet changed, and only the
+    changed sheets get a new .meta.
+    """
+    if changed is not None and not any(is_sheet(relpath) for relpath in changed):
+        return
+    sheets = {}
+    stored = frames = 0
+    for path in sorted(glob.glob(os.path.join(root, SHEETS))):
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        if not is_sheet(relpath):
+            continue
+        with Image.open(path) as img:
+            found = read_frames(img)
+            sprites = frame_sprites(os.path.splitext(os.path.basename(relpath))[0], img)
+            texture_format = applied_format(root, relpath) if found else None
+            size = img.size
+        if found is None:
+            continue
+        cell, table = found
+        if changed is None or relpath in changed:
+            meta = texture_meta(guid_for(root, relpath), relpath, sprites=sprites,
+                                texture_format=texture_format, ids=existing_sprite_ids(root, relpath),
+                                **import_settings(relpath, size))
+            writer.write(relpath + ".meta", meta.encode())
+        sheets[relpath] = {'cell': list(cell), 'frames': table}
+        stored += max(table) + 1
+        frames += len(table)
+    if not sheets:
+        return
+    print(f"Sprite sheets: {stored} cells stored for {frames} frames")
+    data = (json.dumps({'sheets': sheets}, indent=2) + "\n").encode()
+    print(f"  {MANIFEST}" if writer.write(MANIFEST, data) else f"  {MANIFEST} (unchanged)")
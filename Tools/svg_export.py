@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+SVG copies of the procedurally drawn props, portraits and UI.
+While an asset tagged with one of VECTOR_TAGS renders, every canvas it
+makes is mirrored by an SvgCanvas (see raster.mirrored) that turns the
+ellipses, rectangles, polygons, arcs and lines into SVG elements in
+authored pixels. Beside each PNG drawn that way the build writes name.svg,
+for Unity's Vector Graphics importer to tessellate at any resolution, when
+the SVG is smaller than the 1x and 2x PNGs it stands in for (see
+worth_writing); small flat props compress better as palette PNGs.
+
+Only what that importer renders is written. Text becomes paths: the glyphs
+are drawn at TEXT_DETAIL times their size and traced with
+collider_shapes.contours. There are no masks, so where PIL would replace
+the pixels under a translucent shape the SVG blends it on with
+fill-opacity, and a fully transparent shape drawn over others (a "hollow
+centre") cannot be expressed. Canvases that were drawn with anything the
+mirror cannot express get no SVG, and neither do images made any other way
+(colour grades, pastes, resizes).
+"""
+import contextlib
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+
+import raster
+from collider_shapes import contours, simplify
+
+VECTOR_TAGS = {'portrait', 'prop', 'ui'}
+# Glyphs are traced at this multiple of their size, and simplified to within
+# TEXT_TOLERANCE of the traced outline (in traced pixels).
+TEXT_DETAIL = 4
+TEXT_TOLERANCE = 0.5
+
+
+def svg_path(relpath):
+    return os.path.splitext(relpath)[0] + ".svg"
+
+
+def _num(value):
+    return f"{float(value):.6g}"
+
+
+def _rgba(color):
+    """(#rrggbb, alpha 0-255) of a PIL colour tuple or grey level."""
+    if np.isscalar(color):
+        color = (color,) * 3
+    color = tuple(int(round(c)) for c in color) + (255,) * (4 - len(color))
+    return "#{:02x}{:02x}{:02x}".format(*color[:3]), color[3]
+
+
+def _box(xy):
+    (x0, y0), (x1, y1) = raster.pairs(xy)
+    return x0, y0, x1 + 1, y1 + 1
+
+
+def _points(xy):
+    return " ".join(f"{_num(x + 0.5)},{_num(y + 0.5)}" for x, y in raster.pairs(xy))
+
+
+class SvgCanvas:
+    """Mirror of one canvas that collects its draw calls as SVG."""
+
+    def __init__(self, size, scale=1, background=('color', 0)):
+        self.size = size
+        self.scale = scale
+        self.defs = []
+        self.body = []
+        self.unsupported = set()
+        self._background(*background)
+
+    def __getattr__(self, name):
+        # Any other drawing call leaves the SVG incomplete.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        self.unsupported.add(name)
+        return lambda *args, **kwargs: None
+
+    def _full(self, paint):
+        w, h = self.size
+        return f'<rect width="{_num(w)}" height="{_num(h)}" {paint}/>'
+
+    def _background(self, kind, *spec):
+        if kind == 'color':
+            if spec[0] != 0:
+                self._paint(self._full('{paint}'), spec[0])
+            return
+        offsets, colors = raster.parse_stops(spec[0])
+        stops = "".join(
+            f'<stop offset="{_num(offset)}" stop-color="{_rgba(color)[0]}"'
+            f' stop-opacity="{_num(color[3] / 255)}"/>' for offset, color in zip(offsets, colors))
+        if kind == 'linear':
+            (sx, sy), (ex, ey) = spec[1], spec[2]
+            self.defs.append(
+                f'<linearGradient id="bg" gradientUnits="userSpaceOnUse" x1="{_num(sx + 0.5)}"'
+                f' y1="{_num(sy + 0.5)}" x2="{_num(ex + 0.5)}" y2="{_num(ey + 0.5)}">{stops}</linearGradient>')
+        else:
+            (cx, cy), radius = spec[1], spec[2]
+            self.defs.append(
+                f'<radialGradient id="bg" gradientUnits="userSpaceOnUse" cx="{_num(cx + 0.5)}"'
+                f' cy="{_num(cy + 0.5)}" r="{_num(radius)}">{stops}</radialGradient>')
+        self.body.append(self._full('fill="url(#bg)"'))
+
+    def _paint(self, shape, color, stroke=None):
+        """Add shape (markup with a {paint} slot) in color, blended over what is under it."""
+        if color is None:
+            return
+        rgb, alpha = _rgba(color)
+        if not alpha:
+            # Erasing earlier shapes needs a mask.
+            if self.body:
+                self.unsupported.add('erase')
+            return
+        opacity = "" if alpha == 255 else _num(alpha / 255)
+        if stroke is None:
+            paint = f'fill="{rgb}"' + (f' fill-opacity="{opacity}"' if opacity else "")
+        else:
+            paint = (f'fill="none" stroke="{rgb}" stroke-width="{_num(stroke)}"'
+                     + (f' stroke-opacity="{opacity}"' if opacity else ""))
+        self.body.append(shape.replace("{paint}", paint))
+
+    def _outlined(self, make, xy, fill, outline, width, **shape):
+        """Fill the whole shape, then stroke the outline inside its edge as PIL does."""
+        x0, y0, x1, y1 = _box(xy)
+        self._paint(make(x0, y0, x1, y1, **shape), fill)
+        if outline is not None and width:
+            inset = width / 2
+            self._paint(make(x0 + inset, y0 + inset, x1 - inset, y1 - inset, inset=inset, **shape),
+                        outline, stroke=width)
+
+    @staticmethod
+    def _rect(x0, y0, x1, y1, radius=0, inset=0):
+        corner = f' rx="{_num(max(radius - inset, 0))}"' if radius else ""
+        return (f'<rect x="{_num(x0)}" y="{_num(y0)}" width="{_num(x1 - x0)}"'
+                f' height="{_num(y1 - y0)}"{corner} {{paint}}/>')
+
+    @staticmethod
+    def _ellipse(x0, y0, x1, y1, inset=0):
+        return (f'<ellipse cx="{_num((x0 + x1) / 2)}" cy="{_num((y0 + y1) / 2)}"'
+                f' rx="{_num((x1 - x0) / 2)}" ry="{_num((y1 - y0) / 2)}" {{paint}}/>')
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self._outlined(self._rect, xy, fill, outline, width)
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1, **kwargs):
+        self._outlined(self._rect, xy, fill, outline, width, radius=radius)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self._outlined(self._ellipse, xy, fill, outline, width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        shape = f'<polygon points="{_points(xy)}" {{paint}}/>'
+        self._paint(shape, fill)
+        if outline is not None and width:
+            self._paint(shape, outline, stroke=width)
+
+    def line(self, xy, fill=None, width=0, joint=None):
+        cap = 'square' if width <= 1 else 'butt'
+        self._paint(f'<polyline points="{_points(xy)}" stroke-linecap="{cap}" {{paint}}/>',
+                    fill, stroke=max(width, 1))
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        x0, y0, x1, y1 = _box(xy)
+        rx, ry = (x1 - x0 - width) / 2, (y1 - y0 - width) / 2
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        a, b = np.radians(start), np.radians(end)
+        sweep = (end - start) % 360
+        large = 1 if sweep > 180 else 0
+        self._paint(
+            f'<path d="M {_num(cx + rx * np.cos(a))} {_num(cy + ry * np.sin(a))}'
+            f' A {_num(rx)} {_num(ry)} 0 {large} 1 {_num(cx + rx * np.cos(b))}'
+            f' {_num(cy + ry * np.sin(b))}" {{paint}}/>', fill, stroke=width)
+
+    def point(self, xy, fill=None):
+        for x, y in raster.pairs(xy):
+            self._paint(self._rect(x, y, x + 1, y + 1), fill)
+
+    def text(self, xy, text, fill=None, font=None, **kwargs):
+        """Text as the traced outline of its glyphs (see module docstring)."""
+        if font is None:
+            font = ImageFont.load_default()
+        detail = TEXT_DETAIL if hasattr(font, 'font_variant') else 1
+        if detail != 1:
+            font = font.font_variant(size=font.size * detail)
+        left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox(
+            (0, 0), text, font=font, **kwargs)
+        glyphs = Image.new('L', (right - left + 2, bottom - top + 2))
+        ImageDraw.Draw(glyphs).text((1 - left, 1 - top), text, fill=255, font=font, **kwargs)
+        loops = [simplify(loop, len(loop), TEXT_TOLERANCE)
+                 for loop in contours(np.asarray(glyphs) >= 128)]
+        if not loops:
+            return
+        # Traced points are pixel centres; SVG coordinates are pixel edges.
+        x, y = xy
+        d = " ".join("M " + " L ".join(f"{_num(x + (px + 0.5 - 1 + left) / detail)}"
+                                       f" {_num(y + (py + 0.5 - 1 + top) / detail)}"
+                                       for px, py in loop) + " Z" for loop in loops)
+        self._paint(f'<path d="{d}" fill-rule="evenodd" {{paint}}/>', fill)
+
+    def document(self):
+        """The SVG as bytes."""
+        w, h = self.size
+        defs = f"<defs>{''.join(self.defs)}</defs>\n" if self.defs else ""
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(w * self.scale)}"'
+                f' height="{_num(h * self.scale)}" viewBox="0 0 {_num(w)} {_num(h)}">\n'
+                f"{defs}" + "\n".join(self.body) + "\n</svg>\n").encode()
+
+
+def worth_writing(svg, pngs):
+    """Whether svg (bytes) is smaller than the PNG tiers it stands in for, together."""
+    return len(svg) < sum(len(png) for png in pngs)
+
+
+class Capture:
+    """The SvgCanvases made while one asset rendered."""
+
+    def __init__(self, mirrors):
+        self.mirrors = mirrors
+
+    def canvases(self, payloads):
+        """{png relpath: SvgCanvas} for every rendered image fully drawn in vectors."""
+        found = {}
+        for path, payload in payloads.items():
+            image, canvas = self.mirrors.get(id(payload), (None, None))
+            if image is payload and canvas.body and not canvas.unsupported:
+                found[path] = canvas
+        return found
+
+
+@contextlib.contextmanager
+def capture(asset):
+    """Mirror the canvases asset makes while it renders, if it is tagged for vectors.
+
+    Yields a Capture to look the rendered images up in afterwards.
+    """
+    if not VECTOR_TAGS & set(asset.tags):
+        yield Capture({})
+        return
+    with raster.mirrored(SvgCanvas) as mirrors:
+        yield Capture(mirrors)
@@ -0,0 +1,47 @@
+"""Encoded PNGs decode to exactly the pixels they were given."""
+import io
+
+from PIL import Image
+import numpy as np
+import pytest
+
+from asset_writer import PALETTE_COLORS, encode_png, palettize
+
+
+def _decoded(img, compression):
+    return np.asarray(Image.open(io.BytesIO(encode_png(img, compression=compression))).convert('RGBA'))
+
+
+def _partial_alpha():
+    """Few-colour RGBA art with antialiased edges: alpha 0, 255 and in between."""
+    img = Image.new('RGBA', (16, 8), (0, 0, 0, 0))
+    img.paste((200, 40, 40, 255), (2, 2, 14, 6))
+    img.paste((200, 40, 40, 128), (1, 2, 2, 6))
+    img.paste((30, 90, 200, 17), (14, 2, 15, 6))
+    return img
+
+
+def _grey():
+    return Image.fromarray(np.tile(np.arange(0, 256, 4, dtype=np.uint8), (8, 1)), 'L')
+
+
+def _many_colors():
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (32, 32, 4), dtype=np.uint8), 'RGBA')
+
+
+def test_palettize_is_exact():
+    img = _partial_alpha()
+    out = palettize(img)
+    assert out.mode == 'P' and 'transparency' in out.info
+    assert np.array_equal(np.asarray(out.convert('RGBA')), np.asarray(img))
+    assert palettize(_many_colors()) is None
+    assert len(np.unique(np.asarray(_many_colors()).reshape(-1, 4), axis=0)) > PALETTE_COLORS
+
+
+@pytest.mark.parametrize('make', [_partial_alpha, _grey, _many_colors,
+                                  lambda: _partial_alpha().convert('RGB')])
+@pytest.mark.parametrize('compression', ['dev', 'release'])
+def test_encode_png_round_trips(make, compression):
+    img = make()
+    assert np.array_equal(_decoded(img, compression), np.asarray(img.convert('RGBA')))
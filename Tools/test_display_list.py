@@ -0,0 +1,39 @@
+"""Replayed frame display lists draw exactly what the frame functions draw."""
+import sys
+
+import numpy as np
+import pytest
+
+import raster
+from asset_registry import REPO_ROOT
+from display_list import record
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from generate_assets import draw_dom_frame, draw_ranima_frame, draw_tejimola_frame
+
+FRAMES = [
+    (draw_tejimola_frame, {}),
+    (draw_tejimola_frame, {'walk_phase': 0.4, 'crouching': True}),
+    (draw_tejimola_frame, {'hiding': True}),
+    (draw_dom_frame, {}),
+    (draw_dom_frame, {'walk_phase': 0.8}),
+    (draw_ranima_frame, {'walk_phase': 0.4}),
+    (draw_ranima_frame, {'walk_phase': 0.8, 'corrupted': True}),
+]
+OFFSETS = [(0, 0), (64, 0), (137, 21)]
+
+
+@pytest.mark.parametrize('scale', [1, 2, 0.5])
+@pytest.mark.parametrize('draw_frame, kwargs', FRAMES,
+                         ids=[f"{f.__name__}-{'-'.join(map(str, k.values())) or 'default'}"
+                              for f, k in FRAMES])
+def test_replay_matches_direct_draw(draw_frame, kwargs, scale):
+    with raster.render_scale(scale):
+        direct = raster.new('RGBA', (256, 128), (0, 0, 0, 0))
+        for ox, oy in OFFSETS:
+            draw_frame(direct, ox, oy, **kwargs)
+        replayed = raster.new('RGBA', (256, 128), (0, 0, 0, 0))
+        record(draw_frame, **kwargs).replay_many(raster.Draw(replayed), OFFSETS)
+    assert np.asarray(direct)[..., 3].any()
+    assert np.array_equal(np.asarray(replayed), np.asarray(direct))
@@ -0,0 +1,116 @@
+"""Cache keys change with exactly the code and palette entries an asset reaches."""
+import importlib
+import linecache
+import os
+import sys
+
+import pytest
+
+import call_graph
+import render_cache
+from asset_registry import Asset
+from render_cache import cache_key
+
+HELPERS = '''
+def shade(color):
+    return tuple(v // 2 for v in color)
+
+
+def tint(color):
+    return color
+
+
+def unused():
+    return 0
+'''
+
+ART = '''
+import cache_helpers
+from cache_helpers import tint
+
+C = {'skin': (200, 150, 120), 'sky': (90, 140, 220)}
+
+
+def _outline(color):
+    return tint(color)
+
+
+def make_icon():
+    return _outline(cache_helpers.shade(C['skin']))
+
+
+def make_other():
+    return C['sky']
+'''
+
+ENCODER = '''
+def encode(img):
+    return img
+'''
+
+MODULES = {'cache_helpers': HELPERS, 'cache_art': ART, 'cache_encoder': ENCODER}
+
+
+@pytest.fixture
+def key(tmp_path, monkeypatch):
+    """key(old, new): cache key of make_icon with `old` replaced by `new` in MODULES."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+    # The modules live in tmp_path, which call_graph then treats as the repo.
+    monkeypatch.setattr(call_graph, 'REPO_ROOT', str(tmp_path))
+    monkeypatch.setattr(render_cache, 'ENCODE_MODULES',
+                        render_cache.ENCODE_MODULES + ('cache_encoder',))
+
+    def make_key(old='', new=''):
+        assert not old or sum(source.count(old) for source in MODULES.values()) == 1
+        for name, source in MODULES.items():
+            with open(os.path.join(tmp_path, name + ".py"), 'w') as f:
+                f.write(source.replace(old, new) if old else source)
+            sys.modules.pop(name, None)
+            call_graph.forget(name)
+        linecache.clearcache()
+        render_cache.encode_fingerprint.cache_clear()
+        art = importlib.import_module('cache_art')
+        asset = Asset('test/icon', art.make_icon, "Art/icon.png")
+        return cache_key(asset, asset.paths, 'dev')
+
+    yield make_key
+    for name in MODULES:
+        sys.modules.pop(name, None)
+        call_graph.forget(name)
+    render_cache.encode_fingerprint.cache_clear()
+
+
+def test_reachable_helper_changes_key(key):
+    assert key() != key("return tint(color)", "return tint(color[::-1])")
+
+
+def test_helper_in_another_module_changes_key(key):
+    # Reached through a module attribute and through a from-import.
+    assert key() != key("v // 2", "v // 3")
+    assert key() != key("def tint(color):\n    return color\n",
+                        "def tint(color):\n    return color[:3]\n")
+
+
+def test_palette_entry_read_changes_key(key):
+    assert key() != key("(200, 150, 120)", "(210, 150, 120)")
+
+
+def test_encode_module_changes_key(key):
+    assert key() != key("return img", "return img.copy()")
+
+
+def test_unrelated_code_keeps_key(key):
+    assert key() == key("def make_other():\n    return C['sky']",
+                        "def make_other():\n    return None")
+    assert key() == key("return 0", "return 1")
+    # An entry of a palette the asset reads, but not one it looks up.
+    assert key() == key("(90, 140, 220)", "(0, 0, 0)")
+
+
+def test_reachable_follows_calls_only(key):
+    key()
+    seen, palettes = call_graph.reachable([sys.modules['cache_art'].make_icon])
+    assert set(seen) == {('cache_art', 'make_icon'), ('cache_art', '_outline'),
+                         ('cache_helpers', 'shade'), ('cache_helpers', 'tint')}
+    assert palettes == {('cache_art', 'C'): {'skin'}}
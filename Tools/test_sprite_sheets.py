@@ -0,0 +1,57 @@
+"""Rebuilding a sheet's .meta keeps the sprite IDs clips already reference."""
+import os
+import re
+
+from PIL import Image
+
+from asset_writer import AssetWriter
+from sprite_sheets import build_sheets, encode_sheet
+from unity_meta import existing_sprite_ids, sprite_ids
+
+SHEET = "Art/Sprites/Characters/dom_spritesheet.png"
+
+
+def _write_sheet(root, frames):
+    img = Image.new('RGBA', (4 * 8, 12), (0, 0, 0, 0))
+    for i, color in enumerate(frames):
+        img.paste(color, (i * 8, 0, (i + 1) * 8, 12))
+    path = os.path.join(root, SHEET)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(encode_sheet(SHEET, img, 'dev'))
+
+
+def test_rebuild_keeps_sprite_ids(tmp_path):
+    root = str(tmp_path)
+    red, blue = (255, 0, 0, 255), (0, 0, 255, 255)
+    _write_sheet(root, [red, blue, red, blue])
+    build_sheets(root, AssetWriter(root))
+
+    # IDs as Unity minted them, which clips reference by internalID.
+    meta_path = os.path.join(root, SHEET + ".meta")
+    with open(meta_path) as f:
+        text = f.read()
+    minted = {}
+    for i, (name, (sprite_id, internal_id)) in enumerate(existing_sprite_ids(root, SHEET).items()):
+        minted[name] = (f"{i + 1:032x}", 1000 + i)
+        text = text.replace(sprite_id, minted[name][0]).replace(str(internal_id), str(1000 + i))
+    with open(meta_path, 'w') as f:
+        f.write(text)
+
+    _write_sheet(root, [red, blue, red, (0, 255, 0, 255)])
+    build_sheets(root, AssetWriter(root))
+
+    assert existing_sprite_ids(root, SHEET) == minted
+    with open(meta_path) as f:
+        table = dict(re.findall(r'^      (dom_spritesheet_\d+): (-?\d+)$', f.read(), re.M))
+    assert table == {name: str(internal_id) for name, (_, internal_id) in minted.items()}
+
+
+def test_new_sprites_get_derived_ids(tmp_path):
+    root = str(tmp_path)
+    _write_sheet(root, [(255, 0, 0, 255)] * 4)
+    build_sheets(root, AssetWriter(root))
+
+    ids = existing_sprite_ids(root, SHEET)
+    assert ids == {f"dom_spritesheet_{i:02d}": sprite_ids(SHEET, f"dom_spritesheet_{i:02d}")
+                   for i in range(4)}
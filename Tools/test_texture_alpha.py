@@ -0,0 +1,51 @@
+"""Full-screen backdrops are stored opaque and imported without alpha."""
+import fnmatch
+import os
+
+from PIL import Image
+import pytest
+
+import build_assets
+from asset_registry import load_registry
+from asset_writer import AssetWriter
+from unity_meta import has_alpha
+
+OPAQUE = ["Art/Backgrounds/*/layer4_sky.png", "Art/Backgrounds/*/preview_composite.png",
+          "Art/UI/Menu/menu_background.png"]
+
+
+def _opaque(relpath):
+    return any(fnmatch.fnmatchcase(relpath, pattern) for pattern in OPAQUE)
+
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    """(root, relpaths) of the OPAQUE textures built with every post-build stage."""
+    root = str(tmp_path_factory.mktemp('project'))
+    reg = load_registry()
+    writer = AssetWriter(root, 'dev')
+    for asset_id, paths in build_assets.plan(reg, reg.assets).items():
+        paths = [path for path in paths if _opaque(path)]
+        if paths:
+            for path, data in build_assets.render_asset(reg.get(asset_id), paths, 'dev').items():
+                writer.write(path, data)
+    for stage in build_assets.STAGES:
+        stage(root, writer, None)
+    return root, sorted(path for path in writer.changed if _opaque(path))
+
+
+def test_every_backdrop_is_built(built):
+    _, textures = built
+    for pattern in OPAQUE:
+        assert any(fnmatch.fnmatchcase(relpath, pattern) for relpath in textures), pattern
+
+
+def test_backdrops_are_opaque(built):
+    root, textures = built
+    for relpath in textures:
+        with Image.open(os.path.join(root, relpath)) as img:
+            assert not has_alpha(img), relpath
+        with open(os.path.join(root, relpath + ".meta")) as f:
+            meta = f.read()
+        assert "\n  alphaUsage: 0\n" in meta, relpath
+        assert "\n  alphaIsTransparency: 0\n" in meta, relpath
@@ -0,0 +1,21 @@
+"""--watch asks for a restart for every module it cannot reload in place."""
+import ast
+import os
+
+from asset_registry import TOOLS_DIR
+from watch_assets import INFRASTRUCTURE, watched_files
+
+
+def test_from_imported_modules_are_infrastructure():
+    # Tests are watched too, but never imported by a build.
+    modules = {os.path.splitext(os.path.basename(path))[0]: path for path in watched_files()
+               if not os.path.basename(path).startswith('test_')}
+    imported = set()
+    for path in modules.values():
+        with open(path) as f:
+            tree = ast.parse(f.read())
+        imported |= {node.module for node in ast.walk(tree)
+                     if isinstance(node, ast.ImportFrom) and node.module in modules}
+    assert 'asset_writer' in imported
+    assert imported <= INFRASTRUCTURE
+    assert all(os.path.exists(os.path.join(TOOLS_DIR, name + ".py")) for name in INFRASTRUCTURE)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Alpha import settings that follow the generated textures.
+Opaque images are written as RGB (see asset_writer.encode_png); this stage
+brings each existing .meta in line with the PNG beside it, turning alpha
+usage off for RGB textures so Unity picks an opaque compression format, and
+back on if a texture gains transparency. Only those two settings are
+touched; textures without a .meta yet are left for Unity to import first.
+
+Full-screen backdrops are made opaque before that: in game only the
+camera's clear colour is behind them, so flatten() composites the ones in
+BACKDROPS onto it as they are rendered. The frame is the same, and the
+few translucent pixels no longer cost the whole texture its alpha.
+"""
+import fnmatch
+import glob
+import os
+
+from PIL import Image
+
+from unity_meta import has_alpha, set_alpha_usage
+
+TEXTURES = "Art/**/*.png"
+# pattern -> RGB clear colour of the camera behind it (see SceneBuilder)
+BACKDROPS = {
+    # BuildStandardGameplayScene: Color.black behind the backmost parallax layer
+    "Art/Backgrounds/*/layer4_sky.png": (0, 0, 0),
+    # BuildMainMenu: new Color(0.05f, 0.02f, 0.02f) behind the overlay canvas
+    "Art/UI/Menu/menu_background.png": (13, 5, 5),
+}
+
+
+def flatten(payloads):
+    """{relpath: payload} with every backdrop image composited onto its clear colour."""
+    flat = dict(payloads)
+    for path, img in payloads.items():
+        for pattern, color in BACKDROPS.items():
+            if fnmatch.fnmatchcase(path, pattern) and has_alpha(img):
+                behind = Image.new('RGBA', img.size, color + (255,))
+                flat[path] = Image.alpha_composite(behind, img.convert('RGBA')).convert('RGB')
+    return flat
+
+
+def sync_alpha(root, writer, changed=None):
+    """Update alpha settings in every (changed) generated texture's .meta under root."""
+    switched = []
+    for path in sorted(glob.glob(os.path.join(root, TEXTURES), recursive=True)):
+        meta_path = path + ".meta"
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        if changed is not None and relpath not in changed and relpath + ".meta" not in changed:
+            continue
+        if not os.path.exists(meta_path):
+            continue
+        with Image.open(path) as img:
+            alpha = has_alpha(img)
+        with open(meta_path, newline='') as f:
+            text = f.read()
+        updated = set_alpha_usage(text, alpha)
+        if updated != text:
+            relpath = os.path.relpath(meta_path, root).replace(os.sep, '/')
+            writer.write(relpath, updated.encode())
+            switched.append((relpath, alpha))
+    if switched:
+        print("Alpha import settings...")
+        for relpath, alpha in switched:
+            print(f"  {relpath}: {'alpha' if alpha else 'opaque'}")
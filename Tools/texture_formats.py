@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Smallest adequate GPU format for each generated texture.
+Much of the art needs far less than 32 bits a pixel: flashes, particles
+and footprints are one colour under a varying alpha, and icons, props and
+sheets use a handful of flat colours. Each texture is analysed as one
+numpy array (its distinct colours, its alpha levels and how far its
+premultiplied colour strays from one tint scaled by alpha) and the first
+format in FORMATS that holds it is recommended:
+
+  Alpha8    one tint: the alpha mask is stored and the tint goes on the
+            renderer's colour
+  RGB565    opaque, and every colour survives 5-6-5 bits
+  RGBA4444  every colour and alpha level survives 4 bits each
+
+A colour survives if no two colours merge and none moves by more than
+MAX_ERROR. Art/texture_formats.json records each texture's analysis,
+recommendation and estimated VRAM beside what its current import settings
+(see unity_meta.IMPORT_POLICY) cost, and the build prints the savings.
+
+Each texture is analysed once per build, and again only when its bytes
+change: results are kept by source digest and seeded from the manifest,
+as texture_tiers does.
+
+Textures matching APPLY also get the recommendation written into their
+.meta when it is cheaper than the current import. Alpha8 is never applied
+that way, since it renders black until the tint is set.
+"""
+import fnmatch
+import glob
+import hashlib
+import io
+import json
+import os
+
+from PIL import Image
+import numpy as np
+
+from unity_meta import has_alpha, import_settings
+
+MANIFEST = "Art/texture_formats.json"
+TEXTURES = "Art/**/*.png"
+MAX_ERROR = 8
+
+# name: (TextureImporterFormat, bytes per pixel, bits per RGBA channel)
+FORMATS = {
+    'Alpha8': (1, 1, None),
+    'RGB565': (7, 2, (5, 6, 5, 8)),
+    'RGBA4444': (13, 2, (4, 4, 4, 4)),
+    'RGB24': (3, 3, None),
+    'RGBA32': (4, 4, None),
+}
+# Bytes per pixel of block compression (DXT5/BC7 with alpha, DXT1 without).
+COMPRESSED_BPP = {True: 1, False: 0.5}
+
+# Texture classes imported in their recommended format (see module docstring).
+APPLY = ["Art/Sprites/Characters/*_spritesheet*.png"]
+
+# analyse() results by source digest, seeded from the manifest, so a texture
+# is analysed once per build and again only when its bytes change.
+_analyses = {}
+_seeded = set()
+
+
+def _survives(colors, bits):
+    """Whether distinct RGBA colors stay distinct and within MAX_ERROR at bits per channel."""
+    levels = (1 << np.array(bits)) - 1
+    quantised = np.round(colors * levels / 255)
+    error = np.abs(np.round(quantised * 255 / levels) - colors).max(initial=0)
+    return error <= MAX_ERROR and len(np.unique(quantised, axis=0)) == len(colors)
+
+
+def analyse(img):
+    """Colour and alpha statistics of a loaded image, with its recommended format."""
+    pixels = np.asarray(img.convert('RGBA')).reshape(-1, 4)
+    alpha = pixels[:, 3]
+    visible = pixels[alpha > 0]
+    colors = np.unique(visible.view(np.uint32)).view(np.uint8).reshape(-1, 4).astype(np.float64)
+    rgb = visible[:, :3].astype(np.float64)
+    tint = np.median(rgb, axis=0) if len(rgb) else np.full(3, 255.0)
+    tint_error = (np.abs(rgb - tint).max(axis=1) * visible[:, 3] / 255).max(initial=0)
+    opaque = bool(alpha.min() == 255)
+
+    if tint_error <= MAX_ERROR:
+        name = 'Alpha8'
+    elif opaque and _survives(colors, FORMATS['RGB565'][2]):
+        name = 'RGB565'
+    elif _survives(colors, FORMATS['RGBA4444'][2]):
+        name = 'RGBA4444'
+    else:
+        name = 'RGB24' if opaque else 'RGBA32'
+    stats = {
+        'size': list(img.size),
+        'alpha': has_alpha(img),
+        'colors': len(np.unique(colors[:, :3], axis=0)),
+        'alpha_levels': len(np.unique(alpha)),
+        'transparent': round(float(np.mean(alpha == 0)), 4),
+        'partial': round(float(np.mean((alpha > 0) & (alpha < 255))), 4),
+        'tint_error': round(float(tint_error), 1),
+        'format': name,
+    }
+    if name == 'Alpha8':
+        stats['tint'] = "#{:02x}{:02x}{:02x}".format(*np.round(tint).astype(int))
+    return stats
+
+
+def vram(size, settings, bpp):
+    """Estimated bytes of a texture imported with texture_meta settings at bpp bytes a pixel."""
+    shrink = min(1, settings['max_size'] / max(size))
+    pixels = round(size[0] * shrink) * round(size[1] * shrink)
+    return round(pixels * bpp * (4 / 3 if settings.get('mipmaps') else 1))
+
+
+def import_bpp(settings, alpha):
+    """Bytes per pixel Unity picks for an import without a format override."""
+    if settings.get('compression', 'normal') == 'none':
+        return FORMATS['RGBA32' if alpha else 'RGB24'][1]
+    return COMPRESSED_BPP[alpha]
+
+
+def _seed(root):
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            manifest = json.load(f)
+        previous = manifest['textures'] if manifest.get('max_error') == MAX_ERROR else {}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+    for entry in previous.values():
+        stats = dict(entry)
+        source = stats.pop('source', None)
+        stats.pop('import_bytes', None)
+        stats.pop('format_bytes', None)
+        if source and 'size' in stats:
+            _analyses.setdefault(source, stats)
+
+
+def analysis(root, relpath, data=None):
+    """(source digest, analyse() of the texture at root/relpath), reusing earlier results.
+
+    `data` is the PNG's bytes, for a texture not written yet.
+    """
+    if root not in _seeded:
+        _seeded.add(root)
+        _seed(root)
+    if data is None:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    if digest not in _analyses:
+        with Image.open(io.BytesIO(data)) as img:
+            _analyses[digest] = analyse(img)
+    return digest, _analyses[digest]
+
+
+def applied_format(root, relpath, data=None):
+    """TextureImporterFormat to write into the .meta of root/relpath, or None to let Unity choose."""
+    if not any(fnmatch.fnmatchcase(relpath, pattern) for pattern in APPLY):
+        return None
+    stats = analysis(root, relpath, data)[1]
+    name = stats['format']
+    settings = import_settings(relpath, stats['size'])
+    if name == 'Alpha8' or FORMATS[name][1] >= import_bpp(settings, stats['alpha']):
+        return None
+    return FORMATS[name][0]
+
+
+def advise_formats(root, writer, changed=None):
+    """Write the format recommendation of every generated texture under root to the manifest.
+
+    With `changed`, nothing is done unless a texture changed.
+    """
+    if changed is not None and not any(fnmatch.fnmatchcase(p, TEXTURES) for p in changed):
+        return
+    textures = {}
+    current = advised = 0
+    for path in sorted(glob.glob(os.path.join(root, TEXTURES), recursive=True)):
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        if '@' in os.path.basename(relpath):
+            continue
+        digest, stats = analysis(root, relpath)
+        entry = {'source': digest, **stats}
+        settings = import_settings(relpath, stats['size'])
+        entry['import_bytes'] = vram(stats['size'], settings, import_bpp(settings, stats['alpha']))
+        entry['format_bytes'] = vram(stats['size'], settings, FORMATS[entry['format']][1])
+        textures[relpath] = entry
+        current += entry['import_bytes']
+        advised += min(entry['import_bytes'], entry['format_bytes'])
+    if not textures:
+        return
+    smaller = [(relpath, entry) for relpath, entry in textures.items()
+               if entry['format_bytes'] < entry['import_bytes']]
+    print(f"Texture formats: {len(smaller)} of {len(textures)} textures fit a smaller format, "
+          f"{(current - advised) / 1024:.0f} of {current / 1024:.0f} KiB of VRAM to save")
+    for relpath, entry in smaller:
+        print(f"  {relpath}: {entry['format']}, {entry['import_bytes'] / 1024:.1f}"
+              f" -> {entry['format_bytes'] / 1024:.1f} KiB")
+    data = (json.dumps({'max_error': MAX_ERROR, 'textures': textures}, indent=2) + "\n").encode()
+    print(f"  {MANIFEST}" if writer.write(MANIFEST, data) else f"  {MANIFEST} (unchanged)")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Unity import settings for every generated texture.
+Parallax layers, character sheets, collider sprites and atlases get their
+.meta from the stage that knows their mesh, slicing, physics shape or
+packing. This stage writes the rest (portraits, props, UI, VFX, previews)
+and every resolution tier, so a fresh clone imports each texture as the
+game expects without a pass through the editor.
+
+Settings come from unity_meta.IMPORT_POLICY, with the format chosen by
+texture_formats where it applies. A tier is imported like its source with
+pixels-per-unit scaled to match: sheet tiers are sliced into the same
+frames and layer tiers keep the canvas-centre pivot.
+"""
+import glob
+import os
+
+from PIL import Image
+
+import atlas_packer
+import collider_shapes
+import layer_crop
+import sprite_sheets
+from texture_formats import applied_format
+from texture_tiers import tier_source
+from unity_meta import (PIXELS_PER_UNIT, existing_sprite_ids, guid_for, has_alpha, import_settings,
+                        texture_meta)
+
+TEXTURES = "Art/**/*.png"
+
+
+def owned_elsewhere(relpath):
+    """Whether another stage writes the .meta of relpath."""
+    return (layer_crop.is_layer(relpath) or sprite_sheets.is_sheet(relpath)
+            or relpath in collider_shapes.COLLIDERS
+            or (relpath.startswith(atlas_packer.ATLAS_DIR + "/") and '@' not in relpath))
+
+
+def texture_import_meta(root, relpath):
+    """.meta text for the generated texture at root/relpath."""
+    source, scale = tier_source(relpath)
+    with Image.open(os.path.join(root, relpath)) as img:
+        settings = import_settings(relpath, img.size)
+        settings['alpha'] = has_alpha(img)
+        settings['texture_format'] = applied_format(root, relpath)
+        if sprite_sheets.is_sheet(source):
+            name = os.path.splitext(os.path.basename(source))[0]
+            settings['sprites'] = sprite_sheets.frame_sprites(name, img)
+        elif layer_crop.is_layer(source):
+            settings['pivot'] = layer_crop.pivot(*layer_crop.read_crop(img))
+    return texture_meta(guid_for(root, relpath), relpath, ids=existing_sprite_ids(root, relpath),
+                        pixels_per_unit=PIXELS_PER_UNIT * scale, **settings)
+
+
+def build_metas(root, writer, changed=None):
+    """Write the .meta of every (changed) generated texture under root that no other stage covers."""
+    found = (os.path.relpath(path, root).replace(os.sep, '/')
+             for path in glob.glob(os.path.join(root, TEXTURES), recursive=True))
+    textures = sorted(relpath for relpath in found if not owned_elsewhere(relpath)
+                      and (changed is None or relpath in changed))
+    written = sum(writer.write(relpath + ".meta", texture_import_meta(root, relpath).encode())
+                  for relpath in textures)
+    if textures:
+        print(f"Import settings: {written} of {len(textures)} .meta files updated")
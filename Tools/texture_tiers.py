@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Resolution tiers of every generated texture.
+Beside each name.png the build keeps name@0.5x.png and name@2x.png, and
+Art/texture_tiers.json lists them so a platform build step can swap in the
+tier it ships (low-spec builds take 0.5x, a quarter of the memory, and set
+pixels-per-unit to half so world sizes stay put).
+
+Tiers in RENDERED are drawn natively: build_assets runs each generator
+again inside raster.render_scale and writes the tier beside its source, and
+atlas_packer packs atlas tiers from their members' tiers. Only the rest are
+resampled here, on premultiplied alpha so transparent pixels never bleed
+their colour into the edges of the art. Halving is a 2x2 box average done
+as one numpy reshape; doubling (for a texture with no native tier) is
+Lanczos per channel. PIXEL_ART textures are resampled nearest-neighbour
+both ways instead, which keeps their pixels hard-edged. Layer crops (see
+layer_crop) and sheet cells (see sprite_sheets) are scaled with the image.
+A tier is only recomputed when the digest of its source changes, and is
+encoded with the build's --compression.
+"""
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+
+from PIL import Image
+import numpy as np
+
+from asset_writer import encode_png, encoder_pool
+from layer_crop import read_crop
+from sprite_sheets import SHEETS, read_frames
+from unity_meta import has_alpha
+
+MANIFEST = "Art/texture_tiers.json"
+TEXTURES = "Art/**/*.png"
+TIERS = (0.5, 2)
+# Tiers the build renders natively rather than resampling (see module docstring).
+RENDERED = (2,)
+PIXEL_ART = [SHEETS]
+# Bumped when tiers are made differently, so the manifest's tiers are remade.
+VERSION = 2
+
+
+def tier_path(relpath, scale):
+    return f"{os.path.splitext(relpath)[0]}@{scale:g}x.png"
+
+
+def tier_source(relpath):
+    """(source relpath, scale) of a tier path; (relpath, 1) for anything else."""
+    match = re.fullmatch(r'(.*)@([0-9.]+)x\.png', relpath)
+    if match is None:
+        return relpath, 1
+    return match.group(1) + ".png", float(match.group(2))
+
+
+def is_pixel_art(relpath):
+    """Whether relpath (or the source of a tier) is resampled nearest-neighbour."""
+    source, _ = tier_source(relpath)
+    return any(fnmatch.fnmatchcase(source, pattern) for pattern in PIXEL_ART)
+
+
+def rendered(relpath, scale):
+    """Whether the build renders the scale tier of relpath natively."""
+    return scale in RENDERED and relpath.endswith('.png') and not is_pixel_art(relpath)
+
+
+def _premultiplied(img):
+    """Float pixels with colour premultiplied by alpha; RGB alone for an opaque image."""
+    if not has_alpha(img):
+        return np.asarray(img.convert('RGB'), dtype=np.float32) / 255
+    rgba = np.asarray(img.convert('RGBA'), dtype=np.float32) / 255
+    rgba[..., :3] *= rgba[..., 3:]
+    return rgba
+
+
+def _to_image(pixels):
+    """Image of _premultiplied-style pixels, which are overwritten."""
+    if pixels.shape[-1] == 4:
+        alpha = pixels[..., 3:]
+        rgb = pixels[..., :3]
+        np.divide(rgb, alpha, out=rgb, where=alpha > 0)
+        rgb *= alpha > 0
+    np.clip(pixels, 0, 1, out=pixels)
+    pixels *= 255
+    np.round(pixels, out=pixels)
+    return Image.fromarray(pixels.astype(np.uint8), 'RGBA' if pixels.shape[-1] == 4 else 'RGB')
+
+
+def halve(img):
+    """Alpha-correct 2x2 box downsample; odd edges are extended by one pixel."""
+    pixels = _premultiplied(img)
+    h, w, bands = pixels.shape
+    pixels = np.pad(pixels, ((0, h % 2), (0, w % 2), (0, 0)), mode='edge')
+    return _to_image(pixels.reshape(pixels.shape[0] // 2, 2, pixels.shape[1] // 2, 2, bands)
+                     .mean(axis=(1, 3)))
+
+
+def double(img):
+    """Alpha-correct Lanczos upsample to twice the size."""
+    pixels = _premultiplied(img)
+    size = (img.width * 2, img.height * 2)
+    channels = [np.asarray(Image.fromarray(np.ascontiguousarray(pixels[..., c]), 'F')
+                           .resize(size, Image.LANCZOS))
+                for c in range(pixels.shape[-1])]
+    return _to_image(np.stack(channels, axis=-1))
+
+
+def nearest(img, scale):
+    """Nearest-neighbour resample to scale times the size, for pixel art."""
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    return img.convert('RGBA').resize(size, Image.NEAREST)
+
+
+def scaled(path, scale, compression='release', pixel_art=False):
+    """PNG bytes of the image at path resampled to scale (one of TIERS).
+
+    Any layer crop or sheet cell size recorded in the image is scaled with it.
+    """
+    with Image.open(path) as img:
+        img.load()
+    if pixel_art:
+        out = nearest(img, scale)
+    else:
+        out = halve(img) if scale == 0.5 else double(img)
+    text = None
+    sheet = read_frames(img)
+    if sheet is not None:
+        (width, height), frames = sheet
+        text = {
+            'Cell': f"{round(width * scale)}x{round(height * scale)}",
+            'Frames': ",".join(map(str, frames)),
+        }
+    elif 'Canvas' in getattr(img, 'text', {}):
+        (width, height), box = read_crop(img)
+        text = {
+            'Canvas': f"{round(width * scale)}x{round(height * scale)}",
+            'Crop': ",".join(str(round(v * scale)) for v in box),
+        }
+    return encode_png(out, text=text, compression=compression)
+
+
+def build_tiers(root, writer, changed=None):
+    """Write every texture's tiers under root, and the manifest listing them.
+
+    Tiers the build rendered natively are listed, not resampled. With
+    `changed`, textures outside it keep their manifest entry unread.
+    """
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            manifest = json.load(f)
+        previous = manifest['textures'] if manifest.get('version') == VERSION else {}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    textures = {}
+    pending = []
+    pool = encoder_pool()
+    for path in sorted(glob.glob(os.path.join(root, TEXTURES), recursive=True)):
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        if '@' in os.path.basename(relpath):
+            continue
+        if changed is not None and relpath not in changed and relpath in previous:
+            textures[relpath] = previous[relpath]
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        entry = previous.get(relpath)
+        if (entry is None or entry['source'] != digest
+                or not all(os.path.exists(os.path.join(root, p)) for p in entry['tiers'].values())):
+            with Image.open(path) as img:
+                entry = {'source': digest, 'size': list(img.size), 'tiers': {}}
+            for scale in TIERS:
+                tier = tier_path(relpath, scale)
+                if not (rendered(relpath, scale) and os.path.exists(os.path.join(root, tier))):
+                    pending.append((tier, pool.submit(scaled, path, scale, writer.compression,
+                                                   is_pixel_art(relpath))))
+                entry['tiers'][f"{scale:g}x"] = tier
+        textures[relpath] = entry
+    for tier, future in pending:
+        writer.write(tier, future.result())
+
+    if not textures:
+        return
+    print(f"Texture tiers: {len(pending)} tiers of {len(textures)} textures resampled")
+    data = (json.dumps({'version': VERSION, 'tiers': [f"{s:g}x" for s in sorted((1,) + TIERS)],
+                       'textures': textures},
+                       indent=2) + "\n").encode()
+    print(f"  {MANIFEST}" if writer.write(MANIFEST, data) else f"  {MANIFEST} (unchanged)")
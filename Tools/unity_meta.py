@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Unity .meta files for generated textures.
+GUIDs already on disk are kept (scenes and prefabs reference them); new
+files get a GUID derived from their project path so every machine produces
+the same one. Sprite IDs on disk are kept the same way, and new sprites
+get IDs derived from their name.
+
+Filter mode, compression, mipmaps and the import size cap come from
+IMPORT_POLICY by asset class, so every stage that writes a .meta imports
+the same kind of texture the same way.
+"""
+import fnmatch
+import hashlib
+import os
+import re
+
+ASSET_PREFIX = "Assets/_Project"
+
+ALIGNMENT = {'center': 0, 'bottom': 7, 'custom': 9}
+FILTER_MODE = {'point': 0, 'bilinear': 1, 'trilinear': 2}
+COMPRESSION = {'none': 0, 'normal': 1, 'high': 2, 'low': 3}
+PLATFORMS = ['DefaultTexturePlatform', 'Standalone', 'WebGL']
+PIXELS_PER_UNIT = 100
+
+# (relpath pattern, texture_meta settings); the first match wins and the
+# patterns also match resolution tiers. Pixel-art frames stay point-filtered
+# and uncompressed, UI and portraits are seen at 1:1 so they get high-quality
+# compression and no mipmaps, world art that the camera zooms keeps mipmaps,
+# and the composite previews are only for reference.
+IMPORT_POLICY = [
+    ("Art/Sprites/Characters/*_spritesheet*.png", {'filter_mode': 'point', 'compression': 'none'}),
+    ("Art/Sprites/Characters/*_portrait*.png", {'compression': 'high'}),
+    ("Art/UI/*.png", {'compression': 'high'}),
+    ("Art/Backgrounds/*/preview_composite*.png", {'compression': 'low', 'max_size': 1024}),
+    ("Art/Backgrounds/*.png", {'mipmaps': True}),
+    ("Art/Sprites/Props/*.png", {'mipmaps': True}),
+    ("Art/VFX/*.png", {'mipmaps': True}),
+    ("*", {}),
+]
+MIN_SIZE, MAX_SIZE = 32, 2048
+
+
+def _digest(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def guid_for(root, relpath):
+    """Existing GUID of root/relpath.meta, or one derived from the asset path."""
+    try:
+        with open(os.path.join(root, relpath + '.meta')) as f:
+            match = re.search(r'^guid: ([0-9a-f]{32})$', f.read(), re.M)
+        if match:
+            return match.group(1)
+    except OSError:
+        pass
+    return _digest(f"{ASSET_PREFIX}/{relpath}")
+
+
+def import_settings(relpath, size):
+    """texture_meta settings for the texture at relpath, by IMPORT_POLICY.
+
+    The size cap is the texture's larger side rounded up to a power of two,
+    so nothing is downscaled on import unless the policy caps it lower.
+    """
+    settings = next(dict(settings) for pattern, settings in IMPORT_POLICY
+                    if fnmatch.fnmatchcase(relpath, pattern))
+    fit = max(MIN_SIZE, 1 << (max(size) - 1).bit_length())
+    settings['max_size'] = min(fit, settings.get('max_size', MAX_SIZE))
+    return settings
+
+
+def has_alpha(img):
+    """Whether a loaded image carries any transparency information."""
+    return 'A' in img.getbands() or 'transparency' in img.info
+
+
+def set_alpha_usage(text, alpha):
+    """Existing .meta text with alpha usage on or off; opaque also drops alphaIsTransparency."""
+    text = re.sub(r'^(  alphaUsage: )\d+$', rf'\g<1>{int(alpha)}', text, flags=re.M)
+    if not alpha:
+        text = re.sub(r'^(  alphaIsTransparency: )\d+$', r'\g<1>0', text, flags=re.M)
+    return text
+
+
+def existing_sprite_ids(root, relpath):
+    """{sprite name: (spriteID, internalID)} of the sprites in root/relpath.meta.
+
+    Clips and prefabs reference sprites by internalID, so like the GUID these
+    are kept; only sprites that are new get IDs from sprite_ids.
+    """
+    try:
+        with open(os.path.join(root, relpath + '.meta')) as f:
+            text = f.read()
+    except OSError:
+        return {}
+    found = re.finditer(r'^    - serializedVersion: 2\n      name: (\S+)\n(?:      .*\n)*?'
+                        r'      spriteID: (\w*)\n      internalID: (-?\d+)$', text, re.M)
+    return {match.group(1): (match.group(2), int(match.group(3))) for match in found}
+
+
+def sprite_ids(relpath, name):
+    """(spriteID, internalID) for a sprite inside a Multiple-mode texture."""
+    digest = _digest(f"{ASSET_PREFIX}/{relpath}#{name}")
+    internal = int(digest[:16], 16)
+    if internal >= 1 << 63:
+        internal -= 1 << 64
+    return digest, internal
+
+
+def _paths(paths, indent):
+    """YAML list of polygon paths, each a list of (x, y) points."""
+    if not paths:
+        return " []\n"
+    pad = " " * indent
+    text = "\n"
+    for path in paths:
+        for i, (x, y) in enumerate(path):
+            text += f"{pad}{'- - ' if i == 0 else '  - '}{{x: {x:g}, y: {y:g}}}\n"
+    return text
+
+
+class SpriteRect:
+    """A named sub-sprite; rect is (x, y, w, h) with Unity's bottom-left origin.
+
+    `outline` is an optional list of polygon paths in pixels relative to the
+    rect centre, used by Unity as the sprite mesh; `physics_shape` is the
+    same for the collider.
+    """
+
+    def __init__(self, name, rect, pivot=(0.5, 0.5), alignment='custom', outline=None,
+                 physics_shape=None):
+        self.name = name
+        self.rect = rect
+        self.pivot = pivot
+        self.alignment = alignment
+        self.outline = outline
+        self.physics_shape = physics_shape
+
+
+def texture_meta(guid, relpath, sprites=None, pivot=(0.5, 0.5), filter_mode='bilinear',
+                 max_size=MAX_SIZE, compression='normal', mipmaps=False, outline=None,
+                 physics_shape=None, alpha=True, pixels_per_unit=PIXELS_PER_UNIT,
+                 texture_format=None, ids=None):
+    """Text of a TextureImporter .meta for a Sprite texture.
+
+    With `sprites` the texture is imported in Multiple mode with those rects;
+    otherwise as a Single sprite with `pivot`, an optional custom mesh
+    `outline` and an optional collider `physics_shape`, both given as polygon
+    paths relative to the texture centre (see SpriteRect). Textures without
+    `alpha` import with no alpha channel, so they get opaque formats.
+    Resolution tiers scale `pixels_per_unit` with the image so world sizes
+    stay put. `texture_format` (a TextureImporterFormat number) overrides
+    the format Unity would pick on every platform. `ids` maps sprite names
+    to the (spriteID, internalID) they already have (see existing_sprite_ids).
+    """
+    mode = 2 if sprites else 1
+    ids = {sprite.name: (ids or {}).get(sprite.name) or sprite_ids(relpath, sprite.name)
+           for sprite in sprites or []}
+    alignment = 0 if tuple(pivot) == (0.5, 0.5) else 9
+    text = f"""fileFormatVersion: 2
+guid: {guid}
+TextureImporter:
+  internalIDToNameTable: []
+  externalObjects: {{}}
+  serializedVersion: 13
+  mipmaps:
+    mipMapMode: 0
+    enableMipMap: {int(mipmaps)}
+    sRGBTexture: 1
+    linearTexture: 0
+    fadeOut: 0
+    borderMipMap: 0
+    mipMapsPreserveCoverage: 0
+    alphaTestReferenceValue: 0.5
+    mipMapFadeDistanceStart: 1
+    mipMapFadeDistanceEnd: 3
+  bumpmap:
+    convertToNormalMap: 0
+    externalNormalMap: 0
+    heightScale: 0.25
+    normalMapFilter: 0
+    flipGreenChannel: 0
+  isReadable: 0
+  streamingMipmaps: 0
+  streamingMipmapsPriority: 0
+  vTOnly: 0
+  ignoreMipmapLimit: 0
+  grayScaleToAlpha: 0
+  generateCubemap: 6
+  cubemapConvolution: 0
+  seamlessCubemap: 0
+  textureFormat: 1
+  maxTextureSize: {max_size}
+  textureSettings:
+    serializedVersion: 2
+    filterMode: {FILTER_MODE[filter_mode]}
+    aniso: 1
+    mipBias: 0
+    wrapU: 1
+    wrapV: 1
+    wrapW: 1
+  nPOTScale: 0
+  lightmap: 0
+  compressionQuality: 50
+  spriteMode: {mode}
+  spriteExtrude: 1
+  spriteMeshType: 1
+  alignment: {alignment}
+  spritePivot: {{x: {pivot[0]:g}, y: {pivot[1]:g}}}
+  spritePixelsToUnits: {pixels_per_unit:g}
+  spriteBorder: {{x: 0, y: 0, z: 0, w: 0}}
+  spriteGenerateFallbackPhysicsShape: 1
+  alphaUsage: {int(alpha)}
+  alphaIsTransparency: {int(alpha)}
+  spriteTessellationDetail: -1
+  textureType: 8
+  textureShape: 1
+  singleChannelComponent: 0
+  flipbookRows: 1
+  flipbookColumns: 1
+  maxTextureSizeSet: 0
+  compressionQualitySet: 0
+  textureFormatSet: 0
+  ignorePngGamma: 0
+  applyGammaDecoding: 0
+  swizzle: 50462976
+  cookieLightType: 0
+  platformSettings:
+"""
+    for platform in PLATFORMS:
+        text += f"""  - serializedVersion: 4
+    buildTarget: {platform}
+    maxTextureSize: {max_size}
+    resizeAlgorithm: 0
+    textureFormat: {-1 if texture_format is None else texture_format}
+    textureCompression: {COMPRESSION[compression]}
+    compressionQuality: 50
+    crunchedCompression: 0
+    allowsAlphaSplitting: 0
+    overridden: {int(texture_format is not None and platform != PLATFORMS[0])}
+    ignorePlatformSupport: 0
+    androidETC2FallbackOverride: 0
+    forceMaximumCompressionQuality_BC6H_BC7: 0
+"""
+    text += "  spriteSheet:\n    serializedVersion: 2\n"
+    if sprites:
+        text += "    sprites:\n"
+        for sprite in sprites:
+            sprite_id, internal_id = ids[sprite.name]
+            x, y, w, h = sprite.rect
+            text += f"""    - serializedVersion: 2
+      name: {sprite.name}
+      rect:
+        serializedVersion: 2
+        x: {x}
+        y: {y}
+        width: {w}
+        height: {h}
+      alignment: {ALIGNMENT[sprite.alignment]}
+      pivot: {{x: {sprite.pivot[0]:.6g}, y: {sprite.pivot[1]:.6g}}}
+      border: {{x: 0, y: 0, z: 0, w: 0}}
+      customData:
+      outline:{_paths(sprite.outline, 6)}      physicsShape:{_paths(sprite.physics_shape, 6)}      tessellationDetail: -1
+      bones: []
+      spriteID: {sprite_id}
+      internalID: {internal_id}
+      vertices: []
+      indices:
+      edges: []
+      weights: []
+"""
+    else:
+        text += "    sprites: []\n"
+    text += f"    outline:{_paths(None if sprites else outline, 4)}"
+    text += f"    customData:\n    physicsShape:{_paths(None if sprites else physics_shape, 4)}"
+    text += """    bones: []
+    spriteID:
+    internalID: 0
+    vertices: []
+    indices:
+    edges: []
+    weights: []
+    secondaryTextures: []
+    spriteCustomMetadata:
+      entries: []
+"""
+    if sprites:
+        text += "    nameFileIdTable:\n"
+        for sprite in sprites:
+            text += f"      {sprite.name}: {ids[sprite.name][1]}\n"
+    else:
+        text += "    nameFileIdTable: {}\n"
+    text += """  mipmapLimitGroupName:
+  pSDRemoveMatte: 0
+  userData:
+  assetBundleName:
+  assetBundleVariant:
+"""
+    return text
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+--watch mode for build_assets.py.
+Polls generate_assets.py and Tools/*.py. When one is saved, the generator
+modules are reloaded in this (already warm) process, the edited functions
+are reported, and only assets whose cache key changed are rendered again.
+"""
+import glob
+import importlib
+import os
+import sys
+import time
+import traceback
+
+import call_graph
+from asset_registry import REPO_ROOT, SOURCES, TOOLS_DIR, load_registry
+
+# The build machinery itself cannot be swapped out from under a running loop,
+# and neither can the helpers it or the generators bind with `from X import`,
+# whose old functions would be left in place by a reload.
+INFRASTRUCTURE = {'asset_registry', 'asset_writer', 'atlas_packer', 'build_assets', 'call_graph',
+                  'collider_shapes', 'color_grade', 'display_list', 'layer_crop',
+                  'layer_occlusion', 'raster', 'render_cache', 'sprite_mesh', 'sprite_sheets',
+                  'svg_export', 'texture_alpha', 'texture_formats', 'texture_import',
+                  'texture_tiers', 'unity_meta', 'watch_assets'}
+
+
+def watched_files():
+    return [os.path.join(REPO_ROOT, 'generate_assets.py')] + sorted(
+        glob.glob(os.path.join(TOOLS_DIR, '*.py')))
+
+
+def snapshot():
+    mtimes = {}
+    for path in watched_files():
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+
+def reload_modules(names):
+    """Reload the changed helper modules, then every generator module.
+
+    Generators are always reloaded so that `from helper import fn` bindings
+    pick up the new helper. Returns {module name: index before reload}.
+    """
+    before = {}
+    order = [n for n in names if n not in SOURCES] + list(SOURCES)
+    for name in order:
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        before[name] = call_graph.index(module)
+        call_graph.forget(name)
+        importlib.reload(module)
+    return before
+
+
+def watch(args, reg, assets):
+    import build_assets
+
+    keys = build_assets.build(reg, assets, args)
+    mtimes = snapshot()
+    print(f"\nWatching {len(mtimes)} files for changes (Ctrl+C to stop)...")
+
+    try:
+        while True:
+            time.sleep(args.poll)
+            current = snapshot()
+            changed = [path for path, mtime in current.items() if mtimes.get(path) != mtime]
+            mtimes = current
+            if not changed:
+                continue
+
+            start = time.perf_counter()
+            names = [os.path.splitext(os.path.basename(path))[0] for path in changed]
+            stale_infra = [n for n in names if n in INFRASTRUCTURE]
+            if stale_infra:
+                print(f"\n{', '.join(stale_infra)} changed; restart --watch to pick it up.")
+            names = [n for n in names if n not in INFRASTRUCTURE and n in sys.modules]
+            if not names:
+                continue
+
+            try:
+                before = reload_modules(names)
+                reg = load_registry()
+            except Exception:
+                traceback.print_exc()
+                print("Fix the error and save again.")
+                continue
+
+            print()
+            for name in names:
+                edited = call_graph.changed_defs(before[name], call_graph.index(sys.modules[name]))
+                print(f"{name}.py: {', '.join(edited) if edited else 'no code changes'}")
+
+            assets = reg.select(args.only, args.tag, args.source)
+            jobs = build_assets.plan(reg, assets)
+            new_keys = {asset.id: build_assets.cache_key(asset, jobs[asset.id], args.compression,
+                                                      args.scale)
+                        for asset in assets if asset.id in jobs}
+            stale = [asset for asset in assets
+                     if asset.id in new_keys and keys.get(asset.id) != new_keys[asset.id]]
+            if not stale:
+                print("No outputs affected.")
+                continue
+
+            try:
+                keys.update(build_assets.build(reg, stale, args, workers=1, report_skips=False,
+                                                 incremental=True))
+            except Exception:
+                traceback.print_exc()
+                print("Fix the error and save again.")
+                continue
+            print(f"Rebuilt {len(stale)} asset(s) in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
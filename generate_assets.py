@@ -5,28 +5,15 @@ Generates all sprites, backgrounds, UI, and audio using Python/PIL/numpy.
 All art is original creative work generated programmatically.
 """
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
 import numpy as np
-import wave, struct, os, math, random, colorsys
+import os, sys, math, random
 
-ROOT = "/Users/krishnas/Desktop/game/TejimolaBlossom/Assets/_Project"
-ART  = f"{ROOT}/Art"
-AUD  = f"{ROOT}/Audio"
-
-# ─────────────────────────────────────────────────────────────────────────────
-# DIRECTORY SETUP
-# ─────────────────────────────────────────────────────────────────────────────
-
-def mkdirs():
-    for d in [
-        f"{ART}/Backgrounds/Act1", f"{ART}/Backgrounds/Act2",
-        f"{ART}/Backgrounds/Act3", f"{ART}/Backgrounds/Act4",
-        f"{ART}/Sprites/Characters", f"{ART}/Sprites/Props",
-        f"{ART}/UI/Menu", f"{ART}/UI/DialogueBox", f"{ART}/UI/HUD",
-        f"{ART}/VFX",
-        f"{AUD}/Music", f"{AUD}/SFX",
-    ]:
-        os.makedirs(d, exist_ok=True)
+TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Tools")
+sys.path.insert(0, TOOLS)
+import raster
+from raster import linear_gradient
+from display_list import recorded
+from color_grade import AlphaScale, ChannelAffine, Clamp, Grade
 
 # ─────────────────────────────────────────────────────────────────────────────
 # COLOR PALETTE
@@ -95,7 +82,7 @@ C = {
     'T':         (0,   0,   0,   0),   # transparent
 }
 
-def px(img, x, y, col): img.putpixel((x, y), col)
+def px(draw, x, y, col): draw.point((x, y), fill=col)
 def rect(draw, x1,y1,x2,y2, fill): draw.rectangle([x1,y1,x2,y2], fill=fill)
 def ell(draw, x1,y1,x2,y2, fill): draw.ellipse([x1,y1,x2,y2], fill=fill)
 def tri(draw, pts, fill): draw.polygon(pts, fill=fill)
@@ -110,11 +97,21 @@ def draw_outline_ellipse(draw, x1,y1,x2,y2, fill, outline):
 def draw_outline_rect(draw, x1,y1,x2,y2, fill, outline):
     draw.rectangle([x1,y1,x2,y2], fill=fill, outline=outline, width=1)
 
+def draw_frames(img, draw_frame, phases, **kwargs):
+    """One 64 px frame per walk phase; each distinct pose is drawn once and
+    replayed wherever it repeats (see display_list)."""
+    d = raster.Draw(img)
+    offsets = {}
+    for i, phase in enumerate(phases):
+        offsets.setdefault(phase, []).append((i*64, 0))
+    for phase, at in offsets.items():
+        recorded(draw_frame, walk_phase=phase, **kwargs).replay_many(d, at)
+
 # ── Tejimola ─────────────────────────────────────────────────────────────────
 
 def draw_tejimola_frame(img, ox, oy, walk_phase=0, crouching=False, hiding=False):
     """Draw Tejimola at offset (ox, oy). Returns drawn Image."""
-    d = ImageDraw.Draw(img)
+    d = raster.Draw(img)
     O = C['outline']
 
     leg_offset = int(math.sin(walk_phase * math.pi) * 4) if walk_phase else 0
@@ -184,27 +181,25 @@ def draw_tejimola_frame(img, ox, oy, walk_phase=0, crouching=False, hiding=False
         ell(d, ox+20, body_y+90+leg_offset, ox+32, body_y+95+leg_offset, C['skin_d'])
         ell(d, ox+32, body_y+90-leg_offset, ox+44, body_y+95-leg_offset, C['skin_d'])
 
-def make_tejimola_spritesheet(spirit=False):
+SPIRIT_GRADE = Grade(ChannelAffine(scale=(0.6, 0.6, 0.5), offset=(100, 120, 180)), Clamp(),
+                     AlphaScale(0.65))
+
+def make_tejimola_spritesheet():
     W, H = 256, 96
-    img = Image.new('RGBA', (W, H), (0,0,0,0))
-    phases = [0, 0.4, 0, 0.8]  # idle, walk1, idle, walk2
-    for i, phase in enumerate(phases):
-        draw_tejimola_frame(img, i*64, 0, walk_phase=phase)
-    if spirit:
-        # Tint blue-white and reduce alpha
-        arr = np.array(img)
-        mask = arr[:,:,3] > 0
-        arr[mask, 0] = np.clip(arr[mask, 0].astype(int) * 0.6 + 100, 0, 255).astype(np.uint8)
-        arr[mask, 1] = np.clip(arr[mask, 1].astype(int) * 0.6 + 120, 0, 255).astype(np.uint8)
-        arr[mask, 2] = np.clip(arr[mask, 2].astype(int) * 0.5 + 180, 0, 255).astype(np.uint8)
-        arr[mask, 3] = (arr[mask, 3] * 0.65).astype(np.uint8)
-        img = Image.fromarray(arr)
+    img = raster.new('RGBA', (W, H), (0,0,0,0))
+    draw_frames(img, draw_tejimola_frame, [0, 0.4, 0, 0.8])  # idle, walk1, idle, walk2
     return img
 
+def make_tejimola_spritesheets():
+    """Child sheet plus the spirit variant graded from it (frames drawn once)."""
+    child = make_tejimola_spritesheet()
+    # Tint blue-white and reduce alpha
+    return {'child': child, 'spirit': SPIRIT_GRADE.apply(child)}
+
 # ── Dom ───────────────────────────────────────────────────────────────────────
 
 def draw_dom_frame(img, ox, oy, walk_phase=0):
-    d = ImageDraw.Draw(img)
+    d = raster.Draw(img)
     O = C['outline']
     leg_offset = int(math.sin(walk_phase * math.pi) * 4) if walk_phase else 0
 
@@ -257,15 +252,14 @@ def draw_dom_frame(img, ox, oy, walk_phase=0):
 
 def make_dom_spritesheet():
     W, H = 256, 96
-    img = Image.new('RGBA', (W, H), (0,0,0,0))
-    for i, phase in enumerate([0, 0.4, 0, 0.8]):
-        draw_dom_frame(img, i*64, 0, walk_phase=phase)
+    img = raster.new('RGBA', (W, H), (0,0,0,0))
+    draw_frames(img, draw_dom_frame, [0, 0.4, 0, 0.8])
     return img
 
 # ── Ranima ───────────────────────────────────────────────────────────────────
 
 def draw_ranima_frame(img, ox, oy, walk_phase=0, corrupted=False):
-    d = ImageDraw.Draw(img)
+    d = raster.Draw(img)
     O = C['outline']
     leg_offset = int(math.sin(walk_phase * math.pi) * 4) if walk_phase else 0
 
@@ -316,8 +310,7 @@ def draw_ranima_frame(img, ox, oy, walk_phase=0, corrupted=False):
             for angle in range(0, 360, 45):
                 ax = ox + 32 + int(math.cos(math.radians(angle)) * (20+radius))
                 ay = oy + 44 + int(math.sin(math.radians(angle)) * (20+radius))
-                if 0 <= ax < img.width and 0 <= ay < img.height:
-                    img.putpixel((ax, ay), glow_c)
+                d.point((ax, ay), fill=glow_c)
 
     # ── Legs ──
     rect(d, ox+21, oy+86, ox+30, oy+93+leg_offset, skin_c)
@@ -325,16 +318,15 @@ def draw_ranima_frame(img, ox, oy, walk_phase=0, corrupted=False):
 
 def make_ranima_spritesheet(corrupted=False):
     W, H = 256, 96
-    img = Image.new('RGBA', (W, H), (0,0,0,0))
-    for i, phase in enumerate([0, 0.4, 0, 0.8]):
-        draw_ranima_frame(img, i*64, 0, walk_phase=phase, corrupted=corrupted)
+    img = raster.new('RGBA', (W, H), (0,0,0,0))
+    draw_frames(img, draw_ranima_frame, [0, 0.4, 0, 0.8], corrupted=corrupted)
     return img
 
 # ── Father ───────────────────────────────────────────────────────────────────
 
 def make_father_portrait():
-    img = Image.new('RGBA', (128, 128), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0,0,0,0))
+    d = raster.Draw(img)
     # background oval
     ell(d, 10, 10, 118, 118, (200, 170, 120, 60))
     # hair
@@ -362,8 +354,8 @@ def make_father_portrait():
 # ── Portraits ─────────────────────────────────────────────────────────────────
 
 def make_portrait(char='tejimola'):
-    img = Image.new('RGBA', (128, 128), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0,0,0,0))
+    d = raster.Draw(img)
 
     bgs = {
         'tejimola': (240, 210, 130, 80),
@@ -413,7 +405,7 @@ def make_portrait(char='tejimola'):
             for ang in range(0,360,30):
                 ax = 64 + int(math.cos(math.radians(ang))*55)
                 ay = 64 + int(math.sin(math.radians(ang))*55)
-                if 0<=ax<128 and 0<=ay<128: img.putpixel((ax,ay), C['boss_glow'])
+                d.point((ax,ay), fill=C['boss_glow'])
 
     return img
 
@@ -422,8 +414,8 @@ def make_portrait(char='tejimola'):
 # ─────────────────────────────────────────────────────────────────────────────
 
 def make_nahor_flower():
-    img = Image.new('RGBA', (128, 128), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0,0,0,0))
+    d = raster.Draw(img)
     # trunk
     tri(d, [(56,128),(72,128),(68,60),(60,60)], C['wood_d'])
     # branches
@@ -443,8 +435,8 @@ def make_nahor_flower():
     return img
 
 def make_dheki():
-    img = Image.new('RGBA', (128, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Base/trough
     rect(d, 10, 40, 118, 64, C['wood_d'])
     rect(d, 12, 42, 116, 62, C['wood'])
@@ -464,8 +456,8 @@ def make_dheki():
     return img
 
 def make_hairpin():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Pin shaft
     d.line([10, 54, 54, 10], fill=C['gold'], width=3)
     d.line([10, 54, 54, 10], fill=C['gold_d'], width=1)
@@ -481,8 +473,8 @@ def make_hairpin():
     return img
 
 def make_pot():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Clay pot body
     ell(d, 8, 20, 56, 60, C['clay'])
     ell(d, 12, 24, 52, 56, C['clay_d'])
@@ -498,8 +490,8 @@ def make_pot():
 
 def make_gamosa():
     """Assamese traditional cloth — white with red border pattern."""
-    img = Image.new('RGBA', (96, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (96, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Main cloth
     rect(d, 4, 16, 92, 48, C['gamosa_w'])
     # Red borders
@@ -515,8 +507,8 @@ def make_gamosa():
     return img
 
 def make_spirit_orb():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Outer glow
     for r, alpha in [(32,40),(28,80),(24,140),(20,200)]:
         col = (160, 90, 240, alpha)
@@ -533,8 +525,8 @@ def make_spirit_orb():
     return img
 
 def make_spiked_barrel():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Barrel body
     ell(d, 8, 8, 56, 56, C['barrel_d'])
     ell(d, 10, 10, 54, 54, C['wood'])
@@ -554,8 +546,8 @@ def make_spiked_barrel():
     return img
 
 def make_dhol_drum():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Drum cylinder (horizontal)
     rect(d, 6, 18, 58, 46, C['wood'])
     # Drum ends
@@ -574,8 +566,8 @@ def make_dhol_drum():
     return img
 
 def make_gourd():
-    img = Image.new('RGBA', (64, 64), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (64, 64), (0,0,0,0))
+    d = raster.Draw(img)
     # Gourd lower body
     ell(d, 12, 28, 52, 60, C['leaf_l'])
     ell(d, 14, 30, 50, 58, C['leaf'])
@@ -592,8 +584,8 @@ def make_gourd():
     return img
 
 def make_footprint():
-    img = Image.new('RGBA', (32, 48), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (32, 48), (0,0,0,0))
+    d = raster.Draw(img)
     # Heel
     ell(d, 8, 30, 24, 44, (120,80,50,160))
     # Ball
@@ -605,20 +597,20 @@ def make_footprint():
     return img
 
 def make_spirit_pulse_ring():
-    img = Image.new('RGBA', (128, 128), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (128, 128), (0,0,0,0))
+    d = raster.Draw(img)
     for r, a in [(60,255),(54,200),(48,150),(42,100),(36,60)]:
         ell(d, 64-r, 64-r, 64+r, 64+r, (130,180,255,a))
     ell(d, 30, 30, 98, 98, (0,0,0,0))  # hollow center
     for ang in range(0, 360, 15):
         ex = 64 + int(math.cos(math.radians(ang))*58)
         ey = 64 + int(math.sin(math.radians(ang))*58)
-        img.putpixel((ex,ey), (200,230,255,255))
+        d.point((ex,ey), fill=(200,230,255,255))
     return img
 
 def make_vine_obstacle():
-    img = Image.new('RGBA', (32, 96), (0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA', (32, 96), (0,0,0,0))
+    d = raster.Draw(img)
     for y in range(0, 96, 6):
         xoff = int(math.sin(y/10)*4)
         rect(d, 12+xoff, y, 20+xoff, y+8, C['vine'])
@@ -632,15 +624,6 @@ def make_vine_obstacle():
 # BACKGROUNDS  (1920 × 1080 per layer)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def gradient(img, top_col, bot_col):
-    """Fill image with vertical gradient."""
-    arr = np.zeros((img.height, img.width, 4), dtype=np.uint8)
-    for y in range(img.height):
-        t = y / (img.height - 1)
-        for c in range(4):
-            arr[y, :, c] = int(top_col[c] + (bot_col[c] - top_col[c]) * t)
-    return Image.fromarray(arr)
-
 def draw_sun(draw, cx, cy, r, color):
     for radius, alpha in [(r+20, 40),(r+12, 80),(r+6, 140),(r, 255)]:
         c = (*color[:3], alpha)
@@ -681,25 +664,23 @@ def make_background_act1():
     W, H = 1920, 1080
 
     # Layer 4 – Sky (dawn gold gradient)
-    sky = gradient(Image.new('RGBA',(W,H)), (255,200,120,255), (255,160,60,255))
-    d = ImageDraw.Draw(sky)
+    sky = linear_gradient((W,H), [(255,200,120,255), (255,160,60,255)])
+    d = raster.Draw(sky)
     draw_sun(d, 300, 200, 60, (255,240,180,255))
     # Clouds
     for cx, cy in [(500,150),(900,100),(1400,180),(1700,130)]:
         for dx, dy, r in [(-30,0,40),(0,-15,50),(30,0,40),(60,5,35)]:
             d.ellipse([cx+dx-r, cy+dy-r, cx+dx+r, cy+dy+r], fill=(255,240,220,180))
-    sky.save(f"{ART}/Backgrounds/Act1/layer4_sky.png")
 
     # Layer 3 – Distant hills + village silhouette
-    bg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(bg)
+    bg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(bg)
     draw_mountains(d, W, H, 6, (180,140,90,200), seed=1)
     draw_buildings(d, W, 880, 8, (150,110,70,220), seed=2)
-    bg.save(f"{ART}/Backgrounds/Act1/layer3_background.png")
 
     # Layer 2 – Midground: trees and courtyard wall
-    mg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(mg)
+    mg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(mg)
     # Courtyard ground
     rect(d, 0, 900, W, H, (170, 130, 80, 255))
     draw_trees(d, W, 900, 14, (100,65,30,255), (65,145,50,255), seed=3)
@@ -711,11 +692,10 @@ def make_background_act1():
     for fx, fy in [(860,660),(900,650),(950,660),(880,690),(930,685)]:
         d.ellipse([fx-8,fy-8,fx+8,fy+8], fill=(248,242,218,255))
         d.ellipse([fx-4,fy-4,fx+4,fy+4], fill=(255,195,75,255))
-    mg.save(f"{ART}/Backgrounds/Act1/layer2_midground.png")
 
     # Layer 1 – Foreground: flowers, path
-    fg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(fg)
+    fg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(fg)
     # Dirt path
     d.polygon([(760,1080),(1160,1080),(1100,900),(820,900)], fill=(150,110,70,180))
     # Foreground flowers
@@ -725,31 +705,31 @@ def make_background_act1():
         fc = rng.choice([(240,185,35,255),(200,80,80,255),(255,255,180,255)])
         d.ellipse([fx-6,fy-6,fx+6,fy+6], fill=fc)
         d.line([fx,fy,fx,fy+20], fill=(65,145,50,255), width=2)
-    fg.save(f"{ART}/Backgrounds/Act1/layer1_foreground.png")
+
+    return {'layer4_sky': sky, 'layer3_background': bg,
+            'layer2_midground': mg, 'layer1_foreground': fg}
 
 def make_background_act2():
     """Act 2 – Descent: dark, desaturated, oppressive."""
     W, H = 1920, 1080
 
     # Sky – dark stormy
-    sky = gradient(Image.new('RGBA',(W,H)), (50,55,70,255), (30,35,50,255))
-    d = ImageDraw.Draw(sky)
+    sky = linear_gradient((W,H), [(50,55,70,255), (30,35,50,255)])
+    d = raster.Draw(sky)
     # Clouds (heavy, dark)
     for cx, cy in [(300,120),(700,80),(1200,150),(1700,100)]:
         for dx, dy, r in [(-40,0,55),(0,-20,65),(40,0,55),(80,10,45)]:
             d.ellipse([cx+dx-r, cy+dy-r, cx+dx+r, cy+dy+r], fill=(40,42,55,200))
-    sky.save(f"{ART}/Backgrounds/Act2/layer4_sky.png")
 
     # Background – dark hills
-    bg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(bg)
+    bg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(bg)
     draw_mountains(d, W, H, 5, (60,55,70,200), seed=10)
     draw_buildings(d, W, 880, 6, (50,45,60,220), seed=11)
-    bg.save(f"{ART}/Backgrounds/Act2/layer3_background.png")
 
     # Midground – bare trees, dark house
-    mg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(mg)
+    mg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(mg)
     rect(d, 0, 880, W, H, (80, 70, 55, 255))
     draw_trees(d, W, 880, 10, (50,35,20,255), (40,55,35,255), seed=12)
     # Dark house
@@ -758,25 +738,26 @@ def make_background_act2():
     # Window (lit)
     d.rectangle([840,740,880,780], fill=(200,160,80,200))
     d.rectangle([1000,740,1040,780], fill=(200,160,80,200))
-    mg.save(f"{ART}/Backgrounds/Act2/layer2_midground.png")
 
     # Foreground
-    fg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(fg)
+    fg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(fg)
     # Dead leaves
     rng = random.Random(13)
     for _ in range(30):
         fx = rng.randint(0,W); fy = rng.randint(900,1060)
         d.ellipse([fx-4,fy-3,fx+4,fy+3], fill=(80,60,40,200))
-    fg.save(f"{ART}/Backgrounds/Act2/layer1_foreground.png")
+
+    return {'layer4_sky': sky, 'layer3_background': bg,
+            'layer2_midground': mg, 'layer1_foreground': fg}
 
 def make_background_act3():
     """Act 3 – Spirit World: twilight purple, mystical."""
     W, H = 1920, 1080
 
     # Sky – deep twilight
-    sky = gradient(Image.new('RGBA',(W,H)), (60,20,100,255), (20,10,60,255))
-    d = ImageDraw.Draw(sky)
+    sky = linear_gradient((W,H), [(60,20,100,255), (20,10,60,255)])
+    d = raster.Draw(sky)
     # Moon
     draw_sun(d, 1600, 150, 45, (220,220,255,255))
     d.ellipse([1620,120,1660,160], fill=(60,20,100,255))  # crescent shadow
@@ -786,22 +767,20 @@ def make_background_act3():
         sx = rng.randint(0,W); sy = rng.randint(0,400)
         sa = rng.randint(100,255)
         d.ellipse([sx-1,sy-1,sx+1,sy+1], fill=(220,220,255,sa))
-    sky.save(f"{ART}/Backgrounds/Act3/layer4_sky.png")
 
     # Background – ruined estate silhouettes
-    bg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(bg)
+    bg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(bg)
     draw_mountains(d, W, H, 4, (40,20,60,180), seed=20)
     # Ruined walls
     for bx, bh in [(200,180),(500,120),(800,200),(1400,160),(1700,140)]:
         d.rectangle([bx,H-bh,bx+60,H], fill=(50,25,70,220))
         # broken top
         d.polygon([(bx,H-bh),(bx+20,H-bh-20),(bx+40,H-bh),(bx+60,H-bh-10),(bx+60,H-bh)], fill=(50,25,70,220))
-    bg.save(f"{ART}/Backgrounds/Act3/layer3_background.png")
 
     # Midground – spirit glows, nahor tree (ethereal)
-    mg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(mg)
+    mg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(mg)
     rect(d, 0, 880, W, H, (40,30,55,255))
     # Glowing nahor tree
     for r, a in [(100,30),(80,60),(60,100),(40,160)]:
@@ -811,24 +790,25 @@ def make_background_act3():
     # Spirit wisps
     for wx, wy in [(400,800),(700,750),(1200,820),(1600,770)]:
         d.ellipse([wx-20,wy-20,wx+20,wy+20], fill=(150,180,255,80))
-    mg.save(f"{ART}/Backgrounds/Act3/layer2_midground.png")
 
     # Foreground
-    fg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(fg)
+    fg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(fg)
     rng = random.Random(21)
     for _ in range(20):
         fx = rng.randint(0,W); fy = rng.randint(920,1060)
         d.ellipse([fx-8,fy-8,fx+8,fy+8], fill=(100,80,140,150))
-    fg.save(f"{ART}/Backgrounds/Act3/layer1_foreground.png")
+
+    return {'layer4_sky': sky, 'layer3_background': bg,
+            'layer2_midground': mg, 'layer1_foreground': fg}
 
 def make_background_act4():
     """Act 4 – Boss Fight: surreal corruption, twisted reality."""
     W, H = 1920, 1080
 
     # Sky – blood red/dark magenta
-    sky = gradient(Image.new('RGBA',(W,H)), (100,0,70,255), (50,0,40,255))
-    d = ImageDraw.Draw(sky)
+    sky = linear_gradient((W,H), [(100,0,70,255), (50,0,40,255)])
+    d = raster.Draw(sky)
     # Corruption tendrils
     rng = random.Random(30)
     for _ in range(8):
@@ -838,11 +818,10 @@ def make_background_act4():
             y2 = y1 + rng.randint(10,30)
             d.line([x1,y1,x2,y2], fill=(150,0,120,100), width=2)
             x1,y1 = x2,y2
-    sky.save(f"{ART}/Backgrounds/Act4/layer4_sky.png")
 
     # Background – twisted household
-    bg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(bg)
+    bg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(bg)
     # Warped floor
     pts = [(0,H-200)]
     for x in range(0, W+100, 100):
@@ -854,20 +833,20 @@ def make_background_act4():
     for px_pos in [200,600,1000,1400,1800]:
         d.rectangle([px_pos-15, H-400, px_pos+15, H-200], fill=(80,0,60,255))
         d.ellipse([px_pos-25, H-410, px_pos+25, H-390], fill=(100,0,80,255))
-    bg.save(f"{ART}/Backgrounds/Act4/layer3_background.png")
 
-    mg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(mg)
+    mg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(mg)
     rect(d, 0, 880, W, H, (60, 0, 45, 255))
-    mg.save(f"{ART}/Backgrounds/Act4/layer2_midground.png")
 
-    fg = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(fg)
+    fg = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(fg)
     rng2 = random.Random(31)
     for _ in range(25):
         fx = rng2.randint(0,W); fy = rng2.randint(900,1060)
         d.ellipse([fx-5,fy-5,fx+5,fy+5], fill=(180,0,140,120))
-    fg.save(f"{ART}/Backgrounds/Act4/layer1_foreground.png")
+
+    return {'layer4_sky': sky, 'layer3_background': bg,
+            'layer2_midground': mg, 'layer1_foreground': fg}
 
 # ─────────────────────────────────────────────────────────────────────────────
 # UI ASSETS
@@ -875,8 +854,8 @@ def make_background_act4():
 
 def make_menu_background():
     W, H = 1920, 1080
-    img = gradient(Image.new('RGBA',(W,H)), (30,15,8,255), (12,6,3,255))
-    d = ImageDraw.Draw(img)
+    img = linear_gradient((W,H), [(30,15,8,255), (12,6,3,255)])
+    d = raster.Draw(img)
     # Nahor tree (large, right side)
     # Trunk
     for i in range(8):
@@ -907,12 +886,12 @@ def make_menu_background():
         col = (int(40+t*20), int(60+t*30), int(120+t*40), int(180+t*75))
         d.line([0,y,W,y], fill=col)
 
-    img.save(f"{ART}/UI/Menu/menu_background.png")
+    return img
 
-def make_button(label, filename, width=220, height=55,
+def make_button(label, width=220, height=55,
                 bg=(40,20,10,230), border=(180,140,50,255)):
-    img = Image.new('RGBA',(width,height),(0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA',(width,height),(0,0,0,0))
+    d = raster.Draw(img)
     # Rounded rectangle (simulated)
     r = 8
     d.rectangle([r,0,width-r,height], fill=bg)
@@ -924,12 +903,12 @@ def make_button(label, filename, width=220, height=55,
     d.rectangle([0,r,width,height-r], outline=border, width=2)
     # Highlight top
     d.line([r,1,width-r,1], fill=(*border[:3],120), width=1)
-    img.save(f"{ART}/UI/Menu/{filename}")
+    return img
 
 def make_dialogue_box():
     W, H = 1400, 220
-    img = Image.new('RGBA',(W,H),(0,0,0,0))
-    d = ImageDraw.Draw(img)
+    img = raster.new('RGBA',(W,H),(0,0,0,0))
+    d = raster.Draw(img)
     # Main panel
     d.rectangle([4,4,W-4,H-4], fill=(12,6,3,235))
     # Ornate border
@@ -945,14 +924,14 @@ def make_dialogue_box():
     # Nahor motif at corners
     for fx,fy in [(186,12),(186,H-28)]:
         d.ellipse([fx-6,fy,fx+6,fy+12], fill=(248,242,218,200))
-    img.save(f"{ART}/UI/DialogueBox/dialogue_box.png")
+    return img
 
-def make_hud_icon(filename, color, symbol='•'):
-    img = Image.new('RGBA',(32,32),(0,0,0,0))
-    d = ImageDraw.Draw(img)
+def make_hud_icon(color, symbol='•'):
+    img = raster.new('RGBA',(32,32),(0,0,0,0))
+    d = raster.Draw(img)
     d.ellipse([2,2,30,30], fill=color)
     d.ellipse([5,5,27,27], fill=(*color[:3], color[3]-50 if len(color)>3 and color[3]>50 else 50))
-    img.save(f"{ART}/UI/HUD/{filename}")
+    return img
 
 # ─────────────────────────────────────────────────────────────────────────────
 # AUDIO GENERATION
@@ -960,16 +939,6 @@ def make_hud_icon(filename, color, symbol='•'):
 
 SAMPLE_RATE = 44100
 
-def save_wav(filename, samples, rate=SAMPLE_RATE):
-    """Save numpy float array [-1,1] as 16-bit WAV."""
-    samples = np.clip(samples, -1.0, 1.0)
-    data = (samples * 32767).astype(np.int16)
-    with wave.open(filename, 'w') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(rate)
-        wf.writeframes(data.tobytes())
-
 def tone(freq, dur, rate=SAMPLE_RATE, vol=0.3, env='harp'):
     """Generate a single tone with envelope."""
     t = np.linspace(0, dur, int(rate*dur), False)
@@ -1037,7 +1006,7 @@ def make_act1_music():
     # Fade out last 2 seconds
     fade = min(SAMPLE_RATE*2, len(track))
     track[-fade:] *= np.linspace(1,0,fade)
-    save_wav(f"{AUD}/Music/act1_theme.wav", track)
+    return track
 
 def make_act2_descent_music():
     """Descent theme — slow, minor, oppressive."""
@@ -1057,9 +1026,9 @@ def make_act2_descent_music():
     combined = base + drone*tremolo
     track = np.tile(combined, 4)
     track[-SAMPLE_RATE*2:] *= np.linspace(1,0,SAMPLE_RATE*2)
-    save_wav(f"{AUD}/Music/act2_descent.wav", track)
+    return track
 
-def make_act2_dheki_music():
+def make_act2_dheki_music(np_rng):
     """Dheki rhythm theme — driving, repetitive, intensifying."""
     N = NOTES
     # Fast rhythmic pattern
@@ -1076,7 +1045,7 @@ def make_act2_dheki_music():
     beat_interval = int(SAMPLE_RATE * 0.4)
     for i in range(0, t_total, beat_interval):
         end = min(i + int(SAMPLE_RATE*0.05), t_total)
-        noise = np.random.Random(i).uniform(-1,1,end-i) if False else np.random.uniform(-0.4,0.4,end-i)
+        noise = np_rng.uniform(-0.4,0.4,end-i)
         env = np.linspace(0.6,0,end-i)
         beat[i:end] += noise*env
     combined = base + beat*0.4
@@ -1087,7 +1056,7 @@ def make_act2_dheki_music():
         tracks.append(combined * vol_scale)
     track = np.concatenate(tracks)
     track[-SAMPLE_RATE*2:] *= np.linspace(1,0,SAMPLE_RATE*2)
-    save_wav(f"{AUD}/Music/act2_dheki.wav", track)
+    return track
 
 def make_boss_music():
     """Boss fight — intense, dissonant, dark."""
@@ -1106,7 +1075,7 @@ def make_boss_music():
     combined = base + dissonant + pulse * 0.1
     track = np.tile(combined, 6)
     track[-SAMPLE_RATE*2:] *= np.linspace(1,0,SAMPLE_RATE*2)
-    save_wav(f"{AUD}/Music/boss_music.wav", track)
+    return track
 
 def make_epilogue_music():
     """Epilogue — peaceful, resolution, hopeful."""
@@ -1128,79 +1097,80 @@ def make_epilogue_music():
     combined = base + pad
     track = np.tile(combined, 3)
     track[-SAMPLE_RATE*3:] *= np.linspace(1,0,SAMPLE_RATE*3)
-    save_wav(f"{AUD}/Music/epilogue.wav", track)
+    return track
 
-def make_sfx():
+def make_sfx(np_rng):
     """Generate all SFX."""
     rate = SAMPLE_RATE
+    sfx = {}
 
     # Footstep — short thud
     t = np.linspace(0, 0.08, int(rate*0.08))
-    noise = np.random.uniform(-1,1,len(t))
+    noise = np_rng.uniform(-1,1,len(t))
     env = np.exp(-t*40)
-    save_wav(f"{AUD}/SFX/footstep.wav", noise*env*0.5)
+    sfx['footstep'] = noise*env*0.5
 
     # Hide — soft whoosh
     t = np.linspace(0, 0.3, int(rate*0.3))
-    noise = np.random.uniform(-0.5,0.5,len(t))
+    noise = np_rng.uniform(-0.5,0.5,len(t))
     env = np.exp(-t*8) * (1-np.exp(-t*30))
     lpf = np.convolve(noise*env, np.ones(60)/60, mode='same')
-    save_wav(f"{AUD}/SFX/hide.wav", lpf*0.4)
+    sfx['hide'] = lpf*0.4
 
     # Dialogue click — short bright tap
     t = np.linspace(0,0.05,int(rate*0.05))
     click = np.sin(2*np.pi*800*t)*np.exp(-t*80)
-    save_wav(f"{AUD}/SFX/dialogue_click.wav", click*0.5)
+    sfx['dialogue_click'] = click*0.5
 
     # Beat hit (perfect) — satisfying thud+chime
     t = np.linspace(0,0.2,int(rate*0.2))
     hit = np.sin(2*np.pi*440*t)*np.exp(-t*20)
     hit += np.sin(2*np.pi*880*t)*np.exp(-t*30)*0.4
-    save_wav(f"{AUD}/SFX/beat_hit_perfect.wav", hit*0.6)
+    sfx['beat_hit_perfect'] = hit*0.6
 
     # Beat hit (good)
     t = np.linspace(0,0.15,int(rate*0.15))
     hit = np.sin(2*np.pi*350*t)*np.exp(-t*25)
-    save_wav(f"{AUD}/SFX/beat_hit_good.wav", hit*0.5)
+    sfx['beat_hit_good'] = hit*0.5
 
     # Beat miss — dull thud
     t = np.linspace(0,0.3,int(rate*0.3))
-    noise = np.random.uniform(-0.3,0.3,len(t))
+    noise = np_rng.uniform(-0.3,0.3,len(t))
     miss = np.sin(2*np.pi*120*t)*np.exp(-t*8) + noise*np.exp(-t*10)*0.2
-    save_wav(f"{AUD}/SFX/beat_miss.wav", miss*0.5)
+    sfx['beat_miss'] = miss*0.5
 
     # Boss hit — heavy impact
     t = np.linspace(0,0.4,int(rate*0.4))
-    noise = np.random.uniform(-1,1,len(t))
+    noise = np_rng.uniform(-1,1,len(t))
     impact = np.sin(2*np.pi*60*t)*np.exp(-t*6) + noise*np.exp(-t*15)*0.4
-    save_wav(f"{AUD}/SFX/boss_hit.wav", impact*0.6)
+    sfx['boss_hit'] = impact*0.6
 
     # Spirit pulse — mystical whoosh
     t = np.linspace(0,0.6,int(rate*0.6))
     sweep_freq = 300 + 400*t
     pulse = np.sin(2*np.pi*sweep_freq*t)*np.exp(-t*4)*(1-np.exp(-t*10))
     pulse += 0.2*np.sin(2*np.pi*sweep_freq*2*t)*np.exp(-t*6)
-    save_wav(f"{AUD}/SFX/spirit_pulse.wav", pulse*0.5)
+    sfx['spirit_pulse'] = pulse*0.5
 
     # Phase transition — cinematic impact
     t = np.linspace(0,1.0,int(rate*1.0))
     boom = np.sin(2*np.pi*80*t)*np.exp(-t*4)
-    noise = np.random.uniform(-0.3,0.3,len(t))*np.exp(-t*6)
+    noise = np_rng.uniform(-0.3,0.3,len(t))*np.exp(-t*6)
     chime = np.sin(2*np.pi*523*t)*np.exp(-t*10)*0.3
     combo = boom + noise + chime
-    save_wav(f"{AUD}/SFX/phase_transition.wav", combo*0.6)
+    sfx['phase_transition'] = combo*0.6
 
     # Defeat sound — descending sweep
     t = np.linspace(0,2.0,int(rate*2.0))
     freq_sweep = 500 * np.exp(-t*1.5)
     defeat = np.sin(2*np.pi*freq_sweep*t)*np.exp(-t*0.8)
-    save_wav(f"{AUD}/SFX/boss_defeat.wav", defeat*0.5)
+    sfx['boss_defeat'] = defeat*0.5
 
     # Catch — stinger
     t = np.linspace(0,0.5,int(rate*0.5))
     catch = np.sin(2*np.pi*200*t)*np.exp(-t*5)
     catch += np.sin(2*np.pi*150*t)*np.exp(-t*4)*0.5
-    save_wav(f"{AUD}/SFX/caught.wav", catch*0.5)
+    sfx['caught'] = catch*0.5
 
     # Collect orb — sparkle
     t = np.linspace(0,0.4,int(rate*0.4))
@@ -1208,79 +1178,109 @@ def make_sfx():
         np.sin(2*np.pi*f*t)*np.exp(-t*(8+i*3))*0.2
         for i, f in enumerate([880,1100,1320,1760])
     )
-    save_wav(f"{AUD}/SFX/collect_orb.wav", sparkle*0.5)
+    sfx['collect_orb'] = sparkle*0.5
+    return sfx
 
 # ─────────────────────────────────────────────────────────────────────────────
-# MAIN
+# ASSET REGISTRATION  (see Tools/asset_registry.py)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def main():
-    print("Creating directories...")
-    mkdirs()
-
-    print("Generating character sprites...")
-    make_tejimola_spritesheet().save(f"{ART}/Sprites/Characters/tejimola_child_spritesheet.png")
-    make_tejimola_spritesheet(spirit=True).save(f"{ART}/Sprites/Characters/tejimola_spirit_spritesheet.png")
-    make_dom_spritesheet().save(f"{ART}/Sprites/Characters/dom_spritesheet.png")
-    make_ranima_spritesheet(corrupted=False).save(f"{ART}/Sprites/Characters/ranima_spritesheet.png")
-    make_ranima_spritesheet(corrupted=True).save(f"{ART}/Sprites/Characters/ranima_corrupted_spritesheet.png")
-
-    print("Generating portraits...")
-    make_portrait('tejimola').save(f"{ART}/Sprites/Characters/tejimola_child_portrait.png")
-    make_portrait('dom').save(f"{ART}/Sprites/Characters/dom_portrait.png")
-    make_father_portrait().save(f"{ART}/Sprites/Characters/father_portrait.png")
-    make_portrait('ranima').save(f"{ART}/Sprites/Characters/ranima_portrait.png")
-    make_portrait('ranima_c').save(f"{ART}/Sprites/Characters/ranima_corrupted_portrait.png")
-
-    print("Generating props...")
-    make_nahor_flower().save(f"{ART}/Sprites/Props/nahor_flower.png")
-    make_dheki().save(f"{ART}/Sprites/Props/dheki.png")
-    make_hairpin().save(f"{ART}/Sprites/Props/hairpin.png")
-    make_pot().save(f"{ART}/Sprites/Props/pot.png")
-    make_gamosa().save(f"{ART}/Sprites/Props/gamosa.png")
-    make_spirit_orb().save(f"{ART}/Sprites/Props/spirit_orb.png")
-    make_spiked_barrel().save(f"{ART}/Sprites/Props/spiked_barrel.png")
-    make_dhol_drum().save(f"{ART}/Sprites/Props/dhol_drum.png")
-    make_gourd().save(f"{ART}/Sprites/Props/gourd.png")
-
-    print("Generating VFX...")
-    make_footprint().save(f"{ART}/VFX/footprint.png")
-    make_spirit_pulse_ring().save(f"{ART}/VFX/spirit_pulse_ring.png")
-    make_vine_obstacle().save(f"{ART}/VFX/vine_obstacle.png")
-
-    print("Generating backgrounds...")
-    make_background_act1()
-    make_background_act2()
-    make_background_act3()
-    make_background_act4()
-
-    print("Generating UI...")
-    make_menu_background()
-    make_dialogue_box()
-    for name, fname in [
-        ("New Game","btn_new_game.png"),("Continue","btn_continue.png"),
-        ("Extras","btn_extras.png"),("Quit","btn_quit.png"),
-        ("Back","btn_back.png"),("Resume","btn_resume.png"),
-        ("Save","btn_save.png"),("Load","btn_load.png"),
-        ("Settings","btn_settings.png"),
-    ]:
-        make_button(name, fname)
-    make_hud_icon("catch_icon_inactive.png", (80,40,40,220))
-    make_hud_icon("spirit_pulse_icon.png", (130,80,230,240))
+CHARS = "Art/Sprites/Characters"
+PROPS = "Art/Sprites/Props"
+
+BUTTONS = [
+    ("New Game","btn_new_game.png"),("Continue","btn_continue.png"),
+    ("Extras","btn_extras.png"),("Quit","btn_quit.png"),
+    ("Back","btn_back.png"),("Resume","btn_resume.png"),
+    ("Save","btn_save.png"),("Load","btn_load.png"),
+    ("Settings","btn_settings.png"),
+]
+
+SFX_NAMES = [
+    'footstep', 'hide', 'dialogue_click', 'beat_hit_perfect', 'beat_hit_good',
+    'beat_miss', 'boss_hit', 'spirit_pulse', 'phase_transition', 'boss_defeat',
+    'caught', 'collect_orb',
+]
+
+def background_outputs(act):
+    return {name: f"Art/Backgrounds/{act}/{name}.png" for name in
+            ('layer4_sky', 'layer3_background', 'layer2_midground', 'layer1_foreground')}
+
+def register_assets(reg):
+    # Characters
+    reg.add('tejimola_spritesheets', make_tejimola_spritesheets,
+            {'child': f"{CHARS}/tejimola_child_spritesheet.png",
+             'spirit': f"{CHARS}/tejimola_spirit_spritesheet.png"},
+            tags=['character', 'spritesheet', 'tejimola'])
+    reg.add('dom_spritesheet', make_dom_spritesheet,
+            f"{CHARS}/dom_spritesheet.png", tags=['character', 'spritesheet', 'dom'])
+    reg.add('ranima_spritesheet', make_ranima_spritesheet,
+            f"{CHARS}/ranima_spritesheet.png", tags=['character', 'spritesheet', 'ranima'],
+            params={'corrupted': False})
+    reg.add('ranima_corrupted_spritesheet', make_ranima_spritesheet,
+            f"{CHARS}/ranima_corrupted_spritesheet.png", tags=['character', 'spritesheet', 'ranima', 'act4'],
+            params={'corrupted': True})
+
+    # Portraits
+    for char, fname, who in [('tejimola', 'tejimola_child', 'tejimola'), ('dom', 'dom', 'dom'),
+                             ('ranima', 'ranima', 'ranima'), ('ranima_c', 'ranima_corrupted', 'ranima')]:
+        reg.add(f"{fname}_portrait", make_portrait, f"{CHARS}/{fname}_portrait.png",
+                tags=['character', 'portrait', who], params={'char': char})
+    reg.add('father_portrait', make_father_portrait, f"{CHARS}/father_portrait.png",
+            tags=['character', 'portrait', 'father'])
 
-    print("Generating music...")
-    make_act1_music()
-    make_act2_descent_music()
-    make_act2_dheki_music()
-    make_boss_music()
-    make_epilogue_music()
+    # Props
+    for name, fn in [('nahor_flower', make_nahor_flower), ('dheki', make_dheki),
+                     ('hairpin', make_hairpin), ('pot', make_pot), ('gamosa', make_gamosa),
+                     ('spirit_orb', make_spirit_orb), ('spiked_barrel', make_spiked_barrel),
+                     ('dhol_drum', make_dhol_drum), ('gourd', make_gourd)]:
+        reg.add(name, fn, f"{PROPS}/{name}.png", tags=['prop'])
+
+    # VFX
+    for name, fn in [('footprint', make_footprint), ('spirit_pulse_ring', make_spirit_pulse_ring),
+                     ('vine_obstacle', make_vine_obstacle)]:
+        reg.add(name, fn, f"Art/VFX/{name}.png", tags=['vfx'])
+
+    # Backgrounds
+    for i, fn in enumerate([make_background_act1, make_background_act2,
+                            make_background_act3, make_background_act4], 1):
+        reg.add(f"background_act{i}", fn, background_outputs(f"Act{i}"),
+                tags=['background', f"act{i}"])
+
+    # UI
+    reg.add('menu_background', make_menu_background, "Art/UI/Menu/menu_background.png",
+            tags=['ui', 'menu'])
+    reg.add('dialogue_box', make_dialogue_box, "Art/UI/DialogueBox/dialogue_box.png",
+            tags=['ui', 'dialogue'])
+    for label, fname in BUTTONS:
+        reg.add(fname[:-4], make_button, f"Art/UI/Menu/{fname}",
+                tags=['ui', 'menu', 'button'], params={'label': label})
+    reg.add('catch_icon_inactive', make_hud_icon, "Art/UI/HUD/catch_icon_inactive.png",
+            tags=['ui', 'hud'], params={'color': (80,40,40,220)})
+    reg.add('spirit_pulse_icon', make_hud_icon, "Art/UI/HUD/spirit_pulse_icon.png",
+            tags=['ui', 'hud'], params={'color': (130,80,230,240)})
+
+    # Music
+    for name, fn, act in [('act1_theme', make_act1_music, 'act1'),
+                          ('act2_descent', make_act2_descent_music, 'act2'),
+                          ('act2_dheki', make_act2_dheki_music, 'act2'),
+                          ('boss_music', make_boss_music, 'act4'),
+                          ('epilogue', make_epilogue_music, 'epilogue')]:
+        reg.add(name, fn, f"Audio/Music/{name}.wav", tags=['music', act])
+
+    # SFX
+    reg.add('sfx', make_sfx, {name: f"Audio/SFX/{name}.wav" for name in SFX_NAMES},
+            tags=['sfx'])
 
-    print("Generating SFX...")
-    make_sfx()
+# ─────────────────────────────────────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────────────────────────────────────
 
-    print("\n✓ All assets generated successfully!")
-    print(f"  Art:   {ART}")
-    print(f"  Audio: {AUD}")
+def main():
+    """Build every asset declared above through the shared build entry point."""
+    import build_assets
+    build_assets.main(['--source', 'assets'] + sys.argv[1:])
 
 if __name__ == '__main__':
     main()
+